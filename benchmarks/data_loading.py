@@ -0,0 +1,61 @@
+"""
+Compares the time it takes to parse a large data file with the YAML parser used before (yaml.load, pure python)
+and the ones in marvin.util.loaders.
+
+Usage: python benchmarks/data_loading.py [ITERATIONS]
+"""
+import json
+import os
+import shutil
+import sys
+import tempfile
+import timeit
+
+import yaml
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from marvin.util import loaders  # noqa: E402
+
+
+def data(iterations):
+    return {
+        'name': 'Benchmark',
+        'tags': ['benchmark'],
+        'setup_data': {'url': 'http://localhost'},
+        'iterations': [{'name': 'iteration %d' % n,
+                        'tags': ['even' if n % 2 else 'odd'],
+                        'data': {'user': 'user%d' % n, 'amount': n * 1.5, 'items': list(range(5)), 'valid': True}}
+                       for n in range(iterations)]
+    }
+
+
+def best_of(func, path, repeat=3):
+    def load():
+        with open(path) as fh:
+            func(fh)
+    return min(timeit.repeat(load, number=1, repeat=repeat))
+
+
+def main(iterations):
+    directory = tempfile.mkdtemp()
+    try:
+        json_file = os.path.join(directory, 'data.json')
+        yaml_file = os.path.join(directory, 'data.yaml')
+        with open(json_file, 'w') as fh:
+            json.dump(data(iterations), fh)
+        with open(yaml_file, 'w') as fh:
+            yaml.safe_dump(data(iterations), fh)
+
+        parsers = (loaders.YAMLLoader.__name__, loaders.json_loads.__module__)
+        print("%d iterations (YAML loader: %s, JSON parser: %s)" % ((iterations,) + parsers))
+        for path in (json_file, yaml_file):
+            before = best_of(lambda fh: yaml.load(fh, Loader=yaml.Loader), path)
+            after = best_of(loaders.loader_for(path), path)
+            print("  %-5s %8.1f KB   yaml.load: %7.3fs   marvin.util.loaders: %7.3fs   (%.1fx)" % (
+                os.path.splitext(path)[1], os.path.getsize(path) / 1024.0, before, after, before / after))
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20000)
@@ -1,7 +1,13 @@
 from marvin.core.suite import Suite
 from marvin.core.step import Step
 from marvin.core.test_script import TestScript
+from marvin.util import compat
 from marvin.version import __version__
 
 
 __all__ = ["Suite", "TestScript", "Step", "__version__"]
+
+if compat.SUPPORTS_ASYNC:
+    from marvin.core.async_step import AsyncStep
+    from marvin.core.async_test_script import AsyncTestScript
+    __all__ += ["AsyncTestScript", "AsyncStep"]
@@ -0,0 +1,26 @@
+from marvin.core.async_step_runner import AsyncStepRunner
+from marvin.core.step import Step
+
+
+class AsyncStep(Step):
+    """
+    Base class for steps implemented as coroutines (i.e. `async def run`).
+    Executed with `await step.execute(...)` or `async with step.do(...) as (step, result):`
+    """
+
+    async def execute(self, *args, **kwargs):
+        """
+        Executes the step
+        """
+        runner = self.do(*args, **kwargs)
+        async with runner:
+            pass
+
+        return runner.result
+
+    def do(self, *args, **kwargs):
+        return AsyncStepRunner(self, args, kwargs)
+
+    async def run(self, *args, **kargs):
+        """Step's logic implementation (to be redefined by sub-classes)"""
+        raise NotImplementedError("Method run must be implemented in step '%s'" % self.name)
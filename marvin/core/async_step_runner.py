@@ -0,0 +1,30 @@
+import inspect
+import sys
+
+from marvin.core.step_runner import StepRunner
+from marvin.util import NO_EXCEPTION
+
+
+class AsyncStepRunner(StepRunner):
+    """
+    Internal Marvin AsyncStep executor. Same execution flow as StepRunner, but the step is
+    executed by awaiting its `run` coroutine, with the asynchronous context manager protocol
+    """
+
+    async def __aenter__(self):
+        self._start()
+        return self._handle_run(*(await self._do_run_async()))
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        return self.__exit__(exc_type, exc_val, exc_tb)
+
+    async def _do_run_async(self):
+        result = None
+        exception = NO_EXCEPTION
+        try:
+            returned = self._step.run(*self._args, **self._kwargs)
+            result = (await returned) if inspect.isawaitable(returned) else returned
+        except Exception:
+            exception = sys.exc_info()
+
+        return result, exception
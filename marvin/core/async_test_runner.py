@@ -0,0 +1,73 @@
+import asyncio
+import inspect
+import sys
+
+from marvin.core.status import Status
+from marvin.core.test_runner import TestRunner
+from marvin.exceptions import ContextSkippedException
+from marvin.report.events import TestSetupStartedEvent, TestSetupEndedEvent, TestIterationStartedEvent, \
+    TestIterationEndedEvent, TestTearDownStartedEvent, TestTearDownEndedEvent
+from marvin.util import compat, NO_EXCEPTION
+
+
+class AsyncTestRunner(TestRunner):
+    """
+    Internal Marvin AsyncTestScript executor. Same execution flow as TestRunner, but the test phases
+    are awaited within an event loop (owned by the runner), where parallel iterations run concurrently
+    """
+
+    def _execute(self, iterations):
+        loop = asyncio.new_event_loop()
+        try:
+            loop.run_until_complete(self._execute_async(iterations))
+        finally:
+            loop.close()
+
+    async def _execute_async(self, iterations):
+        await self._run_phase_async('setup', self._data_provider.setup_data,
+                                    TestSetupStartedEvent, TestSetupEndedEvent)
+
+        workers = self._parallel_iterations() if compat.SUPPORTS_CONTEXTVARS else 1
+        if workers > 1 and not self._should_skip_phase('run'):
+            await self._run_concurrent_iterations(iterations, workers)
+        else:
+            for iteration in iterations:
+                await self._run_iteration_async(iteration)
+
+        await self._run_phase_async('tear_down', self._data_provider.tear_down_data,
+                                    TestTearDownStartedEvent, TestTearDownEndedEvent)
+
+    async def _run_iteration_async(self, iteration):
+        await self._run_phase_async('run', iteration, TestIterationStartedEvent, TestIterationEndedEvent)
+
+    async def _run_concurrent_iterations(self, iterations, workers):
+        publisher = self._test.publisher
+        parent_buffer = publisher.buffer
+
+        # Each worker task buffers the events of an iteration, so events of concurrent iterations aren't interleaved
+        async def worker():
+            for iteration in iterations:
+                with publisher.buffered(parent=parent_buffer):
+                    await self._run_iteration_async(iteration)
+
+        await asyncio.gather(*[worker() for _ in range(workers)])
+
+    async def _run_phase_async(self, phase_type, data, started_event_class, ended_event_class):
+        if self._should_skip_phase(phase_type):
+            return
+
+        start_time = self._start_phase(data, started_event_class)
+        status = Status.PASS
+        exception = NO_EXCEPTION
+        try:
+            result = getattr(self._test, phase_type)(self._phase_data(phase_type, data))
+            if inspect.isawaitable(result):
+                await result
+        except ContextSkippedException:
+            status = Status.SKIP
+            exception = sys.exc_info()
+        except Exception:
+            status = Status.FAIL
+            exception = sys.exc_info()
+        finally:
+            self._end_phase(phase_type, data, ended_event_class, start_time, status, exception)
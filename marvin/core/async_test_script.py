@@ -0,0 +1,26 @@
+from marvin.core.async_test_runner import AsyncTestRunner
+from marvin.core.test_script import TestScript
+
+
+class AsyncTestScript(TestScript):
+    """
+    Base class for test scripts implemented as coroutines (i.e. `async def run`, and optionally
+    `async def setup` and `async def tear_down`).
+    Each test runs its phases in an event loop of its own, so when PARALLEL_ITERATIONS (or the data provider's
+    `parallel_iterations`) is greater than 1, up to that many iterations run concurrently in that loop
+    (Python 3.7+, older versions run them one after the other).
+    Steps implemented as coroutines (see AsyncStep) can be awaited from the test phases.
+    """
+
+    async def run(self, _data):
+        """
+        Main execution phase, invoked once per each iteration.
+        Must be redefined by subclasses
+        """
+        raise NotImplementedError("Method run must be implemented in test script '%s'" % self.name)
+
+    def execute(self, data_provider=None):
+        """
+        Executes this TestScript with the given data provider
+        """
+        AsyncTestRunner(self, data_provider).execute()
@@ -1,3 +1,5 @@
+import threading
+
 from marvin.core.status import Status
 from marvin.exceptions import ContextSkippedException
 from marvin.report import Publisher
@@ -15,6 +17,7 @@ class Context(object):
             Status.FAIL: 0,
             Status.SKIP: 0
         }
+        self._lock = threading.Lock()
 
     @property
     def ctx(self):
@@ -49,4 +52,5 @@ class Context(object):
 
     def sub_context_finished(self, status):
         """Keep count of sub-context results within this context"""
-        self.context_summary[status] += 1
+        with self._lock:
+            self.context_summary[status] += 1
@@ -0,0 +1,133 @@
+"""
+Test executors: strategies used by a Suite to execute its tests
+"""
+import functools
+import multiprocessing.util
+import os
+import pickle
+import shutil
+import sys
+import tempfile
+from multiprocessing.pool import ThreadPool
+
+from marvin.core.status import Status
+from marvin.report.remote import RecordingPublisher, attach, attach_exceptions, detach_exceptions
+from marvin.util import compat
+
+
+class SerialExecutor(object):
+    """
+    Executes the tests one after the other, within the current process
+    """
+
+    def execute(self, suite, tests):
+        """
+        Executes the given tests within the given suite
+        :param suite: the Suite instance running the tests
+        :param tests: iterable of (TestScript class, DataProvider instance) tuples
+        """
+        for test_class, data_provider in tests:
+            suite.test(test_class).execute(data_provider=data_provider)
+
+
+class ProcessPoolExecutor(object):
+    """
+    Executes the tests in a pool of worker processes.
+    Workers record the events triggered by each test and send them back to the parent process, where they
+    are notified to the suite's publisher, so observers get the stream of events of each test in order.
+    Each worker tears down its own fixtures when it exits: failures are handed to the suite's fixtures, so they are
+    reported along with the suite's own ones.
+    """
+
+    def __init__(self, workers):
+        self._workers = workers
+
+    def execute(self, suite, tests):
+        tests = list(tests)
+        # Avoid workers flushing (again) anything buffered before forking
+        sys.stdout.flush()
+        sys.stderr.flush()
+        failures_dir = tempfile.mkdtemp(prefix='marvin-fixtures-')
+        pool = compat.process_pool(self._workers, initializer=_init_worker, initargs=(suite, tests, failures_dir))
+        try:
+            for events, summary in pool.imap_unordered(_run_test, range(len(tests))):
+                for event in events:
+                    suite.publisher.notify(attach(event))
+                for status, count in summary.items():
+                    for _ in range(count):
+                        suite.sub_context_finished(status)
+        finally:
+            pool.close()
+            pool.join()
+            suite.fixtures.add_failures(_worker_fixture_failures(failures_dir))
+
+
+class ThreadPoolExecutor(object):
+    """
+    Executes the tests in a pool of threads (best suited for I/O bound tests).
+    The events triggered by each test are buffered and notified together when the test ends, so observers
+    get the stream of events of each test in order.
+    """
+
+    def __init__(self, workers):
+        self._workers = workers
+
+    def execute(self, suite, tests):
+        pool = ThreadPool(self._workers)
+        try:
+            for _ in pool.imap_unordered(functools.partial(_run_buffered_test, suite), tests):
+                pass
+        finally:
+            pool.close()
+            pool.join()
+
+
+def _run_buffered_test(suite, test):
+    test_class, data_provider = test
+    with suite.publisher.buffered():
+        suite.test(test_class).execute(data_provider=data_provider)
+
+
+# State of a worker process, set up when the process starts
+_worker = {}
+
+
+def _init_worker(suite, tests, failures_dir):
+    # The suite is a copy of the parent's one: events are recorded and sent back rather than notified here
+    suite._publisher = RecordingPublisher(suite.publisher)
+    # Each worker builds its own fixtures, torn down when the worker exits
+    suite.fixtures.reset()
+    multiprocessing.util.Finalize(None, _tear_down_worker_fixtures, args=(suite.fixtures, failures_dir),
+                                  exitpriority=10)
+    _worker['suite'] = suite
+    _worker['tests'] = tests
+
+
+def _tear_down_worker_fixtures(fixtures, failures_dir):
+    # Failures are left in a file for the parent process, which reads them once the workers are gone
+    failures = fixtures.tear_down()
+    if failures:
+        with open(os.path.join(failures_dir, '%d.pickle' % os.getpid()), 'wb') as fh:
+            pickle.dump(detach_exceptions(failures), fh, pickle.HIGHEST_PROTOCOL)
+
+
+def _worker_fixture_failures(failures_dir):
+    failures = []
+    for name in sorted(os.listdir(failures_dir)):
+        with open(os.path.join(failures_dir, name), 'rb') as fh:
+            failures.extend(attach_exceptions(pickle.load(fh)))
+    shutil.rmtree(failures_dir, ignore_errors=True)
+    return failures
+
+
+def _run_test(index):
+    suite = _worker['suite']
+    test_class, data_provider = _worker['tests'][index]
+    summary_before = dict(suite.context_summary)
+    suite.publisher.events = []
+
+    suite.test(test_class).execute(data_provider=data_provider)
+
+    summary = dict((status, suite.context_summary[status] - summary_before[status])
+                   for status in (Status.PASS, Status.FAIL, Status.SKIP))
+    return suite.publisher.events, summary
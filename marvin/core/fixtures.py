@@ -0,0 +1,100 @@
+"""
+Suite scoped fixtures shared by the tests of a suite
+"""
+import sys
+import threading
+
+
+class Fixtures(object):
+    """
+    Suite scoped fixtures: values that are expensive to build (e.g. a logged in session, or some state seeded in
+    the system under test) and are shared by the tests of a suite.
+    A fixture is built the first time a test requires it, kept for the rest of the suite, and torn down (in reverse
+    order of creation) once the suite ends. When tests run in worker processes, each worker builds its own.
+    Tests require fixtures through the FIXTURES attribute of the test script, or the `fixtures` key of their data
+    files: their values are injected into the setup data (a dict) under the fixture names.
+    """
+
+    def __init__(self):
+        self._factories = {}
+        self._values = {}
+        self._created = []
+        self._failures = []
+        self._lock = threading.RLock()
+
+    def register(self, name, setup, tear_down=None):
+        """
+        Registers a fixture
+        :param name: [String] the fixture name
+        :param setup: callable (with no arguments) building the fixture value
+        :param tear_down: callable (taking the fixture value) tearing the fixture down, if needed
+        """
+        self._factories[name] = (setup, tear_down)
+
+    def __contains__(self, name):
+        return name in self._factories
+
+    def get(self, name):
+        """Returns the value of the given fixture, building it if it's the first time it's required"""
+        if name in self._values:
+            return self._values[name]
+        if name not in self._factories:
+            raise KeyError("Unknown fixture: '%s'" % name)
+
+        with self._lock:
+            if name not in self._values:
+                setup, _ = self._factories[name]
+                self._values[name] = setup()
+                self._created.append(name)
+            return self._values[name]
+
+    def inject(self, names, setup_data):
+        """
+        Returns a copy of the given setup data (a dict, or None) including the values of the given fixtures
+        (unless the setup data already has a value for them)
+        """
+        if not names:
+            return setup_data
+        if setup_data is None:
+            setup_data = {}
+        if not isinstance(setup_data, dict):
+            raise TypeError("Fixtures can only be injected into dict setup data, not '%s'" %
+                            type(setup_data).__name__)
+
+        setup_data = dict(setup_data)
+        for name in names:
+            if name not in setup_data:
+                setup_data[name] = self.get(name)
+        return setup_data
+
+    def add_failures(self, failures):
+        """
+        Records tear down failures which happened elsewhere (e.g. in worker processes, which tear down their own
+        fixtures), so they are returned by the next `tear_down`
+        :param failures: list of sys.exc_info() like 3-tuples
+        """
+        with self._lock:
+            self._failures.extend(failures)
+
+    def tear_down(self):
+        """Tears down the fixtures built so far (in reverse order of creation). Returns the exc_info of failures"""
+        with self._lock:
+            created, values, failures = self._created, self._values, self._failures
+            self.reset()
+            self._failures = []
+
+        for name in reversed(created):
+            _, tear_down = self._factories[name]
+            if not tear_down:
+                continue
+            try:
+                tear_down(values[name])
+            except Exception:
+                failures.append(sys.exc_info())
+        return failures
+
+    def reset(self):
+        """Forgets the fixtures built so far, without tearing them down (e.g. in forked worker processes)"""
+        with self._lock:
+            self._values = {}
+            self._created = []
@@ -4,8 +4,8 @@ import sys
 
 from marvin.core.status import Status
 from marvin.exceptions import ContextSkippedException, ExpectedExceptionNotRaised, StepsFailedInContext
-from marvin.report.events import StepStartedEvent, StepEndedEvent, StepSkippedEvent
-from marvin.util import compat, NO_EXCEPTION
+from marvin.report.events import EventType, Instant, StepStartedEvent, StepEndedEvent, StepSkippedEvent
+from marvin.util import compat, tracebacks, NO_EXCEPTION
 
 
 class StepRunner(object):
@@ -28,12 +28,21 @@ class StepRunner(object):
         return self._result.get()
 
     def __enter__(self):
+        self._start()
+        return self._handle_run(*self._do_run())
+
+    def _start(self):
+        publisher = self._step.publisher
+        if not publisher.has_observers(EventType.STEP_STARTED):
+            self._start_time = Instant.now()
+            return
         start_event = StepStartedEvent(self._step, self._args, self._kwargs)
-        self._start_time = start_event.timestamp
-        self._step.publisher.notify(start_event)
+        self._start_time = start_event.instant
+        publisher.notify(start_event)
 
-        result, self._step_exception = self._do_run()
+    def _handle_run(self, result, exception):
         self._result.set(result)
+        self._step_exception = exception
 
         is_exception = self._step_exception != NO_EXCEPTION
         expected = is_exception and self._is_exception_expected(self._step_exception, self._step.expected_exceptions)
@@ -74,21 +83,32 @@ class StepRunner(object):
         elif self._context_exception[0] == ContextSkippedException:
             skip_exception = self._context_exception
 
+        if exception != NO_EXCEPTION:
+            # Only what's reported is affected: to_raise keeps the traceback to raise the exception with
+            policy = tracebacks.configured_policy(self._step.cfg)
+            retained = tracebacks.retain(exception, policy)
+            if skip_exception is exception:
+                skip_exception = retained
+            elif skip_exception:
+                skip_exception = tracebacks.retain(skip_exception, policy)
+            exception = retained
+
+        publisher = self._step.publisher
         if skip_exception:
             status = Status.SKIP
-            skip_event = StepSkippedEvent(self._step, skip_exception)
-            self._step.publisher.notify(skip_event)
+            if publisher.has_observers(EventType.STEP_SKIPPED):
+                publisher.notify(StepSkippedEvent(self._step, skip_exception))
 
         if self._step.shall_pass and status == Status.FAIL:
             status = Status.PASS
 
-        end_event = StepEndedEvent(self._step,
-                                   status,
-                                   self._result,
-                                   self._start_time,
-                                   exception)
-
-        self._step.publisher.notify(end_event)
+        if publisher.has_observers(EventType.STEP_ENDED):
+            end_event = StepEndedEvent(self._step,
+                                       status,
+                                       self._result,
+                                       self._start_time,
+                                       exception)
+            publisher.notify(end_event)
 
         # Notify the result to the parent context
         self._step.ctx.sub_context_finished(status)
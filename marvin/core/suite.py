@@ -1,9 +1,12 @@
+import sys
 
 from marvin.core.context import Context
+from marvin.core.executors import SerialExecutor
 from marvin.core.reportable import Reportable
 from marvin.core.status import Status
 from marvin.core.test_running_context import TestRunningContext
-from marvin.report.events import SuiteStartedEvent, SuiteEndedEvent
+from marvin.report.events import EventType, Instant, SuiteStartedEvent, SuiteEndedEvent
+from marvin.util import tracebacks
 
 
 class Suite(Context, TestRunningContext, Reportable):
@@ -15,17 +18,37 @@ class Suite(Context, TestRunningContext, Reportable):
         Context.__init__(self, parent_context=None)
         TestRunningContext.__init__(self)
         Reportable.__init__(self)
+        self._executor = SerialExecutor()
+
+    @property
+    def executor(self):
+        """The strategy used to execute the tests of this suite (see marvin.core.executors)"""
+        return self._executor
+
+    @executor.setter
+    def executor(self, executor):
+        self._executor = executor
 
     def execute(self):
         """
         Executes the tests in this suite
         """
-        start_event = SuiteStartedEvent(self)
-        self.publisher.notify(start_event)
+        start_time = Instant.now()
+        if self.publisher.has_observers(EventType.SUITE_STARTED):
+            start_event = SuiteStartedEvent(self)
+            start_time = start_event.instant
+            self.publisher.notify(start_event)
 
-        status = self._execute()
+        try:
+            status = self._execute()
+        finally:
+            # Before the suite ends (even if tests couldn't run), so tear down failures are part of its status
+            if self._tear_down_fixtures():
+                status = Status.FAIL
 
-        self.publisher.notify(SuiteEndedEvent(self, start_event.timestamp, status))
+        if self.publisher.has_observers(EventType.SUITE_ENDED):
+            self.publisher.notify(SuiteEndedEvent(self, start_time, status))
+        self.publisher.flush()
         return status
 
     def tests(self):
@@ -34,10 +57,15 @@ class Suite(Context, TestRunningContext, Reportable):
 
         raise NotImplementedError("Method run must be redefined")
 
+    def _tear_down_fixtures(self):
+        """Tears down the suite fixtures, reporting failures to stderr. Returns whether any of them failed"""
+        failures = self.fixtures.tear_down()
+        for exc_info in failures:
+            sys.stderr.write("Suite fixture tear down failed: %s\n" % tracebacks.format_exception(exc_info))
+        return bool(failures)
+
     def _execute(self):
-        # TODO: subclasses should be able to define how tests are executed (e.g. allowing parallel execution)
-        for test_class, data_provider in self.tests():
-            self.test(test_class).execute(data_provider=data_provider)
+        self.executor.execute(self, self.tests())
 
         if self.context_summary[Status.FAIL]:
             return Status.FAIL
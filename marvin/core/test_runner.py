@@ -1,11 +1,16 @@
+import itertools
 import sys
+import threading
+from multiprocessing.pool import ThreadPool
 
 from marvin.data.data_providers.null_data_provider import NullDataProvider
 from marvin.core.status import Status
 from marvin.exceptions import ContextSkippedException
 from marvin.report.events import TestStartedEvent, TestEndedEvent, TestSetupStartedEvent, TestSetupEndedEvent, \
-    TestIterationStartedEvent, TestIterationEndedEvent, TestTearDownStartedEvent, TestTearDownEndedEvent
-from marvin.util import NO_EXCEPTION
+    TestIterationStartedEvent, TestIterationEndedEvent, TestTearDownStartedEvent, TestTearDownEndedEvent, Instant
+from marvin.util import NO_EXCEPTION, compat, tracebacks
+
+_NO_ITERATION = object()
 
 
 class TestRunner(object):
@@ -20,42 +25,110 @@ class TestRunner(object):
         self._exceptions = []
         self._skip_iteration = False
         self._skip_teardown = False
+        self._lock = threading.Lock()
 
     def execute(self):
         self._test_meta_override()
-        if not self._should_run_test():
+        iterations = self._plan_iterations()
+        if iterations is None:
             return
-        test_started = TestStartedEvent(self._test, self._data_provider)
-        self._test.publisher.notify(test_started)
+        start_time = self._notify(TestStartedEvent, self._test, self._data_provider)
 
-        self._execute()
+        self._execute(iterations)
 
-        test_ended = TestEndedEvent(self._test, self._data_provider,
-                                    test_started.timestamp, self._status, self._exceptions)
-        self._test.publisher.notify(test_ended)
+        self._notify(TestEndedEvent, self._test, self._data_provider, start_time, self._status, self._exceptions)
         self._test.ctx.sub_context_finished(self._status)
 
-    def _execute(self):
+    def _notify(self, event_class, *args):
+        """Notifies an event of the given class, unless nobody observes it. Returns the Instant of the event"""
+        publisher = self._test.publisher
+        if not publisher.has_observers(event_class.event_type):
+            return Instant.now()
+        event = event_class(*args)
+        publisher.notify(event)
+        return event.instant
+
+    def _execute(self, iterations):
         self._run_phase('setup', self._data_provider.setup_data, TestSetupStartedEvent, TestSetupEndedEvent)
 
-        for iteration in self._data_provider.iterations:
-            if self._test.ctx.tags_match(self._iteration_tags(iteration)):
-                self._run_phase('run', iteration, TestIterationStartedEvent, TestIterationEndedEvent)
+        workers = self._parallel_iterations()
+        if workers > 1 and not self._should_skip_phase('run'):
+            self._run_parallel_iterations(iterations, workers)
+        else:
+            for iteration in iterations:
+                self._run_iteration(iteration)
 
         self._run_phase('tear_down', self._data_provider.tear_down_data,
                         TestTearDownStartedEvent, TestTearDownEndedEvent)
 
+    def _plan_iterations(self):
+        """
+        Returns an iterator over the iterations matching the tag filters, or None if there's none (i.e. the test
+        must not run). Data provider iterations are only evaluated once: the first match is peeked, and the rest
+        are consumed lazily while the test runs.
+        """
+        iterations = self._matching_iterations()
+        first = next(iterations, _NO_ITERATION)
+        if first is _NO_ITERATION:
+            return None
+        return itertools.chain([first], iterations)
+
+    def _matching_iterations(self):
+        with_tags, without_tags = self._test.ctx.tag_filters() or (set(), set())
+        iterations = self._data_provider.filtered_iterations(self._test.tags, with_tags, without_tags)
+        return (iteration for iteration in iterations
+                if self._test.ctx.tags_match(self._iteration_tags(iteration)))
+
+    def _run_iteration(self, iteration):
+        self._run_phase('run', iteration, TestIterationStartedEvent, TestIterationEndedEvent)
+
+    def _run_parallel_iterations(self, iterations, workers):
+        publisher = self._test.publisher
+        parent_buffer = publisher.buffer
+
+        # Bound how many iterations are pending, so iterations read lazily from the data provider aren't all
+        # loaded in memory at once
+        pending = threading.BoundedSemaphore(workers * 2)
+        failures = []
+
+        # Buffer the events of each iteration, so events of concurrent iterations aren't interleaved
+        def run_buffered_iteration(iteration):
+            try:
+                with publisher.buffered(parent=parent_buffer):
+                    self._run_iteration(iteration)
+            except Exception:
+                failures.append(sys.exc_info())
+            finally:
+                pending.release()
+
+        pool = ThreadPool(workers)
+        try:
+            # Iterations are read within this thread rather than the pool's one: data providers may read them
+            # through objects bound to the thread which created them (e.g. database cursors)
+            for iteration in iterations:
+                pending.acquire()
+                if failures:
+                    break
+                pool.apply_async(run_buffered_iteration, (iteration,))
+        finally:
+            pool.close()
+            pool.join()
+        if failures:
+            raise compat.raise_exc_info(*failures[0])
+
+    def _parallel_iterations(self):
+        workers = self._data_provider.parallel_iterations or getattr(self._test, 'PARALLEL_ITERATIONS', None)
+        return int(workers or 1)
+
     def _run_phase(self, phase_type, data, started_event_class, ended_event_class):
         if self._should_skip_phase(phase_type):
             return
 
+        start_time = self._start_phase(data, started_event_class)
         status = Status.PASS
         exception = NO_EXCEPTION
-        phase_started = started_event_class(self._test, self._data_provider, data)
-        self._test.publisher.notify(phase_started)
         try:
-            phase_data = data.data if phase_type == 'run' else data
-            getattr(self._test, phase_type)(phase_data)
+            getattr(self._test, phase_type)(self._phase_data(phase_type, data))
         except ContextSkippedException:
             status = Status.SKIP
             exception = sys.exc_info()
@@ -63,17 +136,31 @@ class TestRunner(object):
             status = Status.FAIL
             exception = sys.exc_info()
         finally:
-            self._test.publisher.notify(
-                ended_event_class(self._test, self._data_provider, data, phase_started.timestamp, status, exception)
-            )
+            self._end_phase(phase_type, data, ended_event_class, start_time, status, exception)
+
+    def _start_phase(self, data, started_event_class):
+        return self._notify(started_event_class, self._test, self._data_provider, data)
+
+    def _phase_data(self, phase_type, data):
+        if phase_type == 'run':
+            return data.data
+        if phase_type == 'setup':
+            return self._test.ctx.fixtures.inject(self._required_fixtures(), data)
+        return data
+
+    def _required_fixtures(self):
+        names = list(getattr(self._test, 'FIXTURES', None) or [])
+        return names + [name for name in (self._data_provider.fixtures or []) if name not in names]
+
+    def _end_phase(self, phase_type, data, ended_event_class, start_time, status, exception):
+        if exception != NO_EXCEPTION:
+            exception = tracebacks.retain(exception, tracebacks.configured_policy(self._test.cfg))
+        self._notify(ended_event_class, self._test, self._data_provider, data, start_time, status, exception)
+        with self._lock:
             if exception != NO_EXCEPTION:
                 self._exceptions.append(exception)
             self._report_phase_status(phase_type, status)
 
-    def _should_run_test(self):
-        return any(self._test.ctx.tags_match(self._iteration_tags(iteration))
-                   for iteration in self._data_provider.iterations)
-
     def _iteration_tags(self, iteration):
         return self._test.tags | (iteration.tags or set())
 
@@ -1,4 +1,5 @@
 from marvin.core.context import Context
+from marvin.core.fixtures import Fixtures
 
 
 class TestRunningContext(object):
@@ -9,6 +10,12 @@ class TestRunningContext(object):
 
     def __init__(self):
         assert isinstance(self, Context)
+        self._fixtures = Fixtures()
+
+    @property
+    def fixtures(self):
+        """The fixtures (see marvin.core.fixtures.Fixtures) shared by the tests run within this context"""
+        return self._fixtures
 
     def test(self, test_class):
         """Instantiates a new test with this as it's parent context"""
@@ -22,3 +29,10 @@ class TestRunningContext(object):
         :return: [boolean] True if the set of tags match the filter implementation, False otherwise
         """
         return True
+
+    def tag_filters(self):
+        """
+        To be redefined along with `tags_match`, so data providers can filter iterations at their source
+        :return: [None|tuple] None, or the (with_tags, without_tags) tuple of sets filtering tests by tags
+        """
+        return None
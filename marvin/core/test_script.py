@@ -22,6 +22,10 @@ class TestScript(Context, StepRunningContext, Reportable):
         * One or more iteration data for the 'run' phase (so it's up to the data provider to
             define how many iterations there will be)
         * The 'tear_down' phase.
+
+    Iterations run one after the other unless the PARALLEL_ITERATIONS class attribute (or the data provider's
+    `parallel_iterations`) is greater than 1, in which case up to that many iterations run at the same time
+    in different threads (so the 'run' method must be thread safe).
     """
 
     def __init__(self, parent_context):
@@ -2,9 +2,19 @@ from marvin.data.data_provider import DataProvider
 from marvin.data.iteration_data import IterationData
 from marvin.data.data_provider_registry import DataProviderRegistry
 from marvin.data.file_data_provider import FileDataProvider
+from marvin.data.streaming_file_data_provider import StreamingFileDataProvider
+from marvin.data.tabular_data_provider import TabularDataProvider
+from marvin.data.deferred_data_provider import DeferredDataProvider
 from marvin.data.data_providers.yaml_data_provider import YAMLDataProvider
+from marvin.data.data_providers.yaml_stream_data_provider import YAMLStreamDataProvider
+from marvin.data.data_providers.json_lines_data_provider import JSONLinesDataProvider
+from marvin.data.data_providers.csv_data_provider import CSVDataProvider
+from marvin.data.data_providers.npy_data_provider import NPYDataProvider
+from marvin.data.data_providers.sqlite_data_provider import SQLiteDataProvider
 from marvin.data.data_providers.null_data_provider import NullDataProvider
 
-__all__ = ['DataProvider', 'FileDataProvider', 'DataProviderRegistry', 'IterationData']
+__all__ = ['DataProvider', 'FileDataProvider', 'StreamingFileDataProvider', 'TabularDataProvider',
+           'DeferredDataProvider', 'DataProviderRegistry', 'IterationData']
 
-DataProviderRegistry.register(YAMLDataProvider, NullDataProvider)
+DataProviderRegistry.register(YAMLDataProvider, NullDataProvider, YAMLStreamDataProvider, JSONLinesDataProvider,
+                              CSVDataProvider, NPYDataProvider, SQLiteDataProvider)
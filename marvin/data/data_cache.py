@@ -0,0 +1,75 @@
+import hashlib
+import os
+import pickle
+import tempfile
+
+from marvin.util import compat
+
+
+class DataCache(object):
+    """
+    On-disk cache of parsed data files, so unchanged data files aren't parsed again on later runs.
+    Entries are pickled files within the cache directory, keyed by data provider class and data file path, and
+    invalidated when the data file modification time or size change.
+    Only point it to a directory you trust: cached entries are unpickled.
+    """
+
+    VERSION = 1
+
+    def __init__(self, directory):
+        self._directory = directory
+
+    @property
+    def directory(self):
+        return self._directory
+
+    def get(self, data_provider_class, path):
+        """The cached data of the given data file, or None if it isn't cached (or the data file changed)"""
+        try:
+            with open(self._entry_path(data_provider_class, path), 'rb') as fh:
+                version, stat, data = pickle.load(fh)
+        except Exception:
+            # missing, or unreadable (e.g. written by another python version): same as not cached
+            return None
+        if version != self.VERSION or stat != self._file_stat(path):
+            return None
+        return data
+
+    def rebuild(self, data_provider_class, path):
+        """Parses the given data file and caches it, even if it was already cached. Returns whether it was cached"""
+        return self.put(data_provider_class, path, data_provider_class.load(path))
+
+    def put(self, data_provider_class, path, data):
+        """
+        Caches the data of the given data file. Returns whether it was cached: data which can't be pickled (or
+        written) is not, the same as if there was no cache
+        """
+        tmp_path = None
+        try:
+            if not os.path.isdir(self._directory):
+                try:
+                    os.makedirs(self._directory)
+                except OSError:
+                    # created concurrently by another worker
+                    if not os.path.isdir(self._directory):
+                        raise
+
+            # Write and rename, so concurrent readers never see partially written entries
+            fd, tmp_path = tempfile.mkstemp(dir=self._directory, suffix='.tmp')
+            with os.fdopen(fd, 'wb') as fh:
+                pickle.dump((self.VERSION, self._file_stat(path), data), fh, pickle.HIGHEST_PROTOCOL)
+            compat.replace_file(tmp_path, self._entry_path(data_provider_class, path))
+        except Exception:
+            # e.g. unpicklable data (which can raise about anything), or an unwritable directory
+            if tmp_path and os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return False
+        return True
+
+    def _entry_path(self, data_provider_class, path):
+        key = "%s.%s:%s" % (data_provider_class.__module__, data_provider_class.__name__, os.path.abspath(path))
+        return os.path.join(self._directory, hashlib.sha1(key.encode('utf-8')).hexdigest() + '.pickle')
+
+    def _file_stat(self, path):
+        stat = os.stat(path)
+        return stat.st_mtime, stat.st_size
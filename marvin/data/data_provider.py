@@ -13,6 +13,11 @@ class DataProvider(object):
         """
         self._source_id = source_id
 
+    @property
+    def source_id(self):
+        """The id of the source this provider loads data from (e.g. a file path)"""
+        return self._source_id
+
     @classmethod
     def handles(cls, source_id):
         """Returns true if this data provider supports loading the give data source id"""
@@ -55,6 +60,36 @@ class DataProvider(object):
         """
         raise NotImplementedError("Method must be redefined in %s" % self.__class__.__name__)
 
+    def filtered_iterations(self, test_tags, with_tags, without_tags):
+        """
+        Returns the iterations (as `iterations` does) that might match the given tag filters, for a test with the
+        given tags. The test runner checks the tags of each iteration anyway: data providers able to filter
+        iterations at their source (e.g. within a database query) can redefine it, so iterations that are filtered
+        out are never loaded. Data providers are not required to redefine it.
+        :param test_tags: [set] the tags of the test
+        :param with_tags: [set] tests (or iterations) must have any of these tags (if any)
+        :param without_tags: [set] tests (or iterations) must have none of these tags
+        """
+        return self.iterations
+
+    @property
+    def parallel_iterations(self):
+        """
+        Number of iterations that can run at the same time (None or 1 to run them one after the other).
+        Overrides the test case PARALLEL_ITERATIONS setting. Data providers are not required to redefine it.
+        :return: [None|int]
+        """
+        return None
+
+    @property
+    def fixtures(self):
+        """
+        Names of the suite scoped fixtures (see marvin.core.fixtures) required by the test, injected into its setup
+        data. Data providers are not required to redefine it.
+        :return: [None|iterable[String]]
+        """
+        return None
+
     @property
     def tear_down_data(self):
         """Returns a python object with the data to be passed to the 'tear_down' phase of the Test Script"""
@@ -1,25 +1,80 @@
+import os
+
 
 class DataProviderRegistry(object):
     """
-    Keeps track of the available DataProvider classes
+    Keeps track of the available DataProvider classes.
+    Classes registered last take precedence. An index of the classes handling each file extension is kept, so
+    finding the class for a data source only asks the classes that might handle it (i.e. those supporting its
+    extension, and those not keyed on extensions), and skips asking file data providers which only key on the
+    extension.
     """
 
     DATA_PROVIDERS = []
+    _EXTENSIONS = set()
+    _BY_EXTENSION = {}
+    _FALLBACK = []
 
     @classmethod
     def register(cls, *data_provider_classes):
         for data_provider_class in data_provider_classes:
             if data_provider_class not in cls.DATA_PROVIDERS:
                 cls.DATA_PROVIDERS.insert(0, data_provider_class)
+        cls._build_index()
+
+    @classmethod
+    def unregister(cls, *data_provider_classes):
+        for data_provider_class in data_provider_classes:
+            if data_provider_class in cls.DATA_PROVIDERS:
+                cls.DATA_PROVIDERS.remove(data_provider_class)
+        cls._build_index()
 
     @classmethod
     def data_provider_for(cls, data_source_id):
-        return next((data_provider_class(data_source_id)
-                     for data_provider_class in cls.DATA_PROVIDERS
-                     if data_provider_class.handles(data_source_id)), None)
+        data_provider_class = cls.data_provider_class_for(data_source_id)
+        return data_provider_class(data_source_id) if data_provider_class else None
+
+    @classmethod
+    def data_provider_class_for(cls, data_source_id):
+        candidates = cls._BY_EXTENSION.get(cls._extension(data_source_id), cls._FALLBACK)
+        return next((data_provider_class
+                     for data_provider_class, extension_only in candidates
+                     if extension_only or data_provider_class.handles(data_source_id)), None)
 
     @classmethod
     def supported_file_extensions(cls):
-        return set(ext
-                   for dp in cls.DATA_PROVIDERS if hasattr(dp, 'supported_extensions')
-                   for ext in dp.supported_extensions())
+        return set(cls._EXTENSIONS)
+
+    @classmethod
+    def _build_index(cls):
+        from marvin.data.file_data_provider import FileDataProvider
+
+        extensions = {}
+        for data_provider_class in cls.DATA_PROVIDERS:
+            if hasattr(data_provider_class, 'supported_extensions'):
+                extensions[data_provider_class] = set(ext.lower() for ext in data_provider_class.supported_extensions())
+
+        cls._EXTENSIONS = set(ext for provider_extensions in extensions.values() for ext in provider_extensions)
+        cls._FALLBACK = [(data_provider_class, False)
+                         for data_provider_class in cls.DATA_PROVIDERS if data_provider_class not in extensions]
+        cls._BY_EXTENSION = {}
+        for ext in cls._EXTENSIONS:
+            cls._BY_EXTENSION[ext] = [
+                (data_provider_class, _handles_by_extension(data_provider_class, FileDataProvider))
+                for data_provider_class in cls.DATA_PROVIDERS
+                if ext in extensions.get(data_provider_class, [ext])
+            ]
+
+    @staticmethod
+    def _extension(data_source_id):
+        if not data_source_id:
+            return None
+        # ignore fragments identifying a part of the file (e.g. 'data.sqlite#table')
+        _, ext = os.path.splitext(data_source_id.split('#')[0])
+        return ext[1:].lower()
+
+
+def _handles_by_extension(data_provider_class, file_data_provider_class):
+    """Whether the data provider class handles any source with one of its supported extensions"""
+    return (issubclass(data_provider_class, file_data_provider_class)
+            and getattr(data_provider_class.handles, '__func__', None) is file_data_provider_class.handles.__func__)
@@ -0,0 +1,37 @@
+"""CSV Data Provider"""
+
+import csv
+import mmap
+import os
+
+from marvin.data.tabular_data_provider import TabularDataProvider
+from marvin.util import compat
+
+
+class CSVDataProvider(TabularDataProvider):
+    """
+    DataDriven data provider for CSV sources (UTF-8 encoded, with a header row), e.g.:
+        iteration_name,iteration_tags,username,account_type
+        Viewer user,,john,viewer
+        Admin user,regression smoke,mary,admin
+    Each row is an iteration, whose data is a dict of the (string) values of the columns.
+    """
+
+    @classmethod
+    def load_rows(cls, source_id):
+        with open(source_id, 'rb') as file_handle:
+            if os.fstat(file_handle.fileno()).st_size == 0:
+                return
+            mapped = mmap.mmap(file_handle.fileno(), 0, access=mmap.ACCESS_READ)
+            try:
+                lines = iter(mapped.readline, b'')
+                if compat.IS_PYTHON_3:
+                    lines = (line.decode('utf-8-sig') for line in lines)
+                for row in csv.DictReader(lines):
+                    yield dict(row)
+            finally:
+                mapped.close()
+
+    @classmethod
+    def supported_extensions(cls):
+        return ['csv']
@@ -0,0 +1,22 @@
+"""JSON Lines Data Provider"""
+
+from marvin.data.streaming_file_data_provider import StreamingFileDataProvider
+from marvin.util import loaders
+
+
+class JSONLinesDataProvider(StreamingFileDataProvider):
+    """
+    DataDriven data provider for JSON Lines sources, for data files too big to be loaded at once.
+    The data_source_id of this provider is the path to a `.jsonl` file holding one JSON object per line:
+        {"name": "Test Name", "setup_data": {"any": "data"}}
+        {"name": "first iteration", "data": {"some": "data"}}
+        {"name": "second iteration", "data": {"another": "iteration"}}
+    """
+
+    @classmethod
+    def load_documents(cls, file_handle):
+        return (loaders.json_loads(line) for line in file_handle if line.strip())
+
+    @classmethod
+    def supported_extensions(cls):
+        return ['jsonl']
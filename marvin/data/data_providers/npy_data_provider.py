@@ -0,0 +1,36 @@
+"""NumPy (.npy) Data Provider"""
+
+from marvin.data.tabular_data_provider import TabularDataProvider
+
+
+class NPYDataProvider(TabularDataProvider):
+    """
+    DataDriven data provider for NumPy `.npy` files holding a structured array (i.e. with named fields, a compact
+    binary columnar format), which is memory mapped rather than loaded. Requires numpy.
+    Each record is an iteration, whose data is a dict of its fields (as python values).
+    """
+
+    @classmethod
+    def load_rows(cls, source_id):
+        try:
+            import numpy
+        except ImportError:
+            raise ImportError("numpy is required to load the data file: %s" % source_id)
+
+        table = numpy.load(source_id, mmap_mode='r')
+        fields = table.dtype.names
+        if not fields:
+            raise ValueError("Data file must hold a structured array (i.e. with named fields): %s" % source_id)
+        for record in table:
+            yield dict((field, _python_value(record[field])) for field in fields)
+
+    @classmethod
+    def supported_extensions(cls):
+        return ['npy']
+
+
+def _python_value(value):
+    value = value.tolist()
+    if isinstance(value, bytes) and not isinstance(value, str):
+        return value.decode('utf-8')
+    return value
@@ -0,0 +1,79 @@
+"""SQLite Data Provider"""
+
+import sqlite3
+
+from marvin.data.tabular_data_provider import TabularDataProvider
+
+
+class SQLiteDataProvider(TabularDataProvider):
+    """
+    DataDriven data provider for SQLite databases.
+    The data_source_id of this provider is the path to the database file, optionally followed by `#` and the name
+    of the table holding the iterations (`iterations` by default), e.g. `tests/users.sqlite#admin_users`.
+    Each row is an iteration (see TabularDataProvider). Rows are fetched with a cursor as they are iterated over,
+    and tag filters are applied within the query (on the iteration_tags column, holding whitespace separated tags),
+    so iterations that are filtered out are never loaded.
+    """
+
+    DEFAULT_TABLE = 'iterations'
+
+    @classmethod
+    def handles(cls, source_id):
+        return super(SQLiteDataProvider, cls).handles(source_id.split('#')[0] if source_id else source_id)
+
+    @classmethod
+    def supported_extensions(cls):
+        return ['sqlite', 'sqlite3']
+
+    @classmethod
+    def load_rows(cls, source_id, with_tags=(), without_tags=()):
+        """
+        Returns an iterator over the rows of the table, skipping those tagged with any of `without_tags`, and
+        (if given) those not tagged with any of `with_tags`
+        """
+        path, _, table = source_id.partition('#')
+        table = table or cls.DEFAULT_TABLE
+
+        connection = sqlite3.connect(path)
+        try:
+            cursor = connection.cursor()
+            query, params = cls._query(cursor, table, with_tags, without_tags)
+            cursor.execute(query, params)
+            columns = [column[0] for column in cursor.description]
+            for values in cursor:
+                yield dict(zip(columns, values))
+        finally:
+            connection.close()
+
+    @classmethod
+    def _query(cls, cursor, table, with_tags, without_tags):
+        table = '"%s"' % table.replace('"', '""')
+        query, params = "SELECT * FROM %s" % table, []
+
+        cursor.execute("PRAGMA table_info(%s)" % table)
+        if cls.TAGS_COLUMN not in [column[1] for column in cursor.fetchall()]:
+            return query, params
+
+        # Tags are matched as whole words, once every separator is turned into a space (see TAG_SEPARATORS)
+        tags = "coalesce(\"%s\", '')" % cls.TAGS_COLUMN
+        for separator in cls.TAG_SEPARATORS[1:]:
+            tags = "replace(%s, char(%d), ' ')" % (tags, ord(separator))
+        tagged = "instr(' ' || %s || ' ', ?) > 0" % tags
+        conditions = []
+        if without_tags:
+            conditions.append("NOT (%s)" % " OR ".join([tagged] * len(without_tags)))
+            params.extend(' %s ' % tag for tag in sorted(without_tags))
+        if with_tags:
+            conditions.append("(%s)" % " OR ".join([tagged] * len(with_tags)))
+            params.extend(' %s ' % tag for tag in sorted(with_tags))
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        return query, params
+
+    # Overrides
+    def filtered_iterations(self, test_tags, with_tags, without_tags):
+        if test_tags & with_tags:
+            # every iteration matches
+            with_tags = set()
+        for row in self.load_rows(self._source_id, with_tags, without_tags):
+            yield self._iteration(row)
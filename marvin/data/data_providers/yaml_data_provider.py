@@ -1,8 +1,7 @@
 """YAML Data Provider"""
 
-import yaml
-
 from marvin.data.file_data_provider import FileDataProvider
+from marvin.util import loaders
 
 
 class YAMLDataProvider(FileDataProvider):
@@ -34,7 +33,8 @@ class YAMLDataProvider(FileDataProvider):
 
     @classmethod
     def load_obj(cls, file_handle):
-        return yaml.load(file_handle)
+        loader = loaders.loader_for(getattr(file_handle, 'name', '')) or loaders.load_yaml
+        return loader(file_handle)
 
     @classmethod
     def supported_extensions(cls):
@@ -0,0 +1,36 @@
+"""Multi-document YAML Data Provider"""
+
+from marvin.data.streaming_file_data_provider import StreamingFileDataProvider
+from marvin.util import loaders
+
+
+class YAMLStreamDataProvider(StreamingFileDataProvider):
+    """
+    DataDriven data provider for multi-document YAML sources, for data files too big to be loaded at once.
+    The data_source_id of this provider is the path to a `.stream.yaml` (or `.stream.yml`) file like:
+        name: Test Name
+        setup_data:
+            any: data
+        ---
+        name: first iteration
+        data:
+            some: data
+        ---
+        name: second iteration
+        data:
+            another: iteration
+    """
+
+    STREAM_SUFFIXES = ('.stream.yaml', '.stream.yml')
+
+    @classmethod
+    def handles(cls, source_id):
+        return bool(source_id) and source_id.lower().endswith(cls.STREAM_SUFFIXES)
+
+    @classmethod
+    def load_documents(cls, file_handle):
+        return loaders.load_yaml_all(file_handle)
+
+    @classmethod
+    def supported_extensions(cls):
+        return ['yml', 'yaml']
@@ -0,0 +1,88 @@
+from marvin.data import DataProvider, FileDataProvider
+
+
+class DeferredDataProvider(DataProvider):
+    """
+    Lightweight stand-in for a data provider, which is only built (i.e. its data source loaded) when its data is
+    first needed, usually when the test starts. Until then it can be planned (sharded, sorted, counted...) at no cost.
+    Tags can be given up front (e.g. known from a previous run), so filtering by tags doesn't load the data either.
+    File data providers are given the `data_cache` (a DataCache), if any.
+    """
+
+    UNKNOWN_TAGS = object()
+
+    def __init__(self, data_provider_class, source_id, tags=UNKNOWN_TAGS, data_cache=None):
+        super(DeferredDataProvider, self).__init__(source_id)
+        self._data_provider_class = data_provider_class
+        self._tags = tags
+        self._data_cache = data_cache
+        self._data_provider = None
+
+    @classmethod
+    def handles(cls, source_id):
+        return False
+
+    @property
+    def data_provider_class(self):
+        """The class of the deferred data provider"""
+        return self._data_provider_class
+
+    @property
+    def loaded(self):
+        """Whether the deferred data provider has been built"""
+        return self._data_provider is not None
+
+    def load(self):
+        """Builds (if it wasn't already) and returns the deferred data provider"""
+        if self._data_provider is None:
+            if self._data_cache is not None and issubclass(self._data_provider_class, FileDataProvider):
+                self._data_provider = self._data_provider_class(self._source_id, data_cache=self._data_cache)
+            else:
+                self._data_provider = self._data_provider_class(self._source_id)
+        return self._data_provider
+
+    # Overrides
+    @property
+    def name(self):
+        return self.load().name
+
+    # Overrides
+    @property
+    def description(self):
+        return self.load().description
+
+    # Overrides
+    @property
+    def tags(self):
+        if self._tags is self.UNKNOWN_TAGS:
+            return self.load().tags
+        return self._tags
+
+    # Overrides
+    @property
+    def setup_data(self):
+        return self.load().setup_data
+
+    # Overrides
+    @property
+    def iterations(self):
+        return self.load().iterations
+
+    # Overrides
+    def filtered_iterations(self, test_tags, with_tags, without_tags):
+        return self.load().filtered_iterations(test_tags, with_tags, without_tags)
+
+    # Overrides
+    @property
+    def parallel_iterations(self):
+        return self.load().parallel_iterations
+
+    # Overrides
+    @property
+    def fixtures(self):
+        return self.load().fixtures
+
+    # Overrides
+    @property
+    def tear_down_data(self):
+        return self.load().tear_down_data
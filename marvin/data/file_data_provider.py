@@ -7,10 +7,32 @@ class FileDataProvider(DataProvider):
     Base abstract class for file system based data providers
     """
 
-    def __init__(self, *args, **kargs):
-        super(FileDataProvider, self).__init__(*args, **kargs)
-        with open(self._source_id, "r") as file_handle:
-            self._data = self.load_obj(file_handle) or {}
+    # Whether this provider's data files can be kept in a DataCache
+    CACHEABLE = True
+
+    def __init__(self, source_id, data_cache=None):
+        """
+        :param source_id: the data file path
+        :param data_cache: DataCache where parsed data files are kept across runs, if any
+        """
+        super(FileDataProvider, self).__init__(source_id)
+        self._data_cache = data_cache
+        self._data = self._load_data()
+
+    def _load_data(self):
+        cache = self._data_cache if self.CACHEABLE else None
+        data = cache.get(self.__class__, self._source_id) if cache else None
+        if data is None:
+            data = self.load(self._source_id)
+            if cache:
+                cache.put(self.__class__, self._source_id, data)
+        return data
+
+    @classmethod
+    def load(cls, source_id):
+        """Parses the given data file"""
+        with open(source_id, "r") as file_handle:
+            return cls.load_obj(file_handle) or {}
 
     @classmethod
     def supported_extensions(cls):
@@ -54,6 +76,16 @@ class FileDataProvider(DataProvider):
         for it_data in self._data.get('iterations', []):
             yield IterationData(**it_data)
 
+    # Overrides
+    @property
+    def parallel_iterations(self):
+        return self._data.get('parallel_iterations')
+
+    # Overrides
+    @property
+    def fixtures(self):
+        return self._data.get('fixtures')
+
     # Overrides
     @property
     def tear_down_data(self):
@@ -0,0 +1,37 @@
+from marvin.data import IterationData
+from marvin.data.file_data_provider import FileDataProvider
+
+
+class StreamingFileDataProvider(FileDataProvider):
+    """
+    Base abstract class for file system based data providers holding a sequence of documents: the first one is
+    the header (with the same keys as a regular data file: name, description, tags, setup_data, etc.) and each of
+    the following ones is an iteration.
+    Only the header is loaded when the provider is built. Iterations are read from the file as they are consumed,
+    so memory usage doesn't depend on the number of iterations.
+    """
+
+    # Overrides
+    CACHEABLE = False
+
+    @classmethod
+    def load_documents(cls, file_handle):
+        """Returns an iterator over the documents in the given file, reading them incrementally"""
+        raise NotImplementedError("Method must be redefined in %s" % cls.__name__)
+
+    # Overrides
+    def _load_data(self):
+        with open(self._source_id, "r") as file_handle:
+            return next(iter(self.load_documents(file_handle)), None) or {}
+
+    # Overrides
+    @property
+    def iterations(self):
+        for it_data in self._data.get('iterations', []):
+            yield IterationData(**it_data)
+
+        with open(self._source_id, "r") as file_handle:
+            documents = iter(self.load_documents(file_handle))
+            next(documents, None)
+            for it_data in documents:
+                yield IterationData(**(it_data or {}))
@@ -0,0 +1,52 @@
+from marvin.data import IterationData
+from marvin.data.file_data_provider import FileDataProvider
+
+
+class TabularDataProvider(FileDataProvider):
+    """
+    Base abstract class for file system based data providers holding a table: one iteration per row, with the same
+    fields each. Rows are read from the (memory mapped) file as they are iterated over, without loading the whole
+    table.
+    The iteration name, description and tags come from the columns named after NAME_COLUMN, DESCRIPTION_COLUMN and
+    TAGS_COLUMN (if any, with tags separated by ASCII whitespace, see TAG_SEPARATORS). The rest of the columns are the
+    iteration data, a dict.
+    Tables have no room for test level data: name, description, tags, setup and tear down data are all None.
+    """
+
+    NAME_COLUMN = 'iteration_name'
+    DESCRIPTION_COLUMN = 'iteration_description'
+    TAGS_COLUMN = 'iteration_tags'
+    # Characters tags are separated by (i.e. ASCII whitespace)
+    TAG_SEPARATORS = ' \t\n\r\x0b\x0c'
+
+    # Overrides
+    CACHEABLE = False
+
+    @classmethod
+    def load_rows(cls, source_id):
+        """Returns an iterator over the rows of the given table file, as dicts (column name => value)"""
+        raise NotImplementedError("Method must be redefined in %s" % cls.__name__)
+
+    # Overrides
+    def _load_data(self):
+        return {}
+
+    # Overrides
+    @property
+    def iterations(self):
+        for row in self.load_rows(self._source_id):
+            yield self._iteration(row)
+
+    def _iteration(self, row):
+        name = row.pop(self.NAME_COLUMN, None)
+        description = row.pop(self.DESCRIPTION_COLUMN, None)
+        tags = row.pop(self.TAGS_COLUMN, None)
+        return IterationData(data=row, name=name or None, description=description or None,
+                             tags=self._split_tags(tags) if tags else None)
+
+    @classmethod
+    def _split_tags(cls, tags):
+        # Only on TAG_SEPARATORS (unlike str.split), so data providers filtering tags at their source can match them
+        for separator in cls.TAG_SEPARATORS[1:]:
+            tags = tags.replace(separator, ' ')
+        return [tag for tag in tags.split(' ') if tag]
@@ -1,4 +1,4 @@
 from marvin.report.events import EventType
-from marvin.report.publisher import Publisher
+from marvin.report.publisher import AsyncPublisher, Publisher
 
-__all__ = ['EventType', 'Publisher']
+__all__ = ['AsyncPublisher', 'EventType', 'Publisher']
@@ -1,6 +1,9 @@
+"""Events that occur in Marvin"""
+from __future__ import division
+
 import time
 
-"""Events that occur in Marvin"""
+from marvin.util import compat
 
 
 class EventType(object):
@@ -19,22 +22,56 @@ class EventType(object):
     STEP_SKIPPED = 130
 
 
+class Instant(object):
+    """
+    A point in time: the wall clock time (reported as timestamps) along with a monotonic clock reading (used to
+    measure durations, so they are accurate below the millisecond and not affected by wall clock adjustments)
+    """
+    __slots__ = ('timestamp', 'clock')
+
+    def __init__(self, timestamp, clock):
+        self.timestamp = timestamp
+        self.clock = clock
+
+    @classmethod
+    def now(cls):
+        return cls(int(time.time() * 1000), compat.perf_counter_ns())
+
+
 class Event(object):
     """Abstract root Event class"""
+    __slots__ = ('_timestamp', '_clock')
+
     def __init__(self):
         self._timestamp = int(time.time() * 1000)
+        self._clock = compat.perf_counter_ns()
 
     @property
     def timestamp(self):
         """Event timestamp (Unix time with ms granularity)"""
         return self._timestamp
 
+    @property
+    def instant(self):
+        """The Instant when the event was triggered"""
+        return Instant(self._timestamp, self._clock)
+
+    def _elapsed_since(self, start_time):
+        """
+        :param start_time: the Instant (or the timestamp) when the measured execution started
+        :return: a (start timestamp, duration in nanoseconds) tuple
+        """
+        if isinstance(start_time, Instant):
+            return start_time.timestamp, self._clock - start_time.clock
+        return start_time, (self._timestamp - start_time) * 1000000
+
 
 # -- SUITE related events --
 
 
 class SuiteEvent(Event):
     """Abstract class for all Suite related events"""
+    __slots__ = ('_suite',)
 
     def __init__(self, suite):
         super(SuiteEvent, self).__init__()
@@ -49,17 +86,18 @@ class SuiteEvent(Event):
 class SuiteStartedEvent(SuiteEvent):
     """Triggered when a suite is about to start it's execution"""
     event_type = EventType.SUITE_STARTED
+    __slots__ = ()
 
 
 class SuiteEndedEvent(SuiteEvent):
     """Triggered when a suite has finished it's execution"""
     event_type = EventType.SUITE_ENDED
+    __slots__ = ('_start_time', '_duration_ns', '_status')
 
     def __init__(self, suite, start_time, status):
         super(SuiteEndedEvent, self).__init__(suite)
-        self._start_time = start_time
+        self._start_time, self._duration_ns = self._elapsed_since(start_time)
         self._status = status
-        self._duration = self.timestamp - start_time
 
     @property
     def start_time(self):
@@ -68,8 +106,13 @@ class SuiteEndedEvent(SuiteEvent):
 
     @property
     def duration(self):
-        """The suite execution time in ms"""
-        return self._duration
+        """The suite execution time in ms (accurate below the millisecond)"""
+        return self._duration_ns / 1000000
+
+    @property
+    def duration_ns(self):
+        """The suite execution time in ns"""
+        return self._duration_ns
 
     @property
     def status(self):
@@ -82,6 +125,7 @@ class SuiteEndedEvent(SuiteEvent):
 
 class TestEvent(Event):
     """Abstract class for all TestScript related events"""
+    __slots__ = ('_test_script', '_data_provider')
 
     def __init__(self, test_script, data_provider):
         super(TestEvent, self).__init__()
@@ -102,18 +146,19 @@ class TestEvent(Event):
 class TestStartedEvent(TestEvent):
     """Triggered when a test is about to start it's execution"""
     event_type = EventType.TEST_STARTED
+    __slots__ = ()
 
 
 class TestEndedEvent(TestEvent):
     """Triggered when a test has finished it's execution"""
     event_type = EventType.TEST_ENDED
+    __slots__ = ('_start_time', '_duration_ns', '_status', '_exceptions')
 
     def __init__(self, test_script, data_provider, start_time, status, exceptions):
         super(TestEndedEvent, self).__init__(test_script, data_provider)
-        self._start_time = start_time
+        self._start_time, self._duration_ns = self._elapsed_since(start_time)
         self._status = status
         self._exceptions = exceptions
-        self._duration = self.timestamp - start_time
 
     @property
     def start_time(self):
@@ -122,8 +167,13 @@ class TestEndedEvent(TestEvent):
 
     @property
     def duration(self):
-        """The test execution time in ms"""
-        return self._duration
+        """The test execution time in ms (accurate below the millisecond)"""
+        return self._duration_ns / 1000000
+
+    @property
+    def duration_ns(self):
+        """The test execution time in ns"""
+        return self._duration_ns
 
     @property
     def status(self):
@@ -141,6 +191,7 @@ class TestEndedEvent(TestEvent):
 
 class TestPhaseStartedEvent(TestEvent):
     """Abstract class for test's phase started: setup, iteration(s), tear down"""
+    __slots__ = ('_data',)
 
     def __init__(self, test_script, data_provider, data):
         super(TestPhaseStartedEvent, self).__init__(test_script, data_provider)
@@ -154,14 +205,14 @@ class TestPhaseStartedEvent(TestEvent):
 
 class TestPhaseEndedEvent(TestEvent):
     """Abstract class for test's phase ended: setup, iteration(s), tear down"""
+    __slots__ = ('_data', '_start_time', '_duration_ns', '_status', '_exception')
 
     def __init__(self, test_script, data_provider, data, start_time, status, exception):
         super(TestPhaseEndedEvent, self).__init__(test_script, data_provider)
         self._data = data
-        self._start_time = start_time
+        self._start_time, self._duration_ns = self._elapsed_since(start_time)
         self._status = status
         self._exception = exception
-        self._duration = self.timestamp - start_time
 
     @property
     def data(self):
@@ -175,8 +226,13 @@ class TestPhaseEndedEvent(TestEvent):
 
     @property
     def duration(self):
-        """The phase execution time in ms"""
-        return self._duration
+        """The phase execution time in ms (accurate below the millisecond)"""
+        return self._duration_ns / 1000000
+
+    @property
+    def duration_ns(self):
+        """The phase execution time in ns"""
+        return self._duration_ns
 
     @property
     def status(self):
@@ -195,16 +251,19 @@ class TestPhaseEndedEvent(TestEvent):
 class TestSetupStartedEvent(TestPhaseStartedEvent):
     """Triggered when a test's setup phase is about to start"""
     event_type = EventType.TEST_SETUP_STARTED
+    __slots__ = ()
 
 
 class TestSetupEndedEvent(TestPhaseEndedEvent):
     """Triggered when a test's setup phase has concluded"""
     event_type = EventType.TEST_SETUP_ENDED
+    __slots__ = ()
 
 
 class TestIterationStartedEvent(TestPhaseStartedEvent):
     """Triggered when a test's iteration is about to start"""
     event_type = EventType.TEST_ITERATION_STARTED
+    __slots__ = ('_iteration',)
 
     def __init__(self, test_script, data_provider, iteration):
         super(TestIterationStartedEvent, self).__init__(test_script, data_provider, iteration.data)
@@ -219,6 +278,7 @@ class TestIterationStartedEvent(TestPhaseStartedEvent):
 class TestIterationEndedEvent(TestPhaseEndedEvent):
     """Triggered when a test's iteration has concluded"""
     event_type = EventType.TEST_ITERATION_ENDED
+    __slots__ = ('_iteration',)
 
     def __init__(self, test_script, data_provider, iteration, start_time, status, exception):
         super(TestIterationEndedEvent, self).__init__(test_script, data_provider, iteration.data,
@@ -234,11 +294,13 @@ class TestIterationEndedEvent(TestPhaseEndedEvent):
 class TestTearDownStartedEvent(TestPhaseStartedEvent):
     """Triggered when a test's tear down phase is about to start"""
     event_type = EventType.TEST_TEARDOWN_STARTED
+    __slots__ = ()
 
 
 class TestTearDownEndedEvent(TestPhaseEndedEvent):
     """Triggered when a test's tear down phase has concluded"""
     event_type = EventType.TEST_TEARDOWN_ENDED
+    __slots__ = ()
 
 
 # -- STEP related events --
@@ -246,6 +308,8 @@ class TestTearDownEndedEvent(TestPhaseEndedEvent):
 
 class StepEvent(Event):
     """Abstract class for all Step related events"""
+    __slots__ = ('_step',)
+
     def __init__(self, step):
         super(StepEvent, self).__init__()
         self._step = step
@@ -259,6 +323,7 @@ class StepEvent(Event):
 class StepStartedEvent(StepEvent):
     """Triggered when a Step is about to be executed"""
     event_type = EventType.STEP_STARTED
+    __slots__ = ('_args', '_kwargs')
 
     def __init__(self, step, args, kwargs):
         super(StepStartedEvent, self).__init__(step)
@@ -279,13 +344,13 @@ class StepStartedEvent(StepEvent):
 class StepEndedEvent(StepEvent):
     """Triggered when a Step has finished it's execution"""
     event_type = EventType.STEP_ENDED
+    __slots__ = ('_status', '_result', '_start_time', '_duration_ns', '_exception')
 
     def __init__(self, step, status, result, start_time, exception=(None, None, None)):
         super(StepEndedEvent, self).__init__(step)
         self._status = status
         self._result = result
-        self._start_time = start_time
-        self._duration = self.timestamp - start_time
+        self._start_time, self._duration_ns = self._elapsed_since(start_time)
         self._exception = exception
 
     @property
@@ -305,8 +370,13 @@ class StepEndedEvent(StepEvent):
 
     @property
     def duration(self):
-        """The step execution time in ms"""
-        return self._duration
+        """The step execution time in ms (accurate below the millisecond)"""
+        return self._duration_ns / 1000000
+
+    @property
+    def duration_ns(self):
+        """The step execution time in ns"""
+        return self._duration_ns
 
     @property
     def exception(self):
@@ -320,6 +390,7 @@ class StepEndedEvent(StepEvent):
 class StepSkippedEvent(StepEvent):
     """Triggered when a step is being skipped"""
     event_type = EventType.STEP_SKIPPED
+    __slots__ = ('_exception',)
 
     def __init__(self, step, exception):
         super(StepSkippedEvent, self).__init__(step)
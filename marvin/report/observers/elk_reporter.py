@@ -1,23 +1,36 @@
-import time
+import collections
 import json
+import os
+import sys
+import tempfile
+import threading
+import time
 from datetime import datetime
 
 from marvin.report import EventType
-from marvin.util.compat import urllib_mod
+from marvin.util import compat
 
 
 class ELKReporter(object):
+    """
+    Reports the executed tests (along with their steps) to Elasticsearch. Each test is a document, streamed through
+    the `_bulk` API (see BulkSender) as soon as the test ends, so memory usage doesn't grow with the suite.
+    Extra keyword arguments are passed to the BulkSender (e.g. batch_size, flush_interval, retries or spill_file).
+    """
 
-    def __init__(self, publisher, base_url, index, schema_type="marvin"):
+    def __init__(self, publisher, base_url, index, schema_type="marvin", **sender_options):
         publisher.subscribe(self.on_step_ended, EventType.STEP_ENDED)
         publisher.subscribe(self.on_test_started, EventType.TEST_STARTED)
         publisher.subscribe(self.on_test_ended, EventType.TEST_ENDED)
         publisher.subscribe(self.on_suite_ended, EventType.SUITE_ENDED)
-        self.tests = []
         self._current_test = None
-        self._base_url = base_url
-        self._index = index
-        self._type = schema_type
+        self._action = self._bulk_line({"index": self._index_metadata(index, schema_type)})
+        self._sender = BulkSender(base_url, **sender_options)
+
+    @property
+    def sender(self):
+        """The BulkSender delivering the documents"""
+        return self._sender
 
     def on_test_started(self, event):
         test_script = event.test_script
@@ -25,7 +38,7 @@ class ELKReporter(object):
         self._current_test = {
             "name": test_script.name,
             "description": test_script.description,
-            "tags": test_script.tags,
+            "tags": sorted(test_script.tags),
             "steps": []
         }
 
@@ -33,14 +46,15 @@ class ELKReporter(object):
         self._current_test["status"] = event.status
         self._current_test["timestamp"] = self._ms_to_iso(event.timestamp)
         self._current_test["duration"] = event.duration
-        self.tests.append(self._current_test)
+        self._sender.add(self._action + self._bulk_line(self._current_test))
+        self._current_test = None
 
     def on_step_ended(self, event):
         step = event.step
         step_info = {
             "name": step.name,
             "description": step.description,
-            "tags": step.tags,
+            "tags": sorted(step.tags),
             "status": event.status,
             "timestamp": self._ms_to_iso(event.timestamp),
             "duration": event.duration
@@ -48,14 +62,276 @@ class ELKReporter(object):
         self._current_test['steps'].append(step_info)
 
     def on_suite_ended(self, _event):
-        self._publish()
+        self._sender.close()
+
+    def _index_metadata(self, index, schema_type):
+        # Mapping types are gone since Elasticsearch 7: pass schema_type=None there
+        if schema_type:
+            return {"_index": index, "_type": schema_type}
+        return {"_index": index}
 
-    def _publish(self):
-        url = self._base_url + self._index + '/' + self._type
-        data = json.dumps({"tests": self.tests, "timestamp": self._ms_to_iso(time.time() * 1000)})
-        urllib = urllib_mod()
-        req = urllib.Request(url, data, {'Content-Type': 'application/json'})
-        urllib.urlopen(req)
+    def _bulk_line(self, obj):
+        return (json.dumps(obj, default=repr) + "\n").encode('utf-8')
 
     def _ms_to_iso(self, milliseconds):
         return datetime.fromtimestamp(milliseconds/1000.0).isoformat()
+
+
+class BulkSender(object):
+    """
+    Sends documents to the Elasticsearch bulk API from a background thread, over a persistent (keep-alive)
+    connection. Documents are sent in batches of up to `batch_size` documents (or `batch_bytes` bytes), at least
+    every `flush_interval` seconds. Failed requests are retried up to `retries` times, waiting `backoff` seconds
+    before the first retry (and twice as much before each of the next ones).
+    When the endpoint doesn't keep up (more than `max_pending_bytes` are waiting to be sent), can't be reached, or
+    refuses the requests (e.g. a wrong URL, or missing credentials, which are reported to stderr), documents are
+    written to a spill file (a temporary file, unless `spill_file` is given), and sent from there later.
+    Documents that couldn't be sent by the time the sender is closed are left in the spill file, which is a valid
+    bulk request body (i.e. it can be sent later on, or by the next run when it's the same `spill_file`).
+    """
+
+    RETRIABLE_STATUSES = (429, 500, 502, 503, 504)
+
+    def __init__(self, base_url, batch_size=500, batch_bytes=5 * 1024 * 1024, flush_interval=5.0,
+                 max_pending_bytes=50 * 1024 * 1024, retries=5, backoff=0.5, timeout=30, spill_file=None):
+        url = compat.url_parse(base_url)
+        self._scheme = url.scheme
+        self._host = url.netloc
+        self._path = url.path.rstrip('/') + '/_bulk'
+        self._batch_size = batch_size
+        self._batch_bytes = batch_bytes
+        self._flush_interval = flush_interval
+        self._max_pending_bytes = max_pending_bytes
+        self._retries = retries
+        self._backoff = backoff
+        self._timeout = timeout
+        self._spill = SpillFile(spill_file)
+        self._pending = collections.deque()
+        self._pending_bytes = 0
+        self._condition = threading.Condition()
+        self._closed = False
+        self._connection = None
+        self._thread = None
+        self._refused_status = None
+        self.sent = 0
+        self.rejected = 0
+
+    @property
+    def spill_file(self):
+        """Path of the spill file (None if it was never needed)"""
+        return self._spill.path
+
+    def add(self, document):
+        """Queues a document to be sent: the bulk request lines (action and source) for it, as bytes"""
+        with self._condition:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='marvin-elk-sender')
+                self._thread.daemon = True
+                self._thread.start()
+            if self._pending_bytes + len(document) > self._max_pending_bytes:
+                self._spill.append([document])
+                return
+            self._pending.append(document)
+            self._pending_bytes += len(document)
+            if self._batch_ready():
+                self._condition.notify_all()
+
+    def close(self):
+        """Sends the queued documents (waiting for it) and stops the sender"""
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        if self._thread is not None:
+            self._thread.join()
+        self._disconnect()
+        if self._spill.close():
+            sys.stderr.write("ELKReporter: some documents could not be sent, they were kept in: %s\n" %
+                             self._spill.path)
+
+    def _batch_ready(self):
+        return len(self._pending) >= self._batch_size or self._pending_bytes >= self._batch_bytes
+
+    def _run(self):
+        unreachable = False
+        while True:
+            with self._condition:
+                deadline = time.time() + self._flush_interval
+                while not (self._closed or self._batch_ready()) and time.time() < deadline:
+                    self._condition.wait(deadline - time.time())
+                batch = self._take_batch()
+                closed = self._closed
+                if batch and closed and unreachable:
+                    # Don't wait for the retries of every batch on exit
+                    self._spill.append(batch)
+                    continue
+
+            if batch:
+                unreachable = not self._send(batch)
+                if unreachable:
+                    with self._condition:
+                        self._spill.append(batch)
+            elif closed and unreachable:
+                return
+            else:
+                # The queue is drained: catch up with the spilled documents
+                unreachable = not self._send_spilled()
+                if closed and not unreachable and not self._spill.has_documents():
+                    return
+
+    def _take_batch(self):
+        batch = []
+        size = 0
+        while self._pending and len(batch) < self._batch_size and size < self._batch_bytes:
+            document = self._pending.popleft()
+            batch.append(document)
+            size += len(document)
+        self._pending_bytes -= size
+        return batch
+
+    def _send_spilled(self):
+        with self._condition:
+            batch, offset = self._spill.read(self._batch_size, self._batch_bytes)
+        if not batch:
+            return True
+        if not self._send(batch):
+            return False
+        with self._condition:
+            self._spill.commit(offset)
+        return True
+
+    def _send(self, batch):
+        """
+        Sends a batch of documents, retrying if needed. Returns whether the request got through (even if
+        Elasticsearch rejected some of the documents, which are not retried), i.e. False if the endpoint couldn't be
+        reached or it refused the whole request
+        """
+        body = b''.join(batch)
+        for attempt in range(self._retries + 1):
+            if attempt:
+                time.sleep(self._backoff * 2 ** (attempt - 1))
+            try:
+                status, response = self._post(body)
+            except (IOError, OSError, compat.http_client_mod().HTTPException):
+                self._disconnect()
+                continue
+            if status in self.RETRIABLE_STATUSES:
+                continue
+            if not 200 <= status < 300:
+                self._report_refused(status, response)
+                return False
+            rejected = self._rejected_documents(response)
+            self.sent += len(batch) - rejected
+            self.rejected += rejected
+            return True
+        return False
+
+    def _report_refused(self, status, response):
+        # Once per status, as refused requests are tried again every flush interval
+        if status != self._refused_status:
+            self._refused_status = status
+            sys.stderr.write("ELKReporter: bulk request refused with HTTP status %d: %s\n" %
+                             (status, response[:1000].decode('utf-8', 'replace')))
+
+    def _post(self, body):
+        if self._connection is None:
+            http_client = compat.http_client_mod()
+            connection_class = http_client.HTTPSConnection if self._scheme == 'https' else http_client.HTTPConnection
+            self._connection = connection_class(self._host, timeout=self._timeout)
+        self._connection.request('POST', self._path, body, {'Content-Type': 'application/x-ndjson'})
+        response = self._connection.getresponse()
+        return response.status, response.read()
+
+    def _disconnect(self):
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    def _rejected_documents(self, response):
+        try:
+            result = json.loads(response.decode('utf-8'))
+        except ValueError:
+            return 0
+        if not result.get('errors'):
+            return 0
+        return sum(1 for item in result.get('items', []) for outcome in item.values() if 'error' in outcome)
+
+
+class SpillFile(object):
+    """
+    Bulk request lines (action and source of each document) waiting to be sent, kept in a file.
+    Documents are read from the start of the file, but only dropped from it once committed (i.e. sent).
+    """
+
+    def __init__(self, path=None):
+        self._path = path
+        self._file = None
+        self._offset = 0
+
+    @property
+    def path(self):
+        return self._path
+
+    def append(self, documents):
+        if self._file is None:
+            self._open()
+        self._file.seek(0, os.SEEK_END)
+        for document in documents:
+            self._file.write(document)
+        self._file.flush()
+
+    def has_documents(self):
+        return self._file is not None and self._size() > self._offset
+
+    def read(self, max_documents, max_bytes):
+        """Returns the first (not committed) documents, and the offset to commit once they are sent"""
+        if self._file is None and self._path and os.path.isfile(self._path):
+            self._open()  # left by a previous run
+        if not self.has_documents():
+            return [], self._offset
+        self._file.seek(self._offset)
+        documents = []
+        size = 0
+        while len(documents) < max_documents and size < max_bytes:
+            action = self._file.readline()
+            if not action:
+                break
+            document = action + self._file.readline()
+            documents.append(document)
+            size += len(document)
+        return documents, self._file.tell()
+
+    def commit(self, offset):
+        """Drops the documents before the given offset"""
+        self._offset = offset
+        if self._offset >= self._size():
+            self._file.seek(0)
+            self._file.truncate()
+            self._offset = 0
+
+    def close(self):
+        """Closes the file, which is removed if it has no documents left. Returns whether it has documents left"""
+        if self._file is None:
+            return False
+        left = self.has_documents()
+        if left and self._offset:
+            self._file.seek(self._offset)
+            remaining = self._file.read()
+            self._file.seek(0)
+            self._file.truncate()
+            self._file.write(remaining)
+        self._file.close()
+        self._file = None
+        if not left:
+            os.remove(self._path)
+        return left
+
+    def _open(self):
+        if self._path is None:
+            fd, self._path = tempfile.mkstemp(prefix='marvin-elk-', suffix='.ndjson')
+            self._file = os.fdopen(fd, 'w+b')
+        else:
+            self._file = open(self._path, 'a+b')
+
+    def _size(self):
+        self._file.seek(0, os.SEEK_END)
+        return self._file.tell()
@@ -1,12 +1,16 @@
+import atexit
 import sys
-import traceback
+import threading
+import time
 
 from colorama import Fore
 
 import marvin.util.files
 from marvin.core.status import Status
 from marvin.report import EventType as E
+from marvin.report.summary_store import SummaryStore
 from marvin.exceptions import ContextSkippedException
+from marvin.util.tracebacks import format_exception
 
 
 COLORS = {
@@ -34,30 +38,37 @@ class EventLogger(object):
     Prints the summary of test execution results in a terminal or file
     """
 
-    def __init__(self, publisher, dest=sys.stdout):
+    def __init__(self, publisher, dest=sys.stdout, quiet=False, buffer_size=0, flush_interval=1.0,
+                 summary_memory_limit=1000):
         """
         Builds and subscribes an EventLogger
         :param publisher: The context's publisher instance
         :param dest: The output destination (defaults to sys.stdout)
+        :param quiet: if True, only the execution summary is printed (when the suite ends)
+        :param buffer_size: if greater than 0, the output is buffered (see BufferedOutput) up to that many characters
+        :param flush_interval: max seconds buffered output is held back (if buffer_size is greater than 0)
+        :param summary_memory_limit: max number of test summaries held in memory (see SummaryStore) until the suite ends
         """
-        publisher.subscribe(self.on_step_started, E.STEP_STARTED)
-        publisher.subscribe(self.on_step_ended, E.STEP_ENDED)
+        if not quiet:
+            publisher.subscribe(self.on_step_started, E.STEP_STARTED)
+            publisher.subscribe(self.on_step_ended, E.STEP_ENDED)
+            publisher.subscribe(self.on_phase_started,
+                                E.TEST_SETUP_STARTED,
+                                E.TEST_ITERATION_STARTED,
+                                E.TEST_TEARDOWN_STARTED)
+            publisher.subscribe(self.on_phase_ended,
+                                E.TEST_SETUP_ENDED,
+                                E.TEST_ITERATION_ENDED,
+                                E.TEST_TEARDOWN_ENDED)
         publisher.subscribe(self.on_test_started, E.TEST_STARTED)
         publisher.subscribe(self.on_test_ended, E.TEST_ENDED)
-        publisher.subscribe(self.on_phase_started,
-                            E.TEST_SETUP_STARTED,
-                            E.TEST_ITERATION_STARTED,
-                            E.TEST_TEARDOWN_STARTED)
-        publisher.subscribe(self.on_phase_ended,
-                            E.TEST_SETUP_ENDED,
-                            E.TEST_ITERATION_ENDED,
-                            E.TEST_TEARDOWN_ENDED)
         publisher.subscribe(self.collect_iteration_status, E.TEST_ITERATION_ENDED)
         publisher.subscribe(self.on_suite_ended, E.SUITE_ENDED)
 
-        self._o = dest
-        self._color = marvin.util.files.supports_color(self._o)
-        self._suite_status = []
+        self._quiet = quiet
+        self._o = BufferedOutput(dest, buffer_size, flush_interval) if buffer_size > 0 else dest
+        self._color = marvin.util.files.supports_color(dest)
+        self._suite_status = SummaryStore(summary_memory_limit)
         self._reset_test_summary()
 
     def collect_iteration_status(self, event):
@@ -95,30 +106,44 @@ class EventLogger(object):
     def on_test_started(self, event):
         test_script = event.test_script
         self._reset_test_summary(test_script.name)
+        if self._quiet:
+            return
         test_header = self._in_color('HEADER', 'TEST')
         self._p("-" * 64)
         self._p("[%s] %s - %s", test_header, test_script.name, test_script.description)
 
     def _format_exception(self, exc_info):
-        return "%s\n%s" % (repr(exc_info[1]), ''.join(traceback.format_tb(exc_info[2])))
+        return format_exception(exc_info)
 
     def on_test_ended(self, event):
-        test_script = event.test_script
-        test_header = self._in_color('HEADER', 'TEST')
-        status = self._colored_status(event.status)
         self._current_test["status"] = event.status
-
-        self._suite_status.append(self._current_test)
         if event.status != Status.PASS:
             for exc_info in event.exceptions:
                 self._current_test["exceptions"].append(self._format_exception(exc_info))
+        self._suite_status.add(self._current_test)
+        if self._quiet:
+            return
+        test_script = event.test_script
+        test_header = self._in_color('HEADER', 'TEST')
+        status = self._colored_status(event.status)
         self._p("[%s - %s] %s (%s)", test_header, status, test_script.name, self._format_duration(event.duration))
+        self._flush()
 
     def on_suite_ended(self, event):
+        self.print_summary(self._suite_status)
+        self._suite_status.close()
+        self._flush()
+
+    def print_summary(self, tests):
+        """
+        Prints the execution summary of the given tests
+        :param tests: iterable of test summaries as collected by this logger (i.e. dictionaries with the
+        name, status, iterations status counters, and formatted exceptions of each test)
+        """
         self._p("\n" + "-" * 64)
         self._p("Execution Summary")
         self._p("-" * 64 + "\n")
-        for test in self._suite_status:
+        for test in tests:
             status = self._colored_status(test['status'])
             ipass = test['iterations'][Status.PASS]
             ifail = test['iterations'][Status.FAIL]
@@ -151,6 +176,10 @@ class EventLogger(object):
     def _p(self, s, *args):
         self._o.write(s % args + "\n")
 
+    def _flush(self):
+        if isinstance(self._o, BufferedOutput):
+            self._o.flush()
+
     def _colored_status(self, status):
         return self._in_color(status, status)
 
@@ -163,3 +192,60 @@ class EventLogger(object):
         if self._color:
             return COLORS.get(color, "%s") % s
         return s
+
+
+class BufferedOutput(object):
+    """
+    Holds the text written to it back, and writes it all at once to the given stream when `size` characters are
+    buffered, or at most `interval` seconds after it was written (a background thread takes care of that, so output
+    isn't held back while nothing else is written, e.g. during a long step). Also when flushed, and when the
+    interpreter exits.
+    """
+
+    def __init__(self, stream, size=65536, interval=1.0):
+        self._stream = stream
+        self._size = size
+        self._interval = interval
+        self._chunks = []
+        self._buffered = 0
+        self._last_flush = time.time()
+        self._condition = threading.Condition()
+        self._thread = None
+        atexit.register(self.flush)
+
+    def write(self, s):
+        with self._condition:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._flush_periodically, name='marvin-output')
+                self._thread.daemon = True
+                self._thread.start()
+            self._chunks.append(s)
+            self._buffered += len(s)
+            if self._buffered >= self._size or time.time() - self._last_flush >= self._interval:
+                self._flush()
+            elif len(self._chunks) == 1:
+                self._condition.notify_all()
+
+    def flush(self):
+        with self._condition:
+            self._flush()
+
+    def _flush_periodically(self):
+        with self._condition:
+            while True:
+                if not self._chunks:
+                    self._condition.wait()
+                    continue
+                remaining = self._last_flush + self._interval - time.time()
+                if remaining > 0:
+                    self._condition.wait(remaining)
+                else:
+                    self._flush()
+
+    def _flush(self):
+        if self._chunks:
+            self._stream.write(''.join(self._chunks))
+            self._chunks = []
+            self._buffered = 0
+        self._stream.flush()
+        self._last_flush = time.time()
@@ -1,13 +1,237 @@
+import collections
+import contextlib
+import os
+import pickle
+import sys
+import tempfile
+import threading
+
+from marvin.report.events import EventType
+from marvin.util import compat
+
 
 class Publisher(object):
 
     def __init__(self):
         self._observers = {}
+        self._lock = threading.RLock()
+        self._buffer = compat.context_local()
 
     def subscribe(self, observer, *event_types):
         for event_type in event_types:
             self._observers.setdefault(event_type, []).append(observer)
 
+    def has_observers(self, event_type):
+        """
+        Whether any observer is subscribed to the given event type. Events nobody observes don't need to be built
+        """
+        return event_type in self._observers
+
     def notify(self, event):
-        for observer in self._observers.get(event.event_type, []):
-            observer(event)
+        buffer = self._buffer.get()
+        if buffer is not None:
+            buffer.append(event)
+        else:
+            self._dispatch([event])
+
+    def flush(self):
+        """Waits until all the events notified so far are dispatched to the observers (they already are, here)"""
+
+    @property
+    def buffer(self):
+        """The EventBuffer where events notified by the current thread (or asyncio task) are held, if any"""
+        return self._buffer.get()
+
+    @contextlib.contextmanager
+    def buffered(self, parent=None):
+        """
+        Holds back the events notified within this context (i.e. by the current thread or asyncio task),
+        and notifies them all together on exit, so they don't get interleaved with events notified concurrently.
+        Buffers can be nested: on exit, events are moved to the enclosing buffer (or to the given `parent` buffer,
+        e.g. one owned by another thread) instead of being notified to the observers.
+        :return: the EventBuffer instance
+        """
+        buffer = EventBuffer(parent if parent is not None else self._buffer.get())
+        token = self._buffer.set(buffer)
+        try:
+            yield buffer
+        finally:
+            self._buffer.reset(token)
+            if buffer.parent is not None:
+                buffer.parent.extend(buffer.events)
+            else:
+                self._dispatch(buffer.events)
+
+    def _dispatch(self, events):
+        # Observers are not required to be thread safe, so they are notified by one thread at a time
+        with self._lock:
+            for event in events:
+                for observer in self._observers.get(event.event_type, []):
+                    observer(event)
+
+
+class AsyncPublisher(Publisher):
+    """
+    Publisher that notifies the observers from a dedicated thread, so slow observers (e.g. reporters doing network
+    or disk I/O) don't add their latency to the tests.
+    Notified events are queued, and dispatched one at a time in the same order they were notified. The queue holds
+    up to `queue_size` notifications (a single event, or the events of a `buffered` block). When it's full, the
+    `overflow` policy applies:
+     - 'block': the notifying thread waits until there is room in the queue
+     - 'drop': the events are discarded (see `dropped`)
+     - 'spill': the events are written to a temporary file, and read back once the queue is drained
+    Notifying the SUITE_ENDED event waits until all the events queued so far are dispatched (see `flush`).
+    """
+
+    OVERFLOW_POLICIES = ('block', 'drop', 'spill')
+
+    def __init__(self, queue_size=10000, overflow='block'):
+        super(AsyncPublisher, self).__init__()
+        if overflow not in self.OVERFLOW_POLICIES:
+            raise ValueError("Unknown overflow policy: '%s'" % overflow)
+        self._queue_size = max(1, int(queue_size))
+        self._overflow = overflow
+        self._queue = collections.deque()
+        self._spill = None
+        self._pending = 0
+        self._dropped = 0
+        self._failures = []
+        self._condition = threading.Condition()
+        self._thread = None
+
+    @property
+    def dropped(self):
+        """Number of events discarded so far because the queue was full (only for the 'drop' overflow policy)"""
+        return self._dropped
+
+    # Overrides
+    def notify(self, event):
+        super(AsyncPublisher, self).notify(event)
+        if event.event_type == EventType.SUITE_ENDED:
+            self.flush()
+
+    # Overrides
+    def flush(self):
+        """
+        Waits until all the events queued so far are dispatched.
+        If any observer failed meanwhile, its exception is raised here (as it would be raised by `notify` otherwise)
+        """
+        if self._on_dispatch_thread():
+            return
+        with self._condition:
+            while self._pending:
+                self._condition.wait()
+            failures, self._failures = self._failures, []
+        if failures:
+            raise compat.raise_exc_info(*failures[0])
+
+    # Overrides: events are queued here, and dispatched to the observers by the dispatch thread
+    def _dispatch(self, events):
+        if not events:
+            return
+        with self._condition:
+            self._start_dispatch_thread()
+            if self._spill is not None and self._spill.count:
+                # Once spilling, keep doing so until the dispatch thread catches up, so the order is kept
+                self._spill.write(events)
+            elif len(self._queue) < self._queue_size or self._on_dispatch_thread():
+                self._queue.append(events)
+            elif self._overflow == 'block':
+                while len(self._queue) >= self._queue_size:
+                    self._condition.wait()
+                self._queue.append(events)
+            elif self._overflow == 'drop':
+                self._dropped += len(events)
+                return
+            else:
+                self._spill = self._spill or _SpillFile()
+                self._spill.write(events)
+            self._pending += 1
+            self._condition.notify_all()
+
+    def _start_dispatch_thread(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._dispatch_loop, name='marvin-publisher')
+            self._thread.daemon = True
+            self._thread.start()
+
+    def _on_dispatch_thread(self):
+        # Observers notifying events themselves mustn't wait for the thread they run on
+        return self._thread is not None and threading.current_thread() is self._thread
+
+    def _dispatch_loop(self):
+        while True:
+            with self._condition:
+                while not self._queue and not (self._spill is not None and self._spill.count):
+                    self._condition.wait()
+                events = self._queue.popleft() if self._queue else self._spill.read()
+                self._condition.notify_all()
+
+            try:
+                super(AsyncPublisher, self)._dispatch(events)
+            except Exception:
+                failure = sys.exc_info()
+                with self._condition:
+                    self._failures.append(failure)
+
+            with self._condition:
+                self._pending -= 1
+                self._condition.notify_all()
+
+
+class _SpillFile(object):
+    """
+    Notifications that didn't fit in the AsyncPublisher queue, kept in a temporary file (in order).
+    Events are detached (see marvin.report.remote) to be written, and attached again when read back.
+    """
+
+    def __init__(self):
+        self._file = tempfile.TemporaryFile()
+        self._read_offset = 0
+        self.count = 0
+
+    def write(self, events):
+        from marvin.report.remote import detach  # marvin.report.remote depends on this module
+        self._file.seek(0, os.SEEK_END)
+        pickle.dump([detach(event) for event in events], self._file, pickle.HIGHEST_PROTOCOL)
+        self.count += 1
+
+    def read(self):
+        from marvin.report.remote import attach
+        self._file.seek(self._read_offset)
+        events = pickle.load(self._file)
+        self.count -= 1
+        if self.count:
+            self._read_offset = self._file.tell()
+        else:
+            self._file.seek(0)
+            self._file.truncate()
+            self._read_offset = 0
+        return [attach(event) for event in events]
+
+
+class EventBuffer(object):
+    """Events held back by Publisher.buffered"""
+
+    def __init__(self, parent=None):
+        self._parent = parent
+        self._events = []
+        self._lock = threading.Lock()
+
+    @property
+    def parent(self):
+        """The enclosing buffer (if any)"""
+        return self._parent
+
+    @property
+    def events(self):
+        """The list of buffered events"""
+        return self._events
+
+    def append(self, event):
+        with self._lock:
+            self._events.append(event)
+
+    def extend(self, events):
+        with self._lock:
+            self._events.extend(events)
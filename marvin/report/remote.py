@@ -0,0 +1,187 @@
+"""
+Helpers to move events across process boundaries.
+
+Events hold references to live objects (test scripts, steps, data providers, tracebacks) which can't be
+pickled. Before leaving a worker process each event is `detach`ed: those references are replaced by
+picklable snapshots exposing the information observers use. The receiving process must `attach` the
+event before notifying its own observers.
+"""
+import copy
+import inspect
+import pickle
+
+from marvin.core.context import Context
+from marvin.core.reportable import Reportable
+from marvin.core.step_runner import Result
+from marvin.data import DataProvider
+from marvin.report.publisher import Publisher
+from marvin.util.tracebacks import FormattedTraceback
+
+
+class RecordingPublisher(Publisher):
+    """
+    Publisher that keeps detached copies of the notified events instead of dispatching them to observers.
+    If given, the publisher the events are meant for tells which event types are observed.
+    """
+
+    def __init__(self, publisher=None):
+        super(RecordingPublisher, self).__init__()
+        self.events = []
+        self._publisher = publisher
+
+    def has_observers(self, event_type):
+        return self._publisher is None or self._publisher.has_observers(event_type)
+
+    def notify(self, event):
+        self.events.append(detach(event))
+
+
+class ReportableSnapshot(object):
+    """Picklable copy of a reportable context (e.g. a TestScript or a Step)"""
+
+    def __init__(self, reportable):
+        self.name = reportable.name
+        self.description = reportable.description
+        self.tags = set(reportable.tags)
+        self.level = reportable.level if isinstance(reportable, Context) else 0
+        self.class_name = reportable.__class__.__name__
+        self.class_module = reportable.__class__.__module__
+
+
+class DataProviderSnapshot(object):
+    """Picklable copy of a data provider meta data"""
+
+    def __init__(self, data_provider):
+        self.source_id = data_provider.source_id
+        self.name = data_provider.name
+        self.description = data_provider.description
+        self.tags = data_provider.tags
+        self.class_name = getattr(data_provider, 'data_provider_class', data_provider.__class__).__name__
+
+
+def detach(event):
+    """Returns a picklable copy of the given event"""
+    detached = copy.copy(event)
+    for attr in _attributes(event):
+        setattr(detached, attr, _detach(getattr(event, attr)))
+    return detached
+
+
+def attach(event):
+    """Restores (in place) a detached event so it can be notified to observers. Returns the event"""
+    for attr in _attributes(event):
+        setattr(event, attr, _attach(getattr(event, attr)))
+    return event
+
+
+def detach_exceptions(exc_infos):
+    """Returns picklable copies of the given sys.exc_info() like 3-tuples"""
+    return [_detach_exc_info(exc_info) for exc_info in exc_infos]
+
+
+def attach_exceptions(detached):
+    """Restores the sys.exc_info() like 3-tuples detached by `detach_exceptions`"""
+    return [exc_info.restore() for exc_info in detached]
+
+
+def _attributes(obj):
+    # Events keep their attributes in __slots__, but user defined ones may have a __dict__ too
+    names = list(getattr(obj, '__dict__', {}))
+    for cls in type(obj).__mro__:
+        slots = getattr(cls, '__slots__', ())
+        for name in ([slots] if isinstance(slots, str) else slots):
+            if name not in ('__dict__', '__weakref__') and hasattr(obj, name):
+                names.append(name)
+    return names
+
+
+def _detach(value):
+    if isinstance(value, Reportable):
+        return ReportableSnapshot(value)
+    if isinstance(value, DataProvider):
+        return DataProviderSnapshot(value)
+    if isinstance(value, Result):
+        return Result(_detach(value.get()))
+    if _is_exc_info(value):
+        return _detach_exc_info(value)
+    if _is_picklable(value):
+        return value
+    if isinstance(value, (list, tuple)):
+        return type(value)(_detach(item) for item in value)
+    if isinstance(value, dict):
+        return dict((key, _detach(item)) for key, item in value.items())
+    return repr(value)
+
+
+def _attach(value):
+    if isinstance(value, _DetachedExceptionInfo):
+        return value.restore()
+    if isinstance(value, list):
+        return [_attach(item) for item in value]
+    return value
+
+
+def _is_exc_info(value):
+    return (isinstance(value, tuple) and len(value) == 3
+            and inspect.isclass(value[0]) and issubclass(value[0], BaseException))
+
+
+def _is_picklable(value):
+    try:
+        pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+    except Exception:
+        return False
+    return True
+
+
+def _detach_exc_info(exc_info):
+    exc_type, exc_val, exc_tb = exc_info
+    return _DetachedExceptionInfo(exc_type, exc_val, exc_tb)
+
+
+class _DetachedExceptionInfo(object):
+    """
+    Picklable version of a sys.exc_info() 3-tuple.
+    The exception is rebuilt without calling its constructor, as user defined exceptions don't
+    necessarily accept their `args` back as constructor arguments.
+    """
+
+    def __init__(self, exc_type, exc_val, exc_tb):
+        self._type = _TypeReference(exc_type)
+        self._args = tuple(_detach(arg) for arg in getattr(exc_val, 'args', ()))
+        self._state = dict((key, _detach(value)) for key, value in getattr(exc_val, '__dict__', {}).items())
+        self._traceback = FormattedTraceback.from_traceback(exc_tb) if exc_tb is not None else None
+
+    def restore(self):
+        exc_type = self._type.resolve()
+        exc_val = exc_type.__new__(exc_type)
+        exc_val.args = self._args
+        exc_val.__dict__.update(self._state)
+        return exc_type, exc_val, self._traceback
+
+
+class _TypeReference(object):
+    """
+    Picklable reference to an exception class. Classes that can't be pickled by reference (e.g. defined in
+    test script modules) are replaced by an equally named subclass of their closest picklable ancestor.
+    """
+
+    _SURROGATES = {}
+
+    def __init__(self, cls):
+        self._name = cls.__name__
+        self._module = cls.__module__
+        self._class = None
+        self._base = None
+        if _is_picklable(cls):
+            self._class = cls
+        else:
+            self._base = next(base for base in inspect.getmro(cls)[1:] if _is_picklable(base))
+
+    def resolve(self):
+        if self._class is not None:
+            return self._class
+        key = (self._module, self._name, self._base)
+        if key not in self._SURROGATES:
+            self._SURROGATES[key] = type(self._name, (self._base,), {'__module__': self._module})
+        return self._SURROGATES[key]
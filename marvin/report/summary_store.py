@@ -0,0 +1,71 @@
+"""Storage for the per test summary records printed when the suite ends"""
+import json
+import struct
+import tempfile
+import zlib
+
+from marvin.core.status import Status
+
+
+class SummaryStore(object):
+    """
+    Keeps the summary records of the executed tests (i.e. dictionaries, as collected by EventLogger) in the order they
+    are added, without holding all of them in memory: once `memory_limit` records are held, they are compressed and
+    spilled to a temporary file. The number of tests per status is aggregated as records are added.
+    Iterating over the store yields the records in order (spilled ones are read back from the file).
+    """
+
+    _CHUNK_HEADER = struct.Struct('>I')
+
+    def __init__(self, memory_limit=1000):
+        self._memory_limit = max(1, memory_limit)
+        self._records = []
+        self._file = None
+        self._size = 0
+        self._counts = {Status.PASS: 0, Status.FAIL: 0, Status.SKIP: 0}
+
+    @property
+    def counts(self):
+        """Dictionary of status -> number of tests with that status"""
+        return self._counts
+
+    def add(self, record):
+        """Adds the summary record of a test (a JSON serializable dictionary, with its `status`)"""
+        self._records.append(record)
+        self._size += 1
+        if record.get('status') in self._counts:
+            self._counts[record['status']] += 1
+        if len(self._records) >= self._memory_limit:
+            self._spill()
+
+    def __len__(self):
+        return self._size
+
+    def __iter__(self):
+        if self._file is not None:
+            self._file.seek(0)
+            while True:
+                header = self._file.read(self._CHUNK_HEADER.size)
+                if not header:
+                    break
+                chunk = self._file.read(self._CHUNK_HEADER.unpack(header)[0])
+                for record in json.loads(zlib.decompress(chunk).decode('utf-8')):
+                    yield record
+        for record in list(self._records):
+            yield record
+
+    def close(self):
+        """Drops all the records (removing the temporary file, if any)"""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        self._records = []
+
+    def _spill(self):
+        if self._file is None:
+            self._file = tempfile.TemporaryFile()
+        chunk = zlib.compress(json.dumps(self._records).encode('utf-8'))
+        self._file.seek(0, 2)
+        self._file.write(self._CHUNK_HEADER.pack(len(chunk)))
+        self._file.write(chunk)
+        self._records = []
@@ -2,6 +2,8 @@ import sys
 import argparse
 
 import marvin
+from marvin.core.status import Status
+from marvin.runner.results import merge_results
 from marvin.runner.runner import Runner
 
 
@@ -9,6 +11,11 @@ def main(exit_fn=sys.exit, args=None):
     options = parse(args)
     if options.version:
         sys_info()
+    elif options.merge_results:
+        status = merge_results(options.merge_results)
+        exit_fn(0 if status in [Status.PASS, Status.SKIP] else 1)
+    elif options.rebuild_data_cache:
+        exit_fn(Runner(options).rebuild_data_cache())
     else:
         exit_fn(Runner(options).run())
 
@@ -23,6 +30,40 @@ def parse(args):
                         help='only run tests containing any of the given tags')
     parser.add_argument('--no-tags', nargs='*', dest='without_tags',
                         help='don\'t run tests containing any of the given tags')
+    parser.add_argument('--workers', '-w', type=int, dest='workers',
+                        help='number of workers to run tests in parallel')
+    parser.add_argument('--executor', choices=['process', 'thread'], dest='executor',
+                        help='whether parallel workers are processes (default) or threads')
+    parser.add_argument('--shard', dest='shard', metavar='INDEX/TOTAL',
+                        help='only run the INDEX-th out of TOTAL partitions of the tests (e.g. 1/4)')
+    parser.add_argument('--history', dest='history_file',
+                        help='path to a file where the durations of the executed tests are kept across runs')
+    parser.add_argument('--schedule', choices=['discovery', 'longest_first'], dest='schedule',
+                        help='order in which tests are executed: as they are discovered (default), or the '
+                             'longest ones first according to the durations history')
+    parser.add_argument('--discovery-cache', dest='discovery_cache', metavar='CACHE_FILE',
+                        help='keep an index of the discovered tests in the given file, so later runs are faster')
+    parser.add_argument('--data-cache', dest='data_cache', metavar='DIRECTORY',
+                        help='keep parsed data files in the given directory, so they aren\'t parsed again while '
+                             'they don\'t change')
+    parser.add_argument('--rebuild-data-cache', action='store_true', dest='rebuild_data_cache',
+                        help='parse every data file into the data cache directory and exit')
+    parser.add_argument('--event-dispatch', choices=['sync', 'async'], dest='event_dispatch',
+                        help='whether loggers and plugins are notified of events by the thread running the tests '
+                             '(sync, the default) or by a dedicated thread (async)')
+    parser.add_argument('--exception-retention', choices=['frames', 'traceback', 'message'], dest='exception_retention',
+                        help='what is kept of the exceptions raised by tests and steps: their frames (the default), '
+                             'their traceback, or only their message')
+    parser.add_argument('--quiet', '-q', action='store_true', dest='quiet',
+                        help='only print the execution summary')
+    parser.add_argument('--output-buffer', type=int, dest='output_buffer', metavar='CHARACTERS',
+                        help='buffer up to the given number of characters of output (e.g. when piped to a file)')
+    parser.add_argument('--output-flush-interval', type=float, dest='output_flush_interval', metavar='SECONDS',
+                        help='max seconds buffered output is held back (defaults to 1)')
+    parser.add_argument('--results', dest='results_file',
+                        help='write the execution summary to the given (JSON) results file')
+    parser.add_argument('--merge-results', nargs='+', dest='merge_results', metavar='RESULTS_FILE',
+                        help='print the execution summary of the given results files (e.g. one per shard) and exit')
     parser.add_argument('--version', action='store_true',
                         help='display Marvin version and exit')
 
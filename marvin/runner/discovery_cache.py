@@ -0,0 +1,100 @@
+"""Persistent index of the test scripts (and their data files) found in the tests directory"""
+import json
+import os
+
+from marvin.data import DeferredDataProvider
+
+
+class DiscoveredTestScript(object):
+    """What discovery found in a python file: the test script class (if any), its tags, and its data files"""
+
+    def __init__(self, class_name=None, tags=None, data_files=None, test_class=None):
+        self.class_name = class_name
+        self.tags = set(tags or [])
+        self.data_files = list(data_files or [])
+        self.test_class = test_class
+
+
+class DiscoveryCache(object):
+    """
+    Index of the test scripts found in python files, saved across runs so later runs can skip importing files
+    which define no test script (or whose test script is filtered out by tags), and searching for data files.
+    An entry is invalidated when its python file changes (mtime or size), or when any of the directories searched
+    for its data files changes (mtime, i.e. files were added, removed or renamed).
+    The tags of data files are kept too (invalidated when the data file changes), so tests can be filtered by tags
+    without loading their data.
+    Tags inherited from base classes defined in other files are not tracked: if they change, the cache file must be
+    deleted.
+    With no path, nothing is persisted.
+    """
+
+    VERSION = 2
+
+    def __init__(self, path=None):
+        self._path = path
+        self._entries = {}
+        self._data_entries = {}
+        self._found = {}
+        self._found_data = {}
+        if path and os.path.isfile(path):
+            with open(path) as fh:
+                index = json.load(fh)
+            if index.get('version') == self.VERSION:
+                self._entries = index.get('entries', {})
+                self._data_entries = index.get('data_files', {})
+
+    def get(self, python_file):
+        """The DiscoveredTestScript for the given python file, or None if it's not cached (or it's stale)"""
+        entry = self._entries.get(python_file)
+        if not entry or entry['stat'] != self._file_stat(python_file):
+            return None
+        if any(self._dir_mtime(directory) != mtime for directory, mtime in entry['dirs'].items()):
+            return None
+        self._found[python_file] = entry
+        return DiscoveredTestScript(entry['class_name'], entry['tags'], entry['data_files'])
+
+    def put(self, python_file, discovered, searched_dirs=()):
+        """Caches what was discovered in the given python file, after searching data files in `searched_dirs`"""
+        self._found[python_file] = {
+            'stat': self._file_stat(python_file),
+            'dirs': dict((directory, self._dir_mtime(directory)) for directory in searched_dirs),
+            'class_name': discovered.class_name,
+            'tags': sorted(discovered.tags),
+            'data_files': discovered.data_files
+        }
+
+    def data_tags(self, data_file):
+        """
+        The tags (a set, or None) of the given data file, or DeferredDataProvider.UNKNOWN_TAGS if they're not cached
+        (or the data file changed)
+        """
+        entry = self._data_entries.get(data_file)
+        if not entry or entry['stat'] != self._file_stat(data_file):
+            return DeferredDataProvider.UNKNOWN_TAGS
+        self._found_data[data_file] = entry
+        return set(entry['tags']) if entry['tags'] is not None else None
+
+    def put_data_tags(self, data_file, tags):
+        """Caches the tags of the given data file"""
+        if os.path.isfile(data_file):
+            self._found_data[data_file] = {
+                'stat': self._file_stat(data_file),
+                'tags': sorted(tags) if tags is not None else None
+            }
+
+    def save(self):
+        """Persists the entries of the python files (and data files) found in this run"""
+        if not self._path:
+            return
+        directory = os.path.dirname(self._path)
+        if directory and not os.path.isdir(directory):
+            os.makedirs(directory)
+        with open(self._path, 'w') as fh:
+            json.dump({'version': self.VERSION, 'entries': self._found, 'data_files': self._found_data}, fh)
+
+    def _file_stat(self, path):
+        stat = os.stat(path)
+        return [stat.st_mtime, stat.st_size]
+
+    def _dir_mtime(self, path):
+        return os.stat(path).st_mtime if os.path.isdir(path) else None
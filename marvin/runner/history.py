@@ -0,0 +1,87 @@
+"""Durations of past test executions"""
+import json
+import os
+
+from marvin.report import EventType as E
+from marvin.runner.sharding import test_key
+
+
+class DurationHistory(object):
+    """
+    Durations (in ms) of the last execution of tests (identified by test key, see marvin.runner.sharding.test_key)
+    and of their iterations, as stored in a JSON history file:
+        {
+          "tests": {"<test key>": <duration>, ...},
+          "iterations": {"<test key>": {"<iteration name or #position>": <duration>, ...}, ...}
+        }
+    """
+
+    def __init__(self, path=None):
+        self._path = path
+        self._tests = {}
+        self._iterations = {}
+        if path and os.path.isfile(path):
+            with open(path) as fh:
+                history = json.load(fh)
+            self._tests = history.get('tests', {})
+            self._iterations = history.get('iterations', {})
+
+    @property
+    def test_durations(self):
+        """Dictionary of test key -> last known duration"""
+        return self._tests
+
+    def iteration_durations(self, key):
+        """Dictionary of iteration name (or #position for unnamed ones) -> last known duration, for the given test"""
+        return self._iterations.get(key, {})
+
+    def expected_duration(self, key):
+        """
+        The last known duration of the given test, or the average duration of the known tests if it never ran
+        (or 0 if no test ever ran)
+        """
+        if key in self._tests:
+            return self._tests[key]
+        if not self._tests:
+            return 0
+        return float(sum(self._tests.values())) / len(self._tests)
+
+    def record_test(self, key, duration, iteration_durations=None):
+        """Keeps the duration of a test execution (and optionally of its iterations)"""
+        self._tests[key] = duration
+        if iteration_durations:
+            self._iterations[key] = iteration_durations
+
+    def save(self):
+        """Writes the history (including tests that didn't run this time) to its file"""
+        with open(self._path, 'w') as fh:
+            json.dump({'tests': self._tests, 'iterations': self._iterations}, fh, indent=1, sort_keys=True)
+
+
+class DurationRecorder(object):
+    """
+    Records the duration of the executed tests and iterations into a DurationHistory, which is saved when
+    the suite ends
+    """
+
+    def __init__(self, publisher, history):
+        publisher.subscribe(self.on_test_started, E.TEST_STARTED)
+        publisher.subscribe(self.on_iteration_ended, E.TEST_ITERATION_ENDED)
+        publisher.subscribe(self.on_test_ended, E.TEST_ENDED)
+        publisher.subscribe(self.on_suite_ended, E.SUITE_ENDED)
+        self._history = history
+        self._iterations = {}
+
+    def on_test_started(self, _event):
+        self._iterations = {}
+
+    def on_iteration_ended(self, event):
+        name = event.iteration.name or '#%d' % (len(self._iterations) + 1)
+        self._iterations[name] = event.duration
+
+    def on_test_ended(self, event):
+        key = test_key(event.test_script, event.data_provider)
+        self._history.record_test(key, event.duration, self._iterations)
+
+    def on_suite_ended(self, _event):
+        self._history.save()
@@ -0,0 +1,90 @@
+"""Results files: execution summaries which can be merged afterwards (e.g. the results of each shard of a suite)"""
+import json
+import sys
+
+from marvin.core.status import Status
+from marvin.report import EventType as E, Publisher
+from marvin.report.observers.event_logger import EventLogger
+from marvin.runner.sharding import test_key
+from marvin.util.tracebacks import format_exception
+
+
+class ResultsWriter(object):
+    """
+    Writes a JSON results file with the summary of the executed tests (same summary EventLogger prints)
+    when the suite ends. It looks like:
+    {
+      "status": "FAIL",
+      "order": ["<test key>", ...],  # keys of all the discovered tests, in discovery order
+      "tests": [
+        {"key": "<test key>", "name": "...", "status": "FAIL",
+         "iterations": {"PASS": 1, "FAIL": 1, "SKIP": 0}, "exceptions": ["..."]},
+        ...
+      ]
+    }
+    """
+
+    def __init__(self, publisher, path):
+        publisher.subscribe(self.on_test_started, E.TEST_STARTED)
+        publisher.subscribe(self.on_iteration_ended, E.TEST_ITERATION_ENDED)
+        publisher.subscribe(self.on_test_ended, E.TEST_ENDED)
+        publisher.subscribe(self.on_suite_ended, E.SUITE_ENDED)
+        self._path = path
+        self._tests = []
+        self._current_test = None
+
+    def on_test_started(self, event):
+        self._current_test = {
+            "key": test_key(event.test_script, event.data_provider),
+            "name": event.test_script.name,
+            "status": None,
+            "exceptions": [],
+            "iterations": {Status.PASS: 0, Status.FAIL: 0, Status.SKIP: 0}
+        }
+
+    def on_iteration_ended(self, event):
+        self._current_test["iterations"][event.status] += 1
+
+    def on_test_ended(self, event):
+        self._current_test["status"] = event.status
+        if event.status != Status.PASS:
+            self._current_test["exceptions"].extend(format_exception(exc_info) for exc_info in event.exceptions)
+        self._tests.append(self._current_test)
+
+    def on_suite_ended(self, event):
+        results = {
+            "status": event.status,
+            "order": list(getattr(event.suite, 'test_keys', [])),
+            "tests": self._tests
+        }
+        with open(self._path, 'w') as fh:
+            json.dump(results, fh)
+
+
+def merge_results(paths, dest=sys.stdout):
+    """
+    Prints the execution summary of the tests in the given results files, in the same way (and order) EventLogger
+    prints it at the end of a single run of the suite
+    :return: the merged suite status
+    """
+    order = []
+    tests = []
+    for path in paths:
+        with open(path) as fh:
+            results = json.load(fh)
+        order = order or results.get('order', [])
+        tests.extend(results.get('tests', []))
+
+    positions = dict((key, position) for position, key in reversed(list(enumerate(order))))
+    tests.sort(key=lambda test: positions.get(test['key'], len(positions)))
+    EventLogger(Publisher(), dest=dest).print_summary(tests)
+    return _suite_status(test['status'] for test in tests)
+
+
+def _suite_status(statuses):
+    statuses = set(statuses)
+    if Status.FAIL in statuses:
+        return Status.FAIL
+    elif Status.PASS in statuses:
+        return Status.PASS
+    return Status.SKIP
@@ -3,21 +3,40 @@ import sys
 from marvin.core.status import Status
 from marvin.runner.runtime_suite import RuntimeSuite
 from marvin.report.observers.event_logger import EventLogger
+from marvin.runner.results import ResultsWriter
 
 
 class Runner(object):
     def __init__(self, options):
         self._setup_env()
         self._suite = RuntimeSuite(config_file=options.config, tests_path=options.tests_path,
-                                   with_tags=options.with_tags, without_tags=options.without_tags)
-        self._load_observers()
+                                   with_tags=options.with_tags, without_tags=options.without_tags,
+                                   workers=getattr(options, 'workers', None),
+                                   executor=getattr(options, 'executor', None),
+                                   shard=getattr(options, 'shard', None),
+                                   history_file=getattr(options, 'history_file', None),
+                                   schedule=getattr(options, 'schedule', None),
+                                   discovery_cache=getattr(options, 'discovery_cache', None),
+                                   data_cache=getattr(options, 'data_cache', None),
+                                   event_dispatch=getattr(options, 'event_dispatch', None),
+                                   exception_retention=getattr(options, 'exception_retention', None))
+        self._load_observers(options)
 
     def run(self):
         status = self._suite.execute()
         return 0 if status in [Status.PASS, Status.SKIP] else 1
 
+    def rebuild_data_cache(self):
+        cached = self._suite.rebuild_data_cache()
+        print("%d data files cached in: %s" % (len(cached), self._suite.cfg.marvin['data_cache']))
+        return 0
+
     def _setup_env(self):
         sys.path.insert(1, '.')
 
-    def _load_observers(self):
-        EventLogger(self._suite.publisher)
+    def _load_observers(self, options):
+        EventLogger(self._suite.publisher, quiet=getattr(options, 'quiet', False),
+                    buffer_size=getattr(options, 'output_buffer', None) or 0,
+                    flush_interval=getattr(options, 'output_flush_interval', None) or 1.0)
+        if getattr(options, 'results_file', None):
+            ResultsWriter(self._suite.publisher, options.results_file)
@@ -2,9 +2,16 @@ import os
 import glob
 
 from marvin import Suite, TestScript
+from marvin.core.executors import ProcessPoolExecutor, ThreadPoolExecutor
+from marvin.runner.discovery_cache import DiscoveryCache, DiscoveredTestScript
+from marvin.runner.history import DurationHistory, DurationRecorder
+from marvin.runner.sharding import Shard, test_key
+from marvin.runner.static_inspection import inspect_test_scripts
 from marvin.util.files import ClassLoader, FileFinder
-from marvin.util import compat
-from marvin.data import DataProviderRegistry
+from marvin.util import compat, tracebacks
+from marvin.data import DataProviderRegistry, DeferredDataProvider, FileDataProvider, NullDataProvider
+from marvin.data.data_cache import DataCache
+from marvin.report import AsyncPublisher, EventType
 
 
 def default_config():
@@ -16,68 +23,208 @@ def default_config():
         },
         'hook_module': 'marvin_conf.py',
         'env': None,
-        'environments': {}
+        'environments': {},
+        'workers': 1,
+        'executor': 'process',
+        'shard': None,
+        'history_file': None,
+        'schedule': 'discovery',
+        'discovery_cache': None,
+        'data_cache': None,
+        'events': {
+            'dispatch': 'sync',
+            'queue_size': 10000,
+            'overflow': 'block'
+        },
+        'exception_retention': 'frames'
     }
 
 
+SCHEDULES = ['discovery', 'longest_first']
+
+EVENT_DISPATCH_MODES = ['sync', 'async']
+
+EXECUTORS = {
+    'process': ProcessPoolExecutor,
+    'thread': ThreadPoolExecutor
+}
+
+
 class RuntimeSuite(Suite):
-    def __init__(self, config_file=None, tests_path=None, with_tags=None, without_tags=None):
+    def __init__(self, config_file=None, tests_path=None, with_tags=None, without_tags=None, workers=None,
+                 executor=None, shard=None, history_file=None, schedule=None,
+                 discovery_cache=None, data_cache=None, event_dispatch=None, exception_retention=None):
         super(RuntimeSuite, self).__init__()
-        self._supported_data_file_extensions = DataProviderRegistry.supported_file_extensions()
         self._load_marvin_config(config_file=config_file,
                                  tests_path=tests_path,
                                  with_tags=with_tags,
-                                 without_tags=without_tags)
+                                 without_tags=without_tags,
+                                 workers=workers,
+                                 executor=executor,
+                                 shard=shard,
+                                 history_file=history_file,
+                                 schedule=schedule,
+                                 discovery_cache=discovery_cache,
+                                 data_cache=data_cache,
+                                 event_dispatch=event_dispatch,
+                                 exception_retention=exception_retention)
+        self._load_publisher()
+        self._check_exception_retention()
         self._load_test_environment_config()
         self._load_hook_module()
         self._root_dir = self.cfg.marvin.get('tests_path', '.')
         self._tags_matcher = TagsMatcher(*self._get_tag_filters())
+        self._load_executor()
+        self._shard = Shard.parse(self.cfg.marvin['shard']) if self.cfg.marvin.get('shard') else None
+        self._load_history()
+        self._load_schedule()
+        self._discovery_cache = DiscoveryCache(self.cfg.marvin.get('discovery_cache'))
+        if self.cfg.marvin.get('discovery_cache'):
+            self.publisher.subscribe(self._on_test_started, EventType.TEST_STARTED)
+            self.publisher.subscribe(lambda _event: self._discovery_cache.save(), EventType.SUITE_ENDED)
+        self._load_data_cache()
+        self._test_keys = []
+
+    @property
+    def test_keys(self):
+        """Keys (see marvin.runner.sharding.test_key) of all the discovered tests so far, in discovery order"""
+        return self._test_keys
 
     # Override
     def tests(self):
-        test_script_class_loader = ClassLoader(TestScript)
-
-        python_file_finder = FileFinder(self._root_dir,
-                                        filename_matcher=lambda name: name.lower().endswith('.py'))
+        tests = self._discover_tests()
+        if self._shard:
+            tests = self._shard.select(list(tests), self._history.test_durations)
+        if self._schedule == 'longest_first':
+            tests = sorted(tests, key=lambda test: -self._history.expected_duration(test_key(*test)))
+        return tests
+
+    def _discover_tests(self):
+        # A single walk of the tests directory finds both, python files and data files
+        self._data_file_index = DataFileIndex(DataProviderRegistry.supported_file_extensions())
+        python_files = []
+        file_finder = FileFinder(self._root_dir)
+        for path in file_finder.find_all():
+            if path.lower().endswith('.py'):
+                python_files.append(path)
+            else:
+                self._data_file_index.add(path)
+        self._data_file_index.add_directories(file_finder.visited_directories)
+
+        for python_file in python_files:
+            discovered = self._discovery_cache.get(python_file) or self._discover_test_script(python_file)
+            if not discovered.class_name:
+                continue
 
-        for python_file in python_file_finder.find_all():
-            directory, filename = os.path.split(python_file)
-            filename_base, _ = os.path.splitext(filename)
+            if self._tags_matcher.blacklisted(discovered.tags):
+                continue
 
-            mod = compat.import_module(python_file, module_name=filename_base)
+            data_providers = self._data_providers(discovered.data_files)
+            if not self._tags_matcher.whitelisted(discovered.tags):
+                data_providers = list(data_providers)
+                if not self._may_match(discovered.tags, data_providers):
+                    continue
 
-            test_script_class = test_script_class_loader.find(mod)
+            test_script_class = discovered.test_class or self._load_test_script_class(python_file,
+                                                                                      discovered.class_name)
             if not test_script_class:
                 continue
 
-            if self._tags_matcher.blacklisted(test_script_class.class_tags()):
-                continue
-
-            test_script_id = filename_base
-            for data_provider in self._find_data_for_test_script(test_script_id, directory):
+            for data_provider in data_providers:
+                self._test_keys.append(test_key(test_script_class, data_provider))
                 yield test_script_class, data_provider
 
+        self._discovery_cache.save()
+
+    def _discover_test_script(self, python_file):
+        """
+        Finds the test script class in the given python file (and its data files).
+        The file is not imported if its test script can be figured out from the source code, or if it's certainly
+        filtered out by tags. The latter isn't cached, as it depends on the tag filters.
+        """
+        candidates = inspect_test_scripts(python_file)
+        if candidates and all(self._tags_matcher.blacklisted(candidate.tags) for candidate in candidates):
+            return DiscoveredTestScript()
+
+        if candidates and all(candidate.complete for candidate in candidates):
+            data_files, searched_dirs = self._find_data_files(python_file)
+            if len(candidates) == 1:
+                discovered = DiscoveredTestScript(candidates[0].class_name, candidates[0].tags, data_files)
+                self._discovery_cache.put(python_file, discovered, searched_dirs)
+                return discovered
+            data_providers = list(self._data_providers(data_files))
+            if not any(self._may_match(candidate.tags, data_providers) for candidate in candidates):
+                return DiscoveredTestScript()
+
+        test_script_class = ClassLoader(TestScript).find(self._import(python_file))
+        if not test_script_class:
+            discovered = DiscoveredTestScript()
+            self._discovery_cache.put(python_file, discovered)
+            return discovered
+
+        data_files, searched_dirs = self._find_data_files(python_file)
+        discovered = DiscoveredTestScript(test_script_class.__name__, test_script_class.class_tags(), data_files,
+                                          test_class=test_script_class)
+        self._discovery_cache.put(python_file, discovered, searched_dirs)
+        return discovered
+
+    def _find_data_files(self, python_file):
+        directory, filename = os.path.split(python_file)
+        test_script_id, _ = os.path.splitext(filename)
+        return self._data_file_index.find(test_script_id, directory), self._data_file_index.directories(directory)
+
+    def _may_match(self, class_tags, data_providers):
+        """
+        Whether a test script with the given class tags and data might match the tag filters. Data isn't loaded
+        here (let alone its iterations evaluated): iterations may add any tag, so a test with data is kept, and the
+        test runner skips it if none of its iterations match.
+        """
+        return any(not isinstance(provider, NullDataProvider) or self._tags_matcher.whitelisted(class_tags)
+                   for provider in data_providers)
+
+    def _load_test_script_class(self, python_file, class_name):
+        mod = self._import(python_file)
+        test_script_class = getattr(mod, class_name, None)
+        if isinstance(test_script_class, type) and issubclass(test_script_class, TestScript):
+            return test_script_class
+        return ClassLoader(TestScript).find(mod)
+
+    def _import(self, python_file):
+        # Modules are named after their path within the tests directory (e.g. 'some_dir/check_this'), so test
+        # scripts with the same file and class names in different directories get different test keys
+        module_name, _ = os.path.splitext(os.path.relpath(python_file, self._root_dir))
+        return compat.import_module(python_file, module_name=module_name.replace(os.sep, '/'))
+
     # Override
     def tags_match(self, tags):
         return self._tags_matcher.matches(tags)
 
-    def _find_data_for_test_script(self, test_script_id, test_script_directory):
-        data_file_matcher = DataFileMatcher(test_script_id, self._supported_data_file_extensions)
-        data_file_finder = FileFinder(test_script_directory, filename_matcher=data_file_matcher)
+    # Override
+    def tag_filters(self):
+        return self._get_tag_filters()
 
+    def _data_providers(self, data_files):
         data_found = False
-        for data_file in data_file_finder.find_all():
-            provider = DataProviderRegistry.data_provider_for(data_file)
+        for data_file in data_files:
+            data_provider_class = DataProviderRegistry.data_provider_class_for(data_file)
+            if not data_provider_class:
+                continue
 
-            if not provider or self._tags_matcher.blacklisted(provider.tags):
+            # Only tags known up front (i.e. cached) filter data files out, so data isn't loaded before its test starts
+            tags = self._discovery_cache.data_tags(data_file)
+            if tags is not DeferredDataProvider.UNKNOWN_TAGS and self._tags_matcher.blacklisted(tags):
                 continue
 
             data_found = True
-            yield provider
+            yield DeferredDataProvider(data_provider_class, data_file, tags=tags, data_cache=self._data_cache)
 
         if not data_found:
             yield DataProviderRegistry.data_provider_for(None)
 
+    def _on_test_started(self, event):
+        if event.data_provider.source_id:
+            self._discovery_cache.put_data_tags(event.data_provider.source_id, event.data_provider.tags)
+
     def _load_marvin_config(self, **options):
         self.cfg.set('marvin', default_config())
 
@@ -93,6 +240,24 @@ class RuntimeSuite(Suite):
             cli_overrides.setdefault('filter', {})['with_tags'] = options['with_tags']
         if options.get('without_tags'):
             cli_overrides.setdefault('filter', {})['without_tags'] = options['without_tags']
+        if options.get('workers'):
+            cli_overrides['workers'] = options['workers']
+        if options.get('executor'):
+            cli_overrides['executor'] = options['executor']
+        if options.get('shard'):
+            cli_overrides['shard'] = options['shard']
+        if options.get('history_file'):
+            cli_overrides['history_file'] = options['history_file']
+        if options.get('schedule'):
+            cli_overrides['schedule'] = options['schedule']
+        if options.get('discovery_cache'):
+            cli_overrides['discovery_cache'] = options['discovery_cache']
+        if options.get('data_cache'):
+            cli_overrides['data_cache'] = options['data_cache']
+        if options.get('event_dispatch'):
+            cli_overrides['events'] = {'dispatch': options['event_dispatch']}
+        if options.get('exception_retention'):
+            cli_overrides['exception_retention'] = options['exception_retention']
 
         self.cfg.set('marvin', cli_overrides)
 
@@ -109,6 +274,65 @@ class RuntimeSuite(Suite):
         mod = compat.import_module(file_name, module_name='marvin_hook')
         if hasattr(mod, 'main') and callable(mod.main):
             mod.main(self.publisher, self.cfg)
+        if hasattr(mod, 'fixtures') and callable(mod.fixtures):
+            mod.fixtures(self.fixtures, self.cfg)
+
+    def _load_data_cache(self):
+        directory = self.cfg.marvin.get('data_cache')
+        self._data_cache = DataCache(directory) if directory else None
+
+    def rebuild_data_cache(self):
+        """
+        Parses every (cacheable) data file within the tests directory and stores it in the data cache
+        :return: the list of cached data files
+        """
+        cache = self._data_cache
+        if not cache:
+            raise ValueError("No data cache directory set")
+
+        cached = []
+        for path in FileFinder(self._root_dir).find_all():
+            data_provider_class = DataProviderRegistry.data_provider_class_for(path)
+            if (data_provider_class and issubclass(data_provider_class, FileDataProvider)
+                    and data_provider_class.CACHEABLE):
+                if cache.rebuild(data_provider_class, path):
+                    cached.append(path)
+        return cached
+
+    def _load_publisher(self):
+        events_config = self.cfg.marvin.get('events') or {}
+        dispatch = events_config.get('dispatch') or 'sync'
+        if dispatch not in EVENT_DISPATCH_MODES:
+            raise ValueError("Unknown event dispatch mode: '%s'" % dispatch)
+        if dispatch == 'async':
+            # Before the hook module (or anything else) subscribes observers
+            self._publisher = AsyncPublisher(queue_size=events_config.get('queue_size') or 10000,
+                                             overflow=events_config.get('overflow') or 'block')
+
+    def _check_exception_retention(self):
+        policy = tracebacks.configured_policy(self.cfg)
+        if policy not in tracebacks.RETENTION_POLICIES:
+            raise ValueError("Unknown exception retention policy: '%s'" % policy)
+
+    def _load_executor(self):
+        workers = int(self.cfg.marvin.get('workers') or 1)
+        if workers <= 1:
+            return
+        executor_name = self.cfg.marvin.get('executor')
+        if executor_name not in EXECUTORS:
+            raise ValueError("Unknown executor: '%s'" % executor_name)
+        self.executor = EXECUTORS[executor_name](workers)
+
+    def _load_history(self):
+        history_file = self.cfg.marvin.get('history_file')
+        self._history = DurationHistory(history_file)
+        if history_file:
+            DurationRecorder(self.publisher, self._history)
+
+    def _load_schedule(self):
+        self._schedule = self.cfg.marvin.get('schedule') or 'discovery'
+        if self._schedule not in SCHEDULES:
+            raise ValueError("Unknown schedule: '%s'" % self._schedule)
 
     def _get_tag_filters(self):
         filter_config = self.cfg.marvin.get('filter', {})
@@ -122,6 +346,10 @@ class TagsMatcher(object):
         self._with = with_tags
         self._without = without_tags
 
+    @property
+    def without_tags(self):
+        return self._without
+
     def blacklisted(self, tags):
         tags = tags or set()
         return any(tags & self._without)
@@ -134,17 +362,34 @@ class TagsMatcher(object):
         return self.whitelisted(tags) and not self.blacklisted(tags)
 
 
-class DataFileMatcher(object):
+class DataFileIndex(object):
     """
-    Callable that returns True if the given filename starts with
-    the the test script id, and has a supported data extension
+    Data files found in the tests directory, indexed by the test script id they belong to (i.e. the first part
+    of their names), so finding the data files of a test script doesn't require walking its directory again
     """
-    def __init__(self, test_script_id, supported_data_file_extensions):
-        self._test_script_id = test_script_id
+    def __init__(self, supported_data_file_extensions):
         self._extensions = supported_data_file_extensions
-
-    def __call__(self, filename):
-        parts = filename.split('.')
-        return (len(parts) > 1
-                and parts[0] == self._test_script_id
-                and parts[-1] in self._extensions)
+        self._data_files = {}
+        self._directories = []
+
+    def add(self, path):
+        """Indexes the given file, if it has a supported data extension"""
+        parts = os.path.basename(path).split('.')
+        if len(parts) > 1 and parts[-1] in self._extensions:
+            self._data_files.setdefault(parts[0], []).append(path)
+
+    def add_directories(self, directories):
+        """Records the directories the indexed files were searched in"""
+        self._directories.extend(directories)
+
+    def find(self, test_script_id, directory):
+        """Data files of the given test script id within the given directory (or its subdirectories)"""
+        return [path for path in self._data_files.get(test_script_id, [])
+                if self._within(os.path.dirname(path), directory)]
+
+    def directories(self, directory):
+        """Searched directories within the given directory (including itself)"""
+        return [searched for searched in self._directories if self._within(searched, directory)]
+
+    def _within(self, path, directory):
+        return path == directory or path.startswith(os.path.join(directory, ''))
@@ -0,0 +1,94 @@
+"""Deterministic partitioning of a suite's tests, so multiple nodes can run a share of them each"""
+import inspect
+import os
+
+from marvin.report.remote import ReportableSnapshot
+
+
+def test_key(test_script, data_provider):
+    """
+    Identifier of a test (a test script and the data source driving it), stable across runs and nodes.
+    Test scripts are identified by their module and class names: the modules of test script files are named after
+    their path within the tests directory (see RuntimeSuite)
+    :param test_script: a TestScript class or instance (or a snapshot of it)
+    :param data_provider: the test's DataProvider instance (or a snapshot of it), or None
+    """
+    if isinstance(test_script, ReportableSnapshot):
+        module, name = test_script.class_module, test_script.class_name
+    else:
+        test_class = test_script if inspect.isclass(test_script) else type(test_script)
+        module, name = test_class.__module__, test_class.__name__
+
+    source_id = data_provider.source_id if data_provider is not None else None
+    if source_id is None:
+        return "%s.%s" % (module, name)
+    return "%s.%s@%s" % (module, name, os.path.normpath(str(source_id)).replace(os.sep, '/'))
+
+
+def partition(keys, total, weights=None):
+    """
+    Splits the given test keys in `total` groups of (roughly) the same weight, regardless of the order
+    in which keys are given.
+    Heavier tests are assigned first, each to the group with the lowest weight so far (ties are broken by
+    the test key so all nodes get to the same result). Tests with no known weight are assumed to weigh the
+    average of the known ones.
+    :param keys: list of test keys
+    :param total: number of groups
+    :param weights: dictionary of test key -> weight (e.g. historical duration). If not given, all tests weigh 1
+    :return: a list with the assigned group index (0 based) of each of the given keys
+    """
+    weights = weights or {}
+    known = [weights[key] for key in keys if key in weights]
+    default = float(sum(known)) / len(known) if known else 1
+    key_weights = [weights.get(key, default) for key in keys]
+
+    loads = [0] * total
+    groups = [None] * len(keys)
+    for position in sorted(range(len(keys)), key=lambda i: (-key_weights[i], keys[i], i)):
+        group = min(range(total), key=lambda g: (loads[g], g))
+        groups[position] = group
+        loads[group] += key_weights[position]
+    return groups
+
+
+class Shard(object):
+    """
+    One out of `total` deterministic partitions of a suite's tests (`index` goes from 1 to `total`)
+    """
+
+    def __init__(self, index, total):
+        if not 1 <= index <= total:
+            raise ValueError("Invalid shard %d/%d: index must be between 1 and %d" % (index, total, total))
+        self._index = index
+        self._total = total
+
+    @classmethod
+    def parse(cls, spec):
+        """Builds a shard from its INDEX/TOTAL representation. E.g. '2/4'"""
+        try:
+            index, total = (int(part) for part in str(spec).split('/'))
+        except ValueError:
+            raise ValueError("Invalid shard '%s': expected INDEX/TOTAL (e.g. 1/4)" % spec)
+        return cls(index, total)
+
+    @property
+    def index(self):
+        return self._index
+
+    @property
+    def total(self):
+        return self._total
+
+    def select(self, tests, weights=None):
+        """
+        Filters the tests belonging to this shard
+        :param tests: list of (test script class, data provider) tuples
+        :param weights: dictionary of test key -> weight (e.g. historical duration)
+        :return: the list of tests (in the given order) assigned to this shard
+        """
+        keys = [test_key(test_class, data_provider) for test_class, data_provider in tests]
+        groups = partition(keys, self._total, weights)
+        return [test for test, group in zip(tests, groups) if group == self._index - 1]
+
+    def __str__(self):
+        return "%d/%d" % (self._index, self._total)
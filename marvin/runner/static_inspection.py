@@ -0,0 +1,105 @@
+"""Static inspection (i.e. without importing them) of the python files defining test scripts"""
+import ast
+
+TEST_SCRIPT_BASES = ('TestScript', 'AsyncTestScript')
+
+
+class StaticTestScript(object):
+    """
+    A class that might be a test script, as seen in the source code of a python file.
+    `tags` are the tags found in the TAGS attribute of the class and its ancestors defined in the same file.
+    The class is `complete` if it's certainly a test script and `tags` are all of its class tags (i.e. its whole
+    hierarchy up to TestScript is defined in the file, and every TAGS attribute is a literal collection of strings).
+    Otherwise `tags` are only a subset of its class tags.
+    """
+
+    def __init__(self, class_name, tags, complete):
+        self.class_name = class_name
+        self.tags = tags
+        self.complete = complete
+
+
+def inspect_test_scripts(python_file):
+    """
+    Returns a StaticTestScript for each (top level) class in the given python file which might be a test script
+    (i.e. it has a base class other than `object`), or an empty list if the file can't be parsed
+    """
+    with open(python_file, 'rb') as fh:
+        source = fh.read()
+    try:
+        tree = ast.parse(source, filename=python_file)
+    except (SyntaxError, ValueError):
+        return []
+
+    test_script_names = _test_script_names(tree)
+    classes = dict((node.name, node) for node in tree.body if isinstance(node, ast.ClassDef))
+
+    test_scripts = []
+    for node in tree.body:
+        if isinstance(node, ast.ClassDef) and _base_names(node) not in ([], ['object']):
+            tags, complete = _class_tags(node, classes, test_script_names, set())
+            test_scripts.append(StaticTestScript(node.name, tags, complete))
+    return test_scripts
+
+
+def _test_script_names(tree):
+    """Names TestScript classes are known as within the module (e.g. `from marvin import TestScript as Test`)"""
+    names = set(TEST_SCRIPT_BASES)
+    for node in tree.body:
+        if isinstance(node, ast.ImportFrom) and (node.module or '').split('.')[0] == 'marvin':
+            names.update(alias.asname for alias in node.names if alias.asname and alias.name in TEST_SCRIPT_BASES)
+    return names
+
+
+def _base_names(node):
+    names = []
+    for base in node.bases:
+        if isinstance(base, ast.Name):
+            names.append(base.id)
+        elif isinstance(base, ast.Attribute):
+            names.append(base.attr)
+        else:
+            names.append(None)
+    return names
+
+
+def _class_tags(node, classes, test_script_names, visited):
+    """Mimics Reportable.class_tags. Returns the tags found and whether those are all of the class tags"""
+    visited.add(node.name)
+    tags, complete = _own_tags(node)
+
+    ancestry = None
+    for base_name in _base_names(node):
+        if ancestry is None and base_name in test_script_names:
+            ancestry = set(), True
+        elif ancestry is None and base_name in classes and base_name not in visited:
+            ancestry = _class_tags(classes[base_name], classes, test_script_names, visited)
+        elif base_name != 'object':
+            # Base classes defined elsewhere might be the reportable one (or not), and any other base (e.g. a mixin,
+            # even after TestScript) might define the TAGS found through the MRO: the tags are unknown
+            complete = False
+    if ancestry is None:
+        return tags, False
+    return tags | ancestry[0], complete and ancestry[1]
+
+
+def _own_tags(node):
+    tags, complete = set(), True
+    for statement in node.body:
+        targets = []
+        if isinstance(statement, ast.Assign):
+            targets = statement.targets
+        elif isinstance(statement, getattr(ast, 'AnnAssign', ())) or isinstance(statement, ast.AugAssign):
+            targets = [statement.target]
+        if not any(isinstance(target, ast.Name) and target.id == 'TAGS' for target in targets):
+            continue
+
+        try:
+            value = ast.literal_eval(statement.value) if isinstance(statement, ast.Assign) else None
+        except ValueError:
+            value = None
+        if isinstance(value, (list, tuple, set)) and all(isinstance(tag, str) for tag in value):
+            tags, complete = set(value), True
+        else:
+            tags, complete = set(), False
+    return tags, complete
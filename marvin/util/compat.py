@@ -1,7 +1,11 @@
+import os
 import sys
+import time
 
 IS_PYTHON_3 = sys.version_info >= (3, 0)
 IS_PYTHON_2 = sys.version_info[0] == 2
+SUPPORTS_ASYNC = sys.version_info >= (3, 5)
+SUPPORTS_CONTEXTVARS = sys.version_info >= (3, 7)
 
 
 def raise_exc_info(_exc_type, exc_val, exc_tb):
@@ -45,3 +49,95 @@ def urllib_mod():
     else:
         import urllib2
         return urllib2
+
+
+def http_client_mod():
+    if IS_PYTHON_3:
+        import http.client
+        return http.client
+    else:
+        import httplib
+        return httplib
+
+
+def url_parse(url):
+    if IS_PYTHON_3:
+        from urllib.parse import urlparse
+    else:
+        from urlparse import urlparse
+    return urlparse(url)
+
+
+def replace_file(src, dst):
+    """Renames src as dst, replacing dst if it exists (atomically, where the platform supports it)"""
+    if IS_PYTHON_3:
+        os.replace(src, dst)
+    else:
+        if os.path.exists(dst) and sys.platform == 'win32':
+            os.remove(dst)
+        os.rename(src, dst)
+
+
+def process_pool(processes, initializer=None, initargs=()):
+    """
+    Builds a multiprocessing pool whose workers are forked from the current process,
+    so they inherit its state (e.g. modules and classes loaded at runtime) without pickling it
+    """
+    import multiprocessing
+    if IS_PYTHON_2:
+        return multiprocessing.Pool(processes, initializer=initializer, initargs=initargs)
+    if 'fork' not in multiprocessing.get_all_start_methods():
+        raise RuntimeError("Parallel execution is not supported on platform: %s" % sys.platform)
+    return multiprocessing.get_context('fork').Pool(processes, initializer=initializer, initargs=initargs)
+
+
+def perf_counter_ns():
+    """A monotonic, high resolution clock reading in nanoseconds (only meaningful as a difference of two readings)"""
+    if sys.version_info >= (3, 7):
+        return time.perf_counter_ns()
+    if IS_PYTHON_3:
+        return int(time.perf_counter() * 1000000000)
+    return int(time.time() * 1000000000)
+
+
+def context_local():
+    """
+    Builds a variable local to the current execution context: the current asyncio task where `contextvars` is
+    available (Python 3.7+), or the current thread otherwise.
+    The returned object supports `get()`, `set(value)` (returning a token) and `reset(token)`
+    """
+    if not SUPPORTS_CONTEXTVARS:
+        return _ThreadLocalVar()
+    import contextvars
+    return _ContextVar(contextvars.ContextVar('marvin_context_local', default=None))
+
+
+class _ContextVar(object):
+    def __init__(self, var):
+        self._var = var
+
+    def get(self):
+        return self._var.get()
+
+    def set(self, value):
+        return self._var.set(value)
+
+    def reset(self, token):
+        self._var.reset(token)
+
+
+class _ThreadLocalVar(object):
+    def __init__(self):
+        import threading
+        self._local = threading.local()
+
+    def get(self):
+        return getattr(self._local, 'value', None)
+
+    def set(self, value):
+        token = self.get()
+        self._local.value = value
+        return token
+
+    def reset(self, token):
+        self._local.value = token
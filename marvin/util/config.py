@@ -1,6 +1,7 @@
 import keyword
 import os.path
-import yaml
+
+from marvin.util import loaders
 
 
 class Config(object):
@@ -19,10 +20,10 @@ class Config(object):
         self.set(namespace or name, value)
 
     def _load_file(self, fh, file_type):
-        if file_type in ['.yaml', '.yml', '.json']:
-            return yaml.load(fh)
-        else:
+        loader = loaders.loader_for(file_type)
+        if not loader:
             raise ValueError("Unsupported config extension: '%s'" % file_type)
+        return loader(fh)
 
     def set(self, name, obj):
         if keyword.iskeyword(name):
@@ -42,9 +42,11 @@ class FileFinder(object):
     def __init__(self, search_path, filename_matcher=None):
         self._filename_matcher = filename_matcher
         self._search_path = search_path
+        self.visited_directories = []
 
     def find_all(self):
         for dirpath, dirnames, filenames in os.walk(self._search_path):
+            self.visited_directories.append(dirpath)
             for filename in filenames:
                 if not self._filename_matcher or self._filename_matcher(filename):
                     yield os.path.join(dirpath, filename)
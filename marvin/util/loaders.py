@@ -0,0 +1,53 @@
+"""
+Parsers for data and config files: the fastest available safe parser is used for each file format.
+ * JSON files are parsed with orjson (if installed) or the json module, rather than the (much slower) YAML parser.
+   Files that aren't strictly valid JSON (e.g. with comments) are parsed as YAML, as they always were.
+ * YAML files are parsed with the libyaml based safe loader if PyYAML was built with it, or the pure python one.
+"""
+import json
+import os
+
+import yaml
+
+try:
+    from yaml import CSafeLoader as YAMLLoader
+except ImportError:
+    from yaml import SafeLoader as YAMLLoader
+
+try:
+    import orjson
+    json_loads = orjson.loads
+except ImportError:
+    json_loads = json.loads
+
+
+def load_yaml(stream):
+    """Parses the (single document) YAML file handle or string"""
+    return yaml.load(stream, Loader=YAMLLoader)
+
+
+def load_yaml_all(stream):
+    """Returns an iterator parsing, one at a time, the documents of the YAML file handle or string"""
+    return yaml.load_all(stream, Loader=YAMLLoader)
+
+
+def load_json(stream):
+    """Parses the JSON file handle or string"""
+    content = stream.read() if hasattr(stream, 'read') else stream
+    try:
+        return json_loads(content)
+    except ValueError:
+        return load_yaml(content)
+
+
+LOADERS = {
+    '.json': load_json,
+    '.yaml': load_yaml,
+    '.yml': load_yaml
+}
+
+
+def loader_for(path):
+    """The function parsing files with the given path (or extension), or None if the format isn't supported"""
+    _, ext = os.path.splitext(path)
+    return LOADERS.get((ext or path).lower())
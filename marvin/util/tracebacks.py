@@ -0,0 +1,99 @@
+"""Helpers to keep and render exception tracebacks"""
+import traceback
+
+# How much of an exception is kept around (e.g. in events) once it's been caught. See `retain`
+RETENTION_POLICIES = ('frames', 'traceback', 'message')
+
+
+class FormattedTraceback(object):
+    """
+    Picklable stand-in for a traceback object. It holds the traceback entries (file names, line numbers and function
+    names), without the frames they were built from, so it can outlive them. The entries are only rendered (as
+    returned by traceback.format_tb) when asked for.
+    """
+
+    def __init__(self, entries=None, stack=None):
+        self._entries = list(entries) if entries is not None else None
+        self._stack = stack
+
+    @classmethod
+    def from_traceback(cls, tb):
+        """Builds a FormattedTraceback out of a traceback object (or another FormattedTraceback)"""
+        if tb is None or isinstance(tb, FormattedTraceback):
+            return cls(format_tb(tb))
+        return cls(stack=_extract_tb(tb))
+
+    @property
+    def entries(self):
+        """The rendered traceback entries"""
+        if self._entries is None:
+            self._entries = traceback.format_list(self._stack)
+            self._stack = None
+        return self._entries
+
+    def __getstate__(self):
+        return {'_entries': self.entries, '_stack': None}
+
+
+def format_tb(tb):
+    """Same as traceback.format_tb, but it also accepts FormattedTraceback instances"""
+    if tb is None:
+        return []
+    if isinstance(tb, FormattedTraceback):
+        return tb.entries
+    return traceback.format_tb(tb)
+
+
+def format_exception(exc_info):
+    """Renders a sys.exc_info() like 3-tuple as the exception representation followed by its traceback"""
+    return "%s\n%s" % (repr(exc_info[1]), ''.join(format_tb(exc_info[2])))
+
+
+def retain(exc_info, policy):
+    """
+    Returns what is kept of a caught exception, according to the given retention policy:
+     - 'frames': the exception as it is. Its traceback keeps the frames alive (with all their local variables)
+     - 'traceback': the traceback is replaced by a FormattedTraceback, so the frames can be released
+     - 'message': just the exception type and instance, without a traceback
+    :param exc_info: a sys.exc_info() like 3-tuple
+    :return: a sys.exc_info() like 3-tuple
+    """
+    if policy not in RETENTION_POLICIES:
+        raise ValueError("Unknown exception retention policy: '%s'" % policy)
+    exc_type, exc_val, exc_tb = exc_info
+    if policy == 'frames' or exc_type is None:
+        return exc_info
+
+    if policy == 'traceback' and exc_tb is not None:
+        exc_tb = FormattedTraceback.from_traceback(exc_tb)
+    else:
+        exc_tb = None
+    _release_frames(exc_val)
+    return exc_type, exc_val, exc_tb
+
+
+def configured_policy(cfg):
+    """The retention policy set by the `exception_retention` value of the marvin config (defaults to 'frames')"""
+    marvin_cfg = getattr(cfg, 'marvin', None) or {}
+    return marvin_cfg.get('exception_retention') or 'frames'
+
+
+def _extract_tb(tb):
+    if hasattr(traceback, 'StackSummary'):
+        # Source lines are only read when rendered
+        return traceback.StackSummary.extract(traceback.walk_tb(tb), lookup_lines=False)
+    return traceback.extract_tb(tb)
+
+
+def _release_frames(exc_val):
+    # Python 3 exceptions reference their traceback (and the ones they were chained to)
+    pending = [exc_val]
+    seen = set()
+    while pending:
+        exc = pending.pop()
+        if exc is None or id(exc) in seen:
+            continue
+        seen.add(id(exc))
+        if getattr(exc, '__traceback__', None) is not None:
+            exc.__traceback__ = None
+        pending.extend([getattr(exc, '__cause__', None), getattr(exc, '__context__', None)])
@@ -3,6 +3,8 @@ import sys
 
 import pytest
 
+collect_ignore = [] if sys.version_info >= (3, 5) else ['test_async.py']
+
 
 def pytest_configure(config):
     """Path hack to allow tests to import Marvin"""
@@ -0,0 +1,6 @@
+from marvin import TestScript as Test
+
+
+class DataTaggedCheck(Test):
+    def run(self, data):
+        pass
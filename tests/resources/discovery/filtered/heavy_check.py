@@ -0,0 +1,14 @@
+import marvin
+
+import a_heavy_client_library  # noqa  (never installed: this module must not be imported when filtered out)
+
+
+class Base(marvin.TestScript):
+    TAGS = ("heavy",)
+
+
+class HeavyCheck(Base):
+    TAGS = ["slow"]
+
+    def run(self, data):
+        pass
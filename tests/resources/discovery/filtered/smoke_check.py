@@ -0,0 +1,8 @@
+from marvin import TestScript
+
+
+class SmokeCheck(TestScript):
+    TAGS = ["smoke"]
+
+    def run(self, data):
+        pass
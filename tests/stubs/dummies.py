@@ -7,6 +7,11 @@ from marvin.core.test_running_context import TestRunningContext
 
 class DummyContext(Context, StepRunningContext, TestRunningContext):
 
+    def __init__(self):
+        Context.__init__(self)
+        StepRunningContext.__init__(self)
+        TestRunningContext.__init__(self)
+
     def observer(self, *event_types):
         return DummyObserver(self.publisher, *event_types)
 
@@ -102,6 +107,8 @@ class DummyData(DataProvider):
             'tags': None,
             'setup_data': {},
             'iterations': [],
+            'parallel_iterations': None,
+            'fixtures': None,
             'tear_down_data': {}
         }
 
@@ -127,6 +134,16 @@ class DummyData(DataProvider):
     def iterations(self):
         return self._data['iterations'] or [IterationData()]
 
+    # Override
+    @property
+    def parallel_iterations(self):
+        return self._data['parallel_iterations']
+
+    # Override
+    @property
+    def fixtures(self):
+        return self._data['fixtures']
+
     # Override
     @property
     def tear_down_data(self):
@@ -152,6 +169,14 @@ class DummyData(DataProvider):
         self._data['iterations'].append(iteration)
         return self
 
+    def with_parallel_iterations(self, workers):
+        self._data['parallel_iterations'] = workers
+        return self
+
+    def with_fixtures(self, *names):
+        self._data['fixtures'] = list(names)
+        return self
+
     def with_tear_down_data(self, **kwargs):
         self._data['tear_down_data'] = kwargs
         return self
@@ -0,0 +1,114 @@
+import asyncio
+
+from marvin import AsyncStep, AsyncTestScript
+from marvin.core.status import Status
+from marvin.report import EventType as E
+from tests.stubs import DummyData, DummyStep, IterationDataBuilder
+
+
+class AsyncAdd(AsyncStep):
+    """Adds numbers asynchronously"""
+
+    async def run(self, a, b):
+        await asyncio.sleep(0)
+        if a is None:
+            raise ValueError('no number')
+        return a + b
+
+
+class AsyncDummyTest(AsyncTestScript):
+    """Dummy async test"""
+
+    async def setup(self, data):
+        self.results = []
+        await asyncio.sleep(0)
+
+    async def run(self, data):
+        result = await self.step(AsyncAdd).execute(data['a'], 1)
+        async with self.step(AsyncAdd).do(result, 1) as (step, result):
+            step.step(DummyStep).execute(result=result)
+        self.results.append(result)
+
+    def tear_down(self, data):
+        self.results.append('done')
+
+
+def iterations_data(*values):
+    data = DummyData()
+    for value in values:
+        data.with_iteration(IterationDataBuilder().with_name(str(value)).with_data(a=value).build())
+    return data
+
+
+def test_async_test_events(ctx):
+    observer = ctx.observer(E.TEST_STARTED, E.TEST_SETUP_ENDED, E.TEST_ITERATION_STARTED, E.TEST_ITERATION_ENDED,
+                            E.TEST_TEARDOWN_ENDED, E.TEST_ENDED, E.STEP_STARTED, E.STEP_ENDED)
+    test = ctx.test(AsyncDummyTest)
+    test.execute(iterations_data(1, 10))
+
+    iteration_events = [E.TEST_ITERATION_STARTED,
+                        E.STEP_STARTED, E.STEP_ENDED,
+                        E.STEP_STARTED, E.STEP_STARTED, E.STEP_ENDED, E.STEP_ENDED,
+                        E.TEST_ITERATION_ENDED]
+    assert [e.event_type for e in observer.events] == ([E.TEST_STARTED, E.TEST_SETUP_ENDED] +
+                                                       iteration_events * 2 +
+                                                       [E.TEST_TEARDOWN_ENDED, E.TEST_ENDED])
+    assert test.results == [3, 12, 'done']
+    step_ended = [e for e in observer.events if e.event_type == E.STEP_ENDED]
+    assert [e.result.get() for e in step_ended[:3]] == [2, ((), {'result': 3}), 3]
+    assert [e.step.level for e in step_ended[:3]] == [2, 3, 2]
+    assert all(e.status == Status.PASS for e in observer.events if hasattr(e, 'status'))
+    assert ctx.last_reported_status == Status.PASS
+
+
+def test_async_step_failure(ctx):
+    observer = ctx.observer(E.STEP_ENDED, E.TEST_ITERATION_ENDED, E.TEST_ENDED)
+    ctx.test(AsyncDummyTest).execute(iterations_data(None))
+
+    step_ended, iteration_ended, test_ended = observer.events
+    assert step_ended.status == Status.FAIL
+    assert isinstance(step_ended.exception[1], ValueError)
+    assert iteration_ended.status == Status.FAIL
+    assert test_ended.status == Status.FAIL
+
+
+def test_async_step_safely(ctx):
+    async def check():
+        return await ctx.step(AsyncAdd).safely.execute(None, 1)
+
+    observer = ctx.observer(E.STEP_ENDED)
+    loop = asyncio.new_event_loop()
+    try:
+        assert loop.run_until_complete(check()) is None
+    finally:
+        loop.close()
+    assert observer.last_event.status == Status.FAIL
+
+
+class ConcurrentAsyncTest(AsyncTestScript):
+    """Iterations waiting on each other in the same event loop"""
+    PARALLEL_ITERATIONS = 4
+
+    async def setup(self, data):
+        self.started = 0
+        self.all_started = asyncio.Event()
+
+    async def run(self, data):
+        self.started += 1
+        if self.started == 4:
+            self.all_started.set()
+        await self.step(AsyncAdd).execute(data['a'], 1)
+        await asyncio.wait_for(self.all_started.wait(), 5)
+
+
+def test_concurrent_async_iterations(ctx):
+    observer = ctx.observer(E.TEST_ITERATION_STARTED, E.TEST_ITERATION_ENDED, E.STEP_STARTED, E.STEP_ENDED,
+                            E.TEST_ENDED)
+    ctx.test(ConcurrentAsyncTest).execute(iterations_data(1, 2, 3, 4))
+
+    triggered = [e.event_type for e in observer.events]
+    assert triggered == [E.TEST_ITERATION_STARTED, E.STEP_STARTED, E.STEP_ENDED, E.TEST_ITERATION_ENDED] * 4 + \
+        [E.TEST_ENDED]
+    for start in range(0, 16, 4):
+        assert observer.events[start].iteration is observer.events[start + 3].iteration
+    assert observer.last_event.status == Status.PASS
@@ -1,4 +1,6 @@
+import os
 import re
+
 from marvin.runner import cli
 
 from tests import resource as r
@@ -13,6 +15,36 @@ def test_arg_parse():
     assert options.with_tags == ['tag1', 'tag2']
     assert options.without_tags == ['tag3', 'tag4']
     assert options.config == 'config.yaml'
+    assert options.workers is None
+
+    options = cli.parse(['my_tests/', '--workers', '4', '--executor', 'thread'])
+    assert options.workers == 4
+    assert options.executor == 'thread'
+
+    options = cli.parse(['--shard', '2/3', '--history', 'history.json', '--results', 'shard2.json',
+                         '--schedule', 'longest_first'])
+    assert options.schedule == 'longest_first'
+    assert options.shard == '2/3'
+    assert options.history_file == 'history.json'
+    assert options.results_file == 'shard2.json'
+
+    options = cli.parse(['--merge-results', 'shard1.json', 'shard2.json'])
+    assert options.merge_results == ['shard1.json', 'shard2.json']
+
+    options = cli.parse(['--data-cache', '.cache', '--rebuild-data-cache'])
+    assert options.data_cache == '.cache'
+    assert options.rebuild_data_cache
+
+    options = cli.parse(['--event-dispatch', 'async'])
+    assert options.event_dispatch == 'async'
+
+    options = cli.parse(['--quiet', '--output-buffer', '65536', '--output-flush-interval', '0.5'])
+    assert options.quiet
+    assert options.output_buffer == 65536
+    assert options.output_flush_interval == 0.5
+
+    options = cli.parse(['--exception-retention', 'traceback'])
+    assert options.exception_retention == 'traceback'
 
 
 def test_runner_invocation_ok():
@@ -29,6 +61,16 @@ def test_runner_invocation_error():
     assert exit_code == [1]
 
 
+def test_rebuild_data_cache(tmpdir):
+    exit_code = []
+    with CaptureOutput() as output:
+        cli.main(exit_fn=lambda code: exit_code.append(code),
+                 args=[r('runner/scenario1'), '--data-cache', str(tmpdir), '--rebuild-data-cache'])
+    assert exit_code == [0]
+    assert output[-1] == "3 data files cached in: %s" % tmpdir
+    assert len(os.listdir(str(tmpdir))) == 3
+
+
 def test_version():
     with CaptureOutput() as output:
         cli.main(args=['--version'])
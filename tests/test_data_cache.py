@@ -0,0 +1,78 @@
+import os
+import threading
+
+from marvin.data import DeferredDataProvider, FileDataProvider, NullDataProvider, YAMLDataProvider
+from marvin.data.data_providers.json_lines_data_provider import JSONLinesDataProvider
+from marvin.data.data_cache import DataCache
+from tests import resource as r
+
+
+def test_cache_entries(tmpdir):
+    data_file = tmpdir.join('test.yaml')
+    data_file.write('name: cached')
+    cache = DataCache(str(tmpdir.join('cache')))
+
+    assert cache.get(YAMLDataProvider, str(data_file)) is None
+    cache.put(YAMLDataProvider, str(data_file), {'name': 'cached'})
+    assert cache.get(YAMLDataProvider, str(data_file)) == {'name': 'cached'}
+    # keyed by data provider class too
+    assert cache.get(FileDataProvider, str(data_file)) is None
+
+    data_file.write('name: changed!')
+    assert cache.get(YAMLDataProvider, str(data_file)) is None
+
+    cache.rebuild(YAMLDataProvider, str(data_file))
+    assert cache.get(YAMLDataProvider, str(data_file)) == {'name': 'changed!'}
+
+
+def test_corrupt_entries_ignored(tmpdir):
+    cache = DataCache(str(tmpdir))
+    cache.put(YAMLDataProvider, r('data/example.yaml'), {'name': 'cached'})
+    for entry in tmpdir.listdir():
+        entry.write('not a pickle')
+    assert cache.get(YAMLDataProvider, r('data/example.yaml')) is None
+
+
+def test_data_providers_use_cache(tmpdir):
+    data_cache = DataCache(str(tmpdir.join('cache')))
+    data = YAMLDataProvider(r('data/example.yaml'), data_cache=data_cache)
+    assert data.name == 'Test Name'
+    assert len(os.listdir(data_cache.directory)) == 1
+
+    data_cache.put(YAMLDataProvider, r('data/example.yaml'), {'name': 'From cache'})
+    assert YAMLDataProvider(r('data/example.yaml'), data_cache=data_cache).name == 'From cache'
+    # only when given the cache
+    assert YAMLDataProvider(r('data/example.yaml')).name == 'Test Name'
+    deferred = DeferredDataProvider(YAMLDataProvider, r('data/example.yaml'), data_cache=data_cache)
+    assert deferred.name == 'From cache'
+
+    # streaming data providers are not cached
+    JSONLinesDataProvider(r('data/example.jsonl'), data_cache=data_cache)
+    DeferredDataProvider(JSONLinesDataProvider, r('data/example.jsonl'), data_cache=data_cache).load()
+    assert len(os.listdir(data_cache.directory)) == 1
+
+    # nor data providers other than file ones
+    assert DeferredDataProvider(NullDataProvider, None, data_cache=data_cache).iterations
+
+
+class LockedData(YAMLDataProvider):
+    """Data provider whose parsed data can't be pickled"""
+
+    @classmethod
+    def load_obj(cls, file_handle):
+        data = super(LockedData, cls).load_obj(file_handle)
+        data['lock'] = threading.Lock()
+        return data
+
+
+def test_data_that_cannot_be_cached(tmpdir):
+    data_cache = DataCache(str(tmpdir.join('cache')))
+    data = LockedData(r('data/example.yaml'), data_cache=data_cache)
+    assert data.name == 'Test Name'
+    assert os.listdir(data_cache.directory) == []
+    assert not data_cache.rebuild(LockedData, r('data/example.yaml'))
+
+    # nor when the cache can't be written
+    tmpdir.join('not a directory').write('')
+    assert YAMLDataProvider(r('data/example.yaml'), data_cache=DataCache(str(tmpdir.join('not a directory')))).name \
+        == 'Test Name'
@@ -1,11 +1,49 @@
+import sqlite3
+
 import pytest
 
-from marvin.data import DataProviderRegistry, DataProvider, FileDataProvider
+from marvin.data import DataProviderRegistry, DataProvider, FileDataProvider, StreamingFileDataProvider, \
+    DeferredDataProvider, TabularDataProvider, YAMLDataProvider, NullDataProvider
+from marvin.data.data_providers.sqlite_data_provider import SQLiteDataProvider
+from marvin.data.data_providers.yaml_stream_data_provider import YAMLStreamDataProvider
 from tests import resource as r
 
 
 def test_default_data_providers():
-    assert DataProviderRegistry.supported_file_extensions() == {'yaml', 'yml', 'json'}
+    expected = {'yaml', 'yml', 'json', 'jsonl', 'csv', 'npy', 'sqlite', 'sqlite3'}
+    assert DataProviderRegistry.supported_file_extensions() == expected
+
+
+def test_registry_lookup():
+    class XYZDataProvider(YAMLDataProvider):
+        @classmethod
+        def supported_extensions(cls):
+            return ['xyz', 'yaml']
+
+    class CatchAllDataProvider(NullDataProvider):
+        @classmethod
+        def handles(cls, source_id):
+            return bool(source_id) and source_id.startswith('catch:')
+
+    assert DataProviderRegistry.data_provider_class_for('data.XYZ') is None
+    DataProviderRegistry.register(XYZDataProvider, CatchAllDataProvider)
+    try:
+        assert 'xyz' in DataProviderRegistry.supported_file_extensions()
+        assert DataProviderRegistry.data_provider_class_for('data.XYZ') is XYZDataProvider
+        # last registered take precedence
+        assert DataProviderRegistry.data_provider_class_for('data.yaml') is XYZDataProvider
+        assert DataProviderRegistry.data_provider_class_for('data.stream.yaml') is XYZDataProvider
+        assert DataProviderRegistry.data_provider_class_for('catch:data.yaml') is CatchAllDataProvider
+        assert DataProviderRegistry.data_provider_class_for('catch:data') is CatchAllDataProvider
+        assert DataProviderRegistry.data_provider_class_for(None) is NullDataProvider
+    finally:
+        DataProviderRegistry.unregister(XYZDataProvider, CatchAllDataProvider)
+
+    assert 'xyz' not in DataProviderRegistry.supported_file_extensions()
+    assert DataProviderRegistry.data_provider_class_for('data.yaml') is YAMLDataProvider
+    assert DataProviderRegistry.data_provider_class_for('data.stream.yaml') is YAMLStreamDataProvider
+    assert DataProviderRegistry.data_provider_class_for('data.sqlite#table') is SQLiteDataProvider
+    assert DataProviderRegistry.data_provider_class_for('catch:data') is None
 
 
 def test_yaml_data_provider():
@@ -22,6 +60,13 @@ def test_yaml_data_provider():
          {'arg1': 'iteration 2', 'arg2': False})
     ]
     assert data.tear_down_data == {'foo': 'baz'}
+    assert data.parallel_iterations is None
+
+
+def test_parallel_iterations_setting():
+    data = DataProviderRegistry.data_provider_for(r('data/parallel.yaml'))
+    assert data.parallel_iterations == 8
+    assert DataProviderRegistry.data_provider_for(None).parallel_iterations is None
 
 
 def test_json_data_provider():
@@ -117,3 +162,150 @@ def test_iterations_no_data_key_and_unexpected_keys():
         ('First iteration', None, None, None)
     ]
     assert data.tear_down_data == {'foo': 'baz'}
+
+
+@pytest.mark.parametrize('data_file', ['data/example.stream.yaml', 'data/example.jsonl'])
+def test_streaming_data_providers(data_file):
+    data = DataProviderRegistry.data_provider_for(r(data_file))
+    assert isinstance(data, StreamingFileDataProvider)
+    assert data.name == 'Test Name'
+    assert data.tags == {'bunch', 'of', 'tags'}
+    assert data.setup_data == {'foo': 'bar'}
+    assert data.tear_down_data == {'foo': 'baz'}
+
+    iterations = data.iterations
+    first = next(iterations)
+    assert (first.name, first.tags, first.data) == ('First iteration', None, {'arg1': 'iteration 1'})
+    assert [(i.name, i.tags, i.data) for i in iterations] == [
+        ('Second Iteration', {'regression'}, {'arg1': 'iteration 2'})
+    ]
+    # iterations can be read again
+    assert len(list(data.iterations)) == 2
+
+
+def test_streaming_data_provider_loads_header_only(tmpdir):
+    data_file = tmpdir.join('big.stream.yaml')
+    data_file.write('name: Big\n---\ndata: 1\n---\n[this is not valid yaml')
+
+    data = DataProviderRegistry.data_provider_for(str(data_file))
+    assert data.name == 'Big'
+    iterations = data.iterations
+    assert next(iterations).data == 1
+    with pytest.raises(Exception):
+        next(iterations)
+
+
+def test_deferred_data_provider():
+    data = DeferredDataProvider(YAMLDataProvider, r('data/example.yaml'))
+    assert data.source_id == r('data/example.yaml')
+    assert data.data_provider_class is YAMLDataProvider
+    assert not data.loaded
+
+    assert data.tags == {'bunch', 'of', 'tags'}
+    assert data.loaded
+    assert data.load() is data.load()
+    assert data.name == 'Test Name'
+    assert len(list(data.iterations)) == 2
+
+    data = DeferredDataProvider(YAMLDataProvider, r('data/example.yaml'), tags={'known'})
+    assert data.tags == {'known'}
+    assert not data.loaded
+
+
+def test_csv_data_provider():
+    data = DataProviderRegistry.data_provider_for(r('data/example.csv'))
+    assert isinstance(data, TabularDataProvider)
+    assert (data.name, data.description, data.tags, data.setup_data, data.tear_down_data) == (None,) * 5
+    iterations = [(i.name, i.description, i.tags, i.data) for i in data.iterations]
+    assert iterations == [
+        ('First iteration', None, None, {'arg1': 'iteration 1', 'arg2': 'true'}),
+        ('Second Iteration', 'iteration description', {'regression', 'smoke'},
+         {'arg1': 'iteration 2\nin two lines', 'arg2': 'false'})
+    ]
+
+
+def test_empty_csv(tmpdir):
+    data_file = tmpdir.join('empty.csv')
+    data_file.write('')
+    assert list(DataProviderRegistry.data_provider_for(str(data_file)).iterations) == []
+
+
+def test_npy_data_provider(tmpdir):
+    numpy = pytest.importorskip('numpy')
+    data_file = str(tmpdir.join('table.npy'))
+    table = numpy.array([(b'first', b'', 1, 1.5), (b'second', b'regression smoke', 2, 2.5)],
+                        dtype=[('iteration_name', 'S10'), ('iteration_tags', 'S20'), ('n', 'i4'), ('x', 'f8')])
+    numpy.save(data_file, table)
+
+    data = DataProviderRegistry.data_provider_for(data_file)
+    iterations = [(i.name, i.tags, i.data) for i in data.iterations]
+    assert iterations == [
+        ('first', None, {'n': 1, 'x': 1.5}),
+        ('second', {'regression', 'smoke'}, {'n': 2, 'x': 2.5})
+    ]
+
+
+def sqlite_data(tmpdir, table='iterations'):
+    path = str(tmpdir.join('data.sqlite'))
+    connection = sqlite3.connect(path)
+    connection.execute('CREATE TABLE "%s" (iteration_name TEXT, iteration_tags TEXT, n INTEGER)' % table)
+    connection.executemany('INSERT INTO "%s" VALUES (?, ?, ?)' % table, [
+        ('one', 'smoke', 1),
+        ('two', 'smoke slow', 2),
+        ('three', None, 3),
+        ('four', 'smoke-ish', 4)
+    ])
+    connection.commit()
+    connection.close()
+    return path
+
+
+def test_sqlite_data_provider(tmpdir):
+    path = sqlite_data(tmpdir)
+    data = DataProviderRegistry.data_provider_for(path)
+    assert data.name is None
+    assert [(i.name, i.tags, i.data) for i in data.iterations] == [
+        ('one', {'smoke'}, {'n': 1}),
+        ('two', {'smoke', 'slow'}, {'n': 2}),
+        ('three', None, {'n': 3}),
+        ('four', {'smoke-ish'}, {'n': 4})
+    ]
+
+    path = sqlite_data(tmpdir.mkdir('other'), table='other table')
+    data = DataProviderRegistry.data_provider_for(path + '#other table')
+    assert [i.name for i in data.iterations] == ['one', 'two', 'three', 'four']
+
+
+def test_sqlite_tag_filters(tmpdir):
+    data = DataProviderRegistry.data_provider_for(sqlite_data(tmpdir))
+
+    def names(test_tags, with_tags, without_tags):
+        return [i.name for i in data.filtered_iterations(test_tags, with_tags, without_tags)]
+
+    assert names(set(), {'smoke'}, set()) == ['one', 'two']
+    assert names(set(), {'smoke'}, {'slow'}) == ['one']
+    assert names(set(), set(), {'slow', 'smoke-ish'}) == ['one', 'three']
+    # the test itself matches
+    assert names({'smoke'}, {'smoke'}, {'slow'}) == ['one', 'three', 'four']
+
+
+def test_sqlite_tag_filters_with_any_whitespace(tmpdir):
+    path = str(tmpdir.join('data.sqlite'))
+    connection = sqlite3.connect(path)
+    connection.execute('CREATE TABLE iterations (iteration_name TEXT, iteration_tags TEXT)')
+    connection.executemany('INSERT INTO iterations VALUES (?, ?)', [
+        ('tab', 'regression\tsmoke'),
+        ('newline', 'smoke\nfoo'),
+        ('spaces', ' smoke  regression '),
+        ('crlf', 'foo\r\nsmoke'),
+        ('none', 'regression\tsmokey')
+    ])
+    connection.commit()
+    connection.close()
+    data = DataProviderRegistry.data_provider_for(path)
+
+    assert [i.tags for i in data.iterations][:3] == [{'regression', 'smoke'}, {'smoke', 'foo'}, {'smoke', 'regression'}]
+    # the query matches the same tags iterations have
+    filtered = [i.name for i in data.filtered_iterations(set(), {'smoke'}, set())]
+    assert filtered == [i.name for i in data.iterations if 'smoke' in i.tags] == ['tab', 'newline', 'spaces', 'crlf']
+    assert [i.name for i in data.filtered_iterations(set(), set(), {'regression'})] == ['newline', 'crlf']
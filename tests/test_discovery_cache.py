@@ -0,0 +1,74 @@
+import os
+
+from marvin.runner.discovery_cache import DiscoveryCache, DiscoveredTestScript
+
+
+def test_cache_round_trip(tmpdir):
+    tests_dir = tmpdir.mkdir('tests')
+    script = tests_dir.join('my_test.py')
+    script.write('class MyTest(object): pass\n')
+    data_dir = tests_dir.mkdir('data')
+    data_file = data_dir.join('my_test.yaml')
+    data_file.write('iterations: []\n')
+    cache_path = str(tmpdir.join('cache', 'discovery.json'))
+
+    cache = DiscoveryCache(cache_path)
+    assert cache.get(str(script)) is None
+    cache.put(str(script), DiscoveredTestScript('MyTest', ['b', 'a'], [str(data_file)]),
+              [str(tests_dir), str(data_dir)])
+    cache.save()
+
+    discovered = DiscoveryCache(cache_path).get(str(script))
+    assert discovered.class_name == 'MyTest'
+    assert discovered.tags == {'a', 'b'}
+    assert discovered.data_files == [str(data_file)]
+    assert discovered.test_class is None
+
+
+def test_stale_entries(tmpdir):
+    script = tmpdir.join('my_test.py')
+    script.write('class MyTest(object): pass\n')
+    cache_path = str(tmpdir.join('discovery.json'))
+
+    cache = DiscoveryCache(cache_path)
+    cache.put(str(script), DiscoveredTestScript('MyTest'), [str(tmpdir)])
+    cache.save()
+
+    # a new file in a searched directory
+    tmpdir.join('my_test.json').write('{}')
+    os.utime(str(tmpdir), (0, 0))
+    assert DiscoveryCache(cache_path).get(str(script)) is None
+
+    cache = DiscoveryCache(cache_path)
+    cache.put(str(script), DiscoveredTestScript('MyTest'), [str(tmpdir)])
+    cache.save()
+    assert DiscoveryCache(cache_path).get(str(script)) is not None
+
+    # the script itself changed
+    script.write('class MyOtherTest(object): pass\n')
+    assert DiscoveryCache(cache_path).get(str(script)) is None
+
+
+def test_only_found_files_are_saved(tmpdir):
+    first, second = tmpdir.join('first.py'), tmpdir.join('second.py')
+    first.write('')
+    second.write('')
+    cache_path = str(tmpdir.join('discovery.json'))
+
+    cache = DiscoveryCache(cache_path)
+    cache.put(str(first), DiscoveredTestScript())
+    cache.put(str(second), DiscoveredTestScript())
+    cache.save()
+
+    cache = DiscoveryCache(cache_path)
+    assert cache.get(str(first)) is not None
+    cache.save()
+
+    assert DiscoveryCache(cache_path).get(str(second)) is None
+
+
+def test_no_path():
+    cache = DiscoveryCache()
+    cache.put(__file__, DiscoveredTestScript('Anything'))
+    cache.save()
+    assert DiscoveryCache().get(__file__) is None
@@ -0,0 +1,150 @@
+import json
+import os
+import threading
+
+from marvin.report.observers.elk_reporter import ELKReporter, BulkSender
+from marvin.util import compat
+from tests.stubs import DummySuite, DummyTest
+
+if compat.IS_PYTHON_3:
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+else:
+    from BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+
+
+class StubBulkHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_POST(self):
+        server = self.server
+        body = self.rfile.read(int(self.headers['Content-Length']))
+        server.requests.append((self.path, self.client_address, body))
+        status = server.statuses.pop(0) if server.statuses else 200
+        response = json.dumps(server.response).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(response)))
+        self.end_headers()
+        self.wfile.write(response)
+
+    def log_message(self, *args):
+        pass
+
+
+class StubBulkServer(object):
+    """Elasticsearch bulk API stand-in, answering with the given statuses first (and 200 afterwards)"""
+
+    def __init__(self, statuses=None, response=None):
+        self._server = HTTPServer(('127.0.0.1', 0), StubBulkHandler)
+        self._server.requests = []
+        self._server.statuses = list(statuses or [])
+        self._server.response = response or {'errors': False, 'items': []}
+        self.url = 'http://127.0.0.1:%d/' % self._server.server_address[1]
+
+    @property
+    def requests(self):
+        return self._server.requests
+
+    @property
+    def documents(self):
+        lines = [json.loads(line) for _, _, body in self.requests for line in body.decode('utf-8').splitlines()]
+        return lines[1::2]
+
+    def __enter__(self):
+        self._thread = threading.Thread(target=self._server.serve_forever)
+        self._thread.daemon = True
+        self._thread.start()
+        return self
+
+    def __exit__(self, *args):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+def run_suite(reporter_factory, tests=5):
+    suite = DummySuite()
+    reporter = reporter_factory(suite.publisher)
+    for _ in range(tests):
+        suite.add_test(DummyTest)
+    suite.execute()
+    return reporter
+
+
+def test_documents_streamed_in_batches():
+    with StubBulkServer() as server:
+        reporter = run_suite(lambda publisher: ELKReporter(publisher, server.url, 'marvin', batch_size=2))
+
+    assert [path for path, _, _ in server.requests] == ['/_bulk'] * 3
+    # A single keep-alive connection
+    assert len(set(address for _, address, _ in server.requests)) == 1
+    actions = [json.loads(body.decode('utf-8').splitlines()[0]) for _, _, body in server.requests]
+    assert actions[0] == {'index': {'_index': 'marvin', '_type': 'marvin'}}
+    assert [doc['name'] for doc in server.documents] == ['DummyTest'] * 5
+    assert all(doc['status'] == 'PASS' and doc['steps'] == [] for doc in server.documents)
+    assert reporter.sender.sent == 5
+    assert reporter.sender.spill_file is None
+
+
+def test_failed_requests_retried():
+    with StubBulkServer(statuses=[503, 429]) as server:
+        reporter = run_suite(lambda publisher: ELKReporter(publisher, server.url, 'marvin', schema_type=None,
+                                                           backoff=0.01))
+
+    assert len(server.requests) == 3
+    assert len(set(body for _, _, body in server.requests)) == 1
+    assert reporter.sender.sent == 5
+
+
+def test_rejected_documents_not_retried():
+    response = {'errors': True, 'items': [{'index': {'status': 201}}, {'index': {'status': 400, 'error': 'bad'}}]}
+    with StubBulkServer(response=response) as server:
+        reporter = run_suite(lambda publisher: ELKReporter(publisher, server.url, 'marvin'), tests=2)
+
+    assert len(server.requests) == 1
+    assert (reporter.sender.sent, reporter.sender.rejected) == (1, 1)
+
+
+def test_refused_requests_reported_and_spilled(tmpdir, capsys):
+    spill_file = str(tmpdir.join('spill.ndjson'))
+    with StubBulkServer(statuses=[404] * 100, response={'error': 'no such index'}) as server:
+        reporter = run_suite(lambda publisher: ELKReporter(publisher, server.url, 'marvin', spill_file=spill_file))
+
+    assert len(server.requests) == 1
+    assert (reporter.sender.sent, reporter.sender.rejected) == (0, 0)
+    with open(spill_file, 'rb') as f:
+        assert len(f.read().splitlines()) == 10
+    err = capsys.readouterr().err
+    assert 'HTTP status 404: {"error": "no such index"}' in err
+    assert spill_file in err
+
+
+def test_documents_spilled_when_endpoint_does_not_keep_up(tmpdir):
+    spill_file = str(tmpdir.join('spill.ndjson'))
+    with StubBulkServer() as server:
+        reporter = run_suite(lambda publisher: ELKReporter(publisher, server.url, 'marvin', max_pending_bytes=1,
+                                                           spill_file=spill_file))
+
+    assert len(server.documents) == 5
+    assert reporter.sender.sent == 5
+    assert not os.path.exists(spill_file)
+
+
+def test_unsent_documents_kept_in_spill_file(tmpdir):
+    spill_file = str(tmpdir.join('spill.ndjson'))
+    with StubBulkServer(statuses=[503] * 3) as server:
+        reporter = run_suite(lambda publisher: ELKReporter(publisher, server.url, 'marvin', retries=2, backoff=0.01,
+                                                           spill_file=spill_file))
+
+    assert reporter.sender.sent == 0
+    with open(spill_file, 'rb') as f:
+        assert len(f.read().splitlines()) == 10
+
+    # Documents left by a previous run are sent by the next one
+    with StubBulkServer() as server:
+        sender = BulkSender(server.url, spill_file=spill_file)
+        sender.add(b'{"index": {}}\n{"name": "new"}\n')
+        sender.close()
+
+    assert [doc['name'] for doc in server.documents] == ['new'] + ['DummyTest'] * 5
+    assert sender.sent == 6
+    assert not os.path.exists(spill_file)
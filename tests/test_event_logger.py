@@ -5,7 +5,7 @@ from freezegun import freeze_time
 
 from marvin.core.status import Status
 from marvin.exceptions import ContextSkippedException
-from marvin.report.observers.event_logger import EventLogger
+from marvin.report.observers.event_logger import BufferedOutput, EventLogger
 from marvin.report import events as E
 from marvin.util import compat
 from tests.stubs import DummyStep, DummyData, DummyTest, IterationDataBuilder, TracebackBuilder
@@ -214,3 +214,67 @@ def test_report_summary(ctx):
         "ValueError('oops',)",
         '  File "oops.py", line 5, in raise exc',
     ]
+
+
+def test_quiet_mode_only_prints_summary(ctx):
+    out = compat.string_io()
+    EventLogger(ctx.publisher, dest=out, quiet=True)
+    assert not ctx.publisher.has_observers(E.EventType.STEP_STARTED)
+    assert not ctx.publisher.has_observers(E.EventType.STEP_ENDED)
+
+    ctx.test(DummyTest).execute(DummyData().with_name('quiet test'))
+    assert out.getvalue() == ''
+
+    ctx.publisher.notify(E.SuiteEndedEvent(ctx, milliseconds(0), Status.PASS))
+    assert out.getvalue().strip().split('\n')[-1] == '[PASS] quiet test: 1 iteration(s) (1 pass - 0 fail - 0 skip)'
+
+
+def test_buffered_output(ctx):
+    out = compat.string_io()
+    EventLogger(ctx.publisher, dest=out, buffer_size=1024, flush_interval=60)
+    step = ctx.step(DummyStep)
+
+    ctx.publisher.notify(E.StepStartedEvent(step, 1, {}))
+    assert out.getvalue() == ''
+
+    test = ctx.test(DummyTest)
+    ctx.publisher.notify(E.TestEndedEvent(test, DummyData(), milliseconds(0), Status.PASS, []))
+    assert out.getvalue().strip().split('\n') == ['DummyStep: Another Dummy Step', '[TEST - PASS] DummyTest (0 ms)']
+
+
+def test_buffered_output_flushed_by_size_and_interval():
+    out = compat.string_io()
+    buffered = BufferedOutput(out, size=10, interval=60)
+    buffered.write('12345')
+    assert out.getvalue() == ''
+    buffered.write('67890')
+    assert out.getvalue() == '1234567890'
+
+    buffered = BufferedOutput(out, size=10, interval=0)
+    buffered.write('abc')
+    assert out.getvalue() == '1234567890abc'
+
+
+def test_buffered_output_flushed_while_idle():
+    out = compat.string_io()
+    buffered = BufferedOutput(out, size=1024, interval=0.05)
+    buffered.write('first')
+    buffered.write(' line')
+    assert out.getvalue() == ''
+
+    deadline = time.time() + 5
+    while not out.getvalue() and time.time() < deadline:
+        time.sleep(0.01)
+    assert out.getvalue() == 'first line'
+
+
+def test_summary_of_spilled_tests(ctx):
+    out = compat.string_io()
+    EventLogger(ctx.publisher, dest=out, quiet=True, summary_memory_limit=2)
+    for n in range(5):
+        ctx.test(DummyTest).execute(DummyData().with_name('test %d' % n))
+    ctx.publisher.notify(E.SuiteEndedEvent(ctx, milliseconds(0), Status.PASS))
+
+    assert out.getvalue().strip().split('\n')[4:] == [
+        '[PASS] test %d: 1 iteration(s) (1 pass - 0 fail - 0 skip)' % n for n in range(5)
+    ]
@@ -0,0 +1,37 @@
+import pytest
+
+from marvin.core.status import Status
+from marvin.report.events import Instant, StepEndedEvent, StepStartedEvent
+from tests.stubs import SampleStep
+
+
+def test_events_have_no_instance_dict(ctx):
+    event = StepStartedEvent(ctx.step(SampleStep), [1, 2], {})
+    assert not hasattr(event, '__dict__')
+    with pytest.raises(AttributeError):
+        event.something = 'else'
+
+
+def test_durations_measured_with_monotonic_clock(ctx):
+    now = Instant.now()
+    start = Instant(now.timestamp + 60000, now.clock - 250000)  # the wall clock went back a minute meanwhile
+    event = StepEndedEvent(ctx.step(SampleStep), Status.PASS, None, start)
+
+    assert event.start_time == start.timestamp
+    assert event.duration_ns >= 250000
+    assert event.instant.clock - start.clock == event.duration_ns
+
+
+def test_sub_millisecond_durations(ctx):
+    start_event = StepStartedEvent(ctx.step(SampleStep), [], {})
+    end_event = StepEndedEvent(start_event.step, Status.PASS, None, start_event.instant)
+
+    assert end_event.start_time == start_event.timestamp
+    assert 0 < end_event.duration_ns < 1000000000
+    assert end_event.duration == end_event.duration_ns / 1000000.0
+
+
+def test_durations_from_timestamps(ctx):
+    end_event = StepEndedEvent(ctx.step(SampleStep), Status.PASS, None, 1000)
+    assert end_event.start_time == 1000
+    assert end_event.duration == end_event.timestamp - 1000
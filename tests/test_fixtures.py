@@ -0,0 +1,83 @@
+import threading
+
+import pytest
+
+from marvin.core.fixtures import Fixtures
+
+
+def test_fixture_built_once():
+    calls = []
+    fixtures = Fixtures()
+    fixtures.register('session', lambda: calls.append(1) or 'token')
+
+    assert 'session' in fixtures
+    assert fixtures.get('session') == 'token'
+    assert fixtures.get('session') == 'token'
+    assert calls == [1]
+
+
+def test_fixture_built_once_across_threads():
+    calls = []
+    fixtures = Fixtures()
+    fixtures.register('session', lambda: calls.append(1) or object())
+
+    values = []
+    threads = [threading.Thread(target=lambda: values.append(fixtures.get('session'))) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert calls == [1]
+    assert all(value is values[0] for value in values)
+
+
+def test_unknown_fixture():
+    with pytest.raises(KeyError) as e:
+        Fixtures().get('nope')
+    assert "Unknown fixture: 'nope'" in str(e.value)
+
+
+def test_inject():
+    fixtures = Fixtures()
+    fixtures.register('a', lambda: 1)
+    fixtures.register('b', lambda: 2)
+
+    setup_data = {'b': 'explicit'}
+    assert fixtures.inject(['a', 'b'], setup_data) == {'a': 1, 'b': 'explicit'}
+    assert setup_data == {'b': 'explicit'}
+    assert fixtures.inject(['a'], None) == {'a': 1}
+    assert fixtures.inject([], 'anything') == 'anything'
+    with pytest.raises(TypeError):
+        fixtures.inject(['a'], ['not', 'a', 'dict'])
+
+
+def test_tear_down_in_reverse_order():
+    torn_down = []
+    fixtures = Fixtures()
+    fixtures.register('first', lambda: 1, torn_down.append)
+    fixtures.register('second', lambda: 2, torn_down.append)
+    fixtures.register('unused', lambda: 3, torn_down.append)
+    fixtures.get('first')
+    fixtures.get('second')
+
+    assert fixtures.tear_down() == []
+    assert torn_down == [2, 1]
+    # fixtures are built again if required after being torn down
+    assert fixtures.get('first') == 1
+
+
+def test_tear_down_failures_returned():
+    def fail(_):
+        raise ValueError('oops')
+
+    torn_down = []
+    fixtures = Fixtures()
+    fixtures.register('first', lambda: 1, torn_down.append)
+    fixtures.register('second', lambda: 2, fail)
+    fixtures.get('first')
+    fixtures.get('second')
+
+    failures = fixtures.tear_down()
+    assert [f[0] for f in failures] == [ValueError]
+    assert torn_down == [1]
@@ -0,0 +1,48 @@
+import json
+
+from marvin.core.status import Status
+from marvin.report import events as E
+from marvin.runner.history import DurationHistory, DurationRecorder
+from tests.stubs import DummyData, DummyTest, IterationDataBuilder
+
+
+def test_history_file(tmpdir):
+    path = str(tmpdir.join('history.json'))
+    history = DurationHistory(path)
+    assert history.test_durations == {}
+    assert history.expected_duration('unknown') == 0
+
+    history.record_test('a', 100, {'first': 60, '#2': 40})
+    history.record_test('b', 300)
+    history.save()
+
+    history = DurationHistory(path)
+    assert history.test_durations == {'a': 100, 'b': 300}
+    assert history.iteration_durations('a') == {'first': 60, '#2': 40}
+    assert history.iteration_durations('b') == {}
+    assert history.expected_duration('b') == 300
+    assert history.expected_duration('never-seen') == 200
+
+
+def test_duration_recorder(ctx, tmpdir):
+    path = str(tmpdir.join('history.json'))
+    with open(path, 'w') as fh:
+        json.dump({'tests': {'not.run.Test': 5}}, fh)
+
+    history = DurationHistory(path)
+    DurationRecorder(ctx.publisher, history)
+    test = ctx.test(DummyTest)
+    data = DummyData()
+    named = IterationDataBuilder().with_name('named').build()
+    anonymous = IterationDataBuilder().build()
+
+    ctx.publisher.notify(E.TestStartedEvent(test, data))
+    ctx.publisher.notify(E.TestIterationEndedEvent(test, data, named, 0, Status.PASS, None))
+    ctx.publisher.notify(E.TestIterationEndedEvent(test, data, anonymous, 0, Status.PASS, None))
+    ctx.publisher.notify(E.TestEndedEvent(test, data, 0, Status.PASS, []))
+    ctx.publisher.notify(E.SuiteEndedEvent(ctx, 0, Status.PASS))
+
+    with open(path) as fh:
+        saved = json.load(fh)
+    assert sorted(saved['tests']) == ['not.run.Test', 'tests.stubs.dummies.DummyTest']
+    assert sorted(saved['iterations']['tests.stubs.dummies.DummyTest']) == ['#2', 'named']
@@ -0,0 +1,29 @@
+import pytest
+import yaml
+
+from marvin.util import compat, loaders
+
+
+def test_loader_for():
+    assert loaders.loader_for('data.json') is loaders.load_json
+    assert loaders.loader_for('some/data.YAML') is loaders.load_yaml
+    assert loaders.loader_for('.yml') is loaders.load_yaml
+    assert loaders.loader_for('data.xml') is None
+
+
+def test_load_json():
+    assert loaders.load_json(compat.string_io(u'{"a": [1, 2.5, null, true]}')) == {'a': [1, 2.5, None, True]}
+    # not strictly JSON, but valid YAML
+    assert loaders.load_json(u"{'a': 1, 'b': [2, 3,], }") == {'a': 1, 'b': [2, 3]}
+
+
+def test_load_yaml_is_safe():
+    assert loaders.load_yaml(u'a: [1, two]') == {'a': [1, 'two']}
+    with pytest.raises(yaml.YAMLError):
+        loaders.load_yaml(u'a: !!python/object/apply:os.getcwd []')
+
+
+def test_load_yaml_all():
+    documents = loaders.load_yaml_all(u'a: 1\n---\nb: 2\n')
+    assert next(documents) == {'a': 1}
+    assert list(documents) == [{'b': 2}]
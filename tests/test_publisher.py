@@ -0,0 +1,187 @@
+import threading
+
+import pytest
+
+from marvin.report import AsyncPublisher, EventType, Publisher
+
+
+class Event(object):
+    def __init__(self, event_type, name):
+        self.event_type = event_type
+        self.name = name
+
+
+def subscribed_publisher():
+    publisher = Publisher()
+    received = []
+    publisher.subscribe(lambda e: received.append(e.name), 1, 2)
+    return publisher, received
+
+
+def test_notify():
+    publisher, received = subscribed_publisher()
+    publisher.notify(Event(1, 'a'))
+    publisher.notify(Event(3, 'ignored'))
+    publisher.notify(Event(2, 'b'))
+    assert received == ['a', 'b']
+
+
+def test_buffered_events_are_notified_on_exit():
+    publisher, received = subscribed_publisher()
+    with publisher.buffered() as buffer:
+        publisher.notify(Event(1, 'a'))
+        with publisher.buffered():
+            publisher.notify(Event(2, 'b'))
+        assert received == []
+        assert [e.name for e in buffer.events] == ['a', 'b']
+    assert received == ['a', 'b']
+
+
+def test_buffered_events_are_not_interleaved_among_threads():
+    publisher, received = subscribed_publisher()
+    barrier = threading.Event()
+
+    def notify_events(name):
+        with publisher.buffered():
+            publisher.notify(Event(1, name))
+            barrier.wait()
+            publisher.notify(Event(2, name))
+
+    threads = [threading.Thread(target=notify_events, args=(str(n),)) for n in range(5)]
+    [t.start() for t in threads]
+    barrier.set()
+    [t.join() for t in threads]
+
+    assert len(received) == 10
+    assert all(received[i] == received[i + 1] for i in range(0, 10, 2))
+
+
+def test_buffer_with_explicit_parent():
+    publisher, received = subscribed_publisher()
+    with publisher.buffered() as parent:
+        publisher.notify(Event(1, 'first'))
+
+        def in_thread():
+            with publisher.buffered(parent=parent):
+                publisher.notify(Event(1, 'from thread'))
+
+        thread = threading.Thread(target=in_thread)
+        thread.start()
+        thread.join()
+        publisher.notify(Event(2, 'last'))
+        assert received == []
+    assert received == ['first', 'from thread', 'last']
+
+
+class SlowObserver(object):
+    """Collects event names, each one taking until `release` is set"""
+
+    def __init__(self, publisher, *event_types):
+        self.received = []
+        self.release = threading.Event()
+        publisher.subscribe(self.on_event, *event_types)
+
+    def on_event(self, event):
+        self.release.wait()
+        self.received.append(event.name)
+
+
+def test_async_notify_does_not_wait_for_observers():
+    publisher = AsyncPublisher()
+    observer = SlowObserver(publisher, 1)
+    other = []
+    publisher.subscribe(lambda e: other.append(e.name), 1)
+
+    for n in range(100):
+        publisher.notify(Event(1, n))
+    assert observer.received == []
+
+    observer.release.set()
+    publisher.flush()
+    assert observer.received == list(range(100))
+    assert other == list(range(100))
+
+
+def test_async_flush_on_suite_ended():
+    publisher = AsyncPublisher()
+    observer = SlowObserver(publisher, 1, EventType.SUITE_ENDED)
+    publisher.notify(Event(1, 'a'))
+    threading.Timer(0.05, observer.release.set).start()
+    publisher.notify(Event(EventType.SUITE_ENDED, 'end'))
+    assert observer.received == ['a', 'end']
+
+
+def test_async_buffered_events():
+    publisher = AsyncPublisher()
+    observer = SlowObserver(publisher, 1, 2)
+    observer.release.set()
+    with publisher.buffered():
+        publisher.notify(Event(1, 'a'))
+        publisher.notify(Event(2, 'b'))
+        publisher.flush()
+        assert observer.received == []
+    publisher.flush()
+    assert observer.received == ['a', 'b']
+
+
+def test_async_overflow_block():
+    publisher = AsyncPublisher(queue_size=2, overflow='block')
+    observer = SlowObserver(publisher, 1)
+    threading.Timer(0.05, observer.release.set).start()
+    for n in range(10):
+        publisher.notify(Event(1, n))
+    publisher.flush()
+    assert observer.received == list(range(10))
+    assert publisher.dropped == 0
+
+
+def test_async_overflow_drop():
+    publisher = AsyncPublisher(queue_size=2, overflow='drop')
+    observer = SlowObserver(publisher, 1)
+    for n in range(10):
+        publisher.notify(Event(1, n))
+    observer.release.set()
+    publisher.flush()
+    # The first event may or may not have been taken by the dispatch thread before the queue got full
+    assert observer.received in ([0, 1], [0, 1, 2])
+    assert publisher.dropped == 10 - len(observer.received)
+
+
+def test_async_overflow_spill():
+    publisher = AsyncPublisher(queue_size=2, overflow='spill')
+    observer = SlowObserver(publisher, 1)
+    for n in range(10):
+        publisher.notify(Event(1, n))
+    observer.release.set()
+    publisher.notify(Event(1, 10))
+    publisher.flush()
+    assert observer.received == list(range(11))
+    assert publisher.dropped == 0
+
+
+def test_async_observer_failures_raised_on_flush():
+    def fail(_event):
+        raise ValueError('oops')
+
+    publisher = AsyncPublisher()
+    received = []
+    publisher.subscribe(fail, 1)
+    publisher.subscribe(lambda e: received.append(e.name), 2)
+    publisher.notify(Event(1, 'a'))
+    publisher.notify(Event(2, 'b'))
+    with pytest.raises(ValueError):
+        publisher.flush()
+    assert received == ['b']
+    publisher.flush()
+
+
+def test_async_unknown_overflow_policy():
+    with pytest.raises(ValueError):
+        AsyncPublisher(overflow='nope')
+
+
+def test_has_observers():
+    publisher, _ = subscribed_publisher()
+    assert publisher.has_observers(1)
+    assert publisher.has_observers(2)
+    assert not publisher.has_observers(3)
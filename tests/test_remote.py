@@ -0,0 +1,65 @@
+import pickle
+import sys
+import threading
+
+from marvin.core.status import Status
+from marvin.exceptions import ContextSkippedException
+from marvin.report import events as E
+from marvin.report.remote import RecordingPublisher, attach, detach
+from marvin.util.tracebacks import format_tb
+from tests.stubs import DummyStep
+
+
+def transfer(event):
+    return attach(pickle.loads(pickle.dumps(detach(event))))
+
+
+def raised(exception):
+    try:
+        raise exception
+    except Exception:
+        return sys.exc_info()
+
+
+def test_step_events_survive_pickling(ctx):
+    step = ctx.step(DummyStep)
+    lock = threading.Lock()
+
+    started = transfer(E.StepStartedEvent(step, [1, lock], {'lock': lock, 'n': 2}))
+    assert started.event_type == E.EventType.STEP_STARTED
+    assert started.step.name == 'DummyStep'
+    assert started.step.description == 'Another Dummy Step'
+    assert started.step.level == 1
+    assert started.args[0] == 1 and started.args[1] == repr(lock)
+    assert started.kwargs['n'] == 2
+
+    skipped = transfer(E.StepEndedEvent(step, Status.SKIP, None, started.timestamp,
+                                        raised(ContextSkippedException(step, 'not today'))))
+    assert skipped.exception[0] is ContextSkippedException
+    assert skipped.exception[1].reason == 'not today'
+    assert skipped.exception[1].context.name == 'DummyStep'
+    assert 'raise exception' in ''.join(format_tb(skipped.exception[2]))
+
+
+def test_unpicklable_exception_classes(ctx):
+    class LocalError(ValueError):
+        def __init__(self, code, message):
+            super(LocalError, self).__init__(message)
+            self.code = code
+
+    step = ctx.step(DummyStep)
+    failed = transfer(E.StepEndedEvent(step, Status.FAIL, None, 0, raised(LocalError(42, 'nope'))))
+    exc_type, exc_val, _ = failed.exception
+    assert exc_type.__name__ == 'LocalError'
+    assert issubclass(exc_type, ValueError)
+    assert isinstance(exc_val, exc_type)
+    assert exc_val.code == 42
+    assert str(exc_val) == 'nope'
+
+
+def test_recording_publisher(ctx):
+    publisher = RecordingPublisher()
+    publisher.subscribe(lambda event: None, E.EventType.STEP_STARTED)
+    publisher.notify(E.StepStartedEvent(ctx.step(DummyStep), [], {}))
+    assert len(publisher.events) == 1
+    pickle.dumps(publisher.events)
@@ -1,11 +1,17 @@
+import json
 import os
 import copy
 from collections import namedtuple
 
+from marvin.core.status import Status
 from marvin.report import EventType
+from marvin.runner.results import merge_results
 from marvin.runner.runner import Runner
-from marvin.runner.runtime_suite import default_config
-from marvin.data import YAMLDataProvider, NullDataProvider
+from marvin.runner.runtime_suite import default_config, DataFileIndex
+from marvin.runner import sharding
+from marvin.data import YAMLDataProvider, NullDataProvider, DataProviderRegistry
+from marvin.data.data_providers.csv_data_provider import CSVDataProvider
+from marvin.util import compat
 
 from tests import resource as r, env_var
 
@@ -25,7 +31,7 @@ def collect_iteration_names(options):
 
 def test_suite_generation():
     options = build_options(tests_path=r('runner/scenario1'), with_tags=[], without_tags=[], config=None)
-    collected = [(t.__name__, d.__class__, (d.setup_data or {}).get('name'))
+    collected = [(t.__name__, getattr(d, 'data_provider_class', d.__class__), (d.setup_data or {}).get('name'))
                  for (t, d) in Runner(options)._suite.tests()]
 
     assert ("VerifySomething", YAMLDataProvider, "verify_something.data1.yaml") in collected
@@ -34,6 +40,22 @@ def test_suite_generation():
     assert len(collected) == 3
 
 
+def test_data_loaded_when_needed():
+    options = build_options(tests_path=r('runner/scenario1'), with_tags=[], without_tags=[], config=None)
+    data_providers = [d for (_, d) in Runner(options)._suite.tests() if d.source_id]
+    assert len(data_providers) == 2
+    assert not any(d.loaded for d in data_providers)
+    assert data_providers[0].setup_data
+    assert data_providers[0].loaded
+
+    # nor when filtering by tags: data files (and their iterations) are filtered once their test starts
+    options = build_options(tests_path=r('runner/scenario1'), with_tags=['tag404'], without_tags=['tag405'],
+                            config=None)
+    data_providers = [d for (_, d) in Runner(options)._suite.tests() if d.source_id]
+    assert len(data_providers) == 2
+    assert not any(d.loaded for d in data_providers)
+
+
 def test_filtering_from_tags_in_code():
     options = build_options(tests_path=r('runner/scenario1'), config=None,
                             with_tags=["tag1", "tag404"],
@@ -146,3 +168,227 @@ def test_exit_code_failure():
 
     code = Runner(options).run()
     assert code != 0
+
+
+def test_parallel_workers():
+    options = build_options(tests_path=r('runner/scenario2'), config=None, with_tags=[], without_tags=[], workers=2)
+    iterations = collect_iteration_names(options)
+    assert iterations == ['Iteration A', 'Iteration B', 'Iteration C', 'Iteration D']
+
+    options = build_options(tests_path=r('runner/scenario1'), config=None,
+                            with_tags=["fail"], without_tags=[], workers=2)
+    assert Runner(options).run() != 0
+
+    options = build_options(tests_path=r('runner/scenario2'), config=None, with_tags=[], without_tags=['iterationB'],
+                            workers=3, executor='thread')
+    iterations = collect_iteration_names(options)
+    assert iterations == ['Iteration A', 'Iteration C', 'Iteration D']
+
+
+def test_async_event_dispatch():
+    options = build_options(tests_path=r('runner/scenario2'), config=None, with_tags=[], without_tags=[],
+                            workers=2, event_dispatch='async')
+    iterations = collect_iteration_names(options)
+    assert iterations == ['Iteration A', 'Iteration B', 'Iteration C', 'Iteration D']
+
+
+def test_sharded_results_merge(tmpdir):
+    def run(results_file, shard=None):
+        options = build_options(tests_path=r('runner'), config=None, with_tags=[], without_tags=[],
+                                shard=shard, results_file=results_file)
+        Runner(options).run()
+        return results_file
+
+    def merged(*results_files):
+        out = compat.string_io()
+        status = merge_results(results_files, dest=out)
+        return status, out.getvalue()
+
+    single = run(str(tmpdir.join('all.json')))
+    shards = [run(str(tmpdir.join('shard%d.json' % n)), shard='%d/3' % n) for n in (1, 2, 3)]
+
+    status, summary = merged(single)
+    assert status == Status.FAIL
+    assert len(summary.strip().splitlines()) > 4
+    assert merged(*shards) == (status, summary)
+    assert merged(*reversed(shards)) == (status, summary)
+    assert all(merged(shard)[1] != summary for shard in shards)
+
+
+def test_same_test_script_names_in_different_directories(tmpdir):
+    for directory in ['a', 'b']:
+        tmpdir.mkdir(directory).join('check.py').write(
+            'from marvin import TestScript\n\n\n'
+            'class Check(TestScript):\n'
+            '    def run(self, data):\n'
+            '        pass\n')
+
+    def keys(shard=None):
+        options = build_options(tests_path=str(tmpdir), config=None, with_tags=[], without_tags=[], shard=shard)
+        suite = Runner(options)._suite
+        return sorted(sharding.test_key(*test) for test in suite.tests())
+
+    assert keys() == ['a/check.Check', 'b/check.Check']
+    assert sorted(keys('1/2') + keys('2/2')) == keys()
+
+
+def test_longest_first_schedule(tmpdir):
+    history_file = str(tmpdir.join('history.json'))
+
+    def executed_data_files(schedule):
+        options = build_options(tests_path=r('runner/scenario2'), config=None, with_tags=[], without_tags=[],
+                                history_file=history_file, schedule=schedule)
+        runner = Runner(options)
+        data_files = []
+        runner._suite.publisher.subscribe(lambda e: data_files.append(os.path.basename(e.data_provider.source_id)),
+                                          EventType.TEST_STARTED)
+        runner.run()
+        return data_files
+
+    discovery_order = executed_data_files('discovery')
+    with open(history_file) as fh:
+        history = json.load(fh)
+    assert len(history['tests']) == 2
+    assert all(len(iterations) == 2 for iterations in history['iterations'].values())
+
+    # make the last discovered test the longest one
+    for key in history['tests']:
+        history['tests'][key] = 1000 if key.endswith(discovery_order[-1]) else 1
+    with open(history_file, 'w') as fh:
+        json.dump(history, fh)
+
+    assert executed_data_files('longest_first') == list(reversed(discovery_order))
+
+
+def test_discovery_cache(tmpdir):
+    cache_file = str(tmpdir.join('discovery.json'))
+
+    def collected():
+        options = build_options(tests_path=r('runner/scenario1'), with_tags=[], without_tags=[], config=None,
+                                discovery_cache=cache_file)
+        return sorted((t.__name__, d.source_id) for (t, d) in Runner(options)._suite.tests())
+
+    discovered = collected()
+    with open(cache_file) as fh:
+        entries = json.load(fh)['entries']
+    assert sorted(entry['class_name'] for entry in entries.values() if entry['class_name']) == \
+        ['AnotherCase', 'VerifySomething']
+
+    assert collected() == discovered
+
+    # once run, data file tags are cached too, so filtering by tags doesn't need to load the data
+    options = build_options(tests_path=r('runner/scenario1'), with_tags=[], without_tags=[], config=None,
+                            discovery_cache=cache_file)
+    Runner(options).run()
+    options = build_options(tests_path=r('runner/scenario1'), with_tags=[], without_tags=['tag404'], config=None,
+                            discovery_cache=cache_file)
+    data_providers = [d for (_, d) in Runner(options)._suite.tests() if d.source_id]
+    assert len(data_providers) == 2
+    assert not any(d.loaded for d in data_providers)
+
+
+def test_data_cache(tmpdir):
+    cache_dir = tmpdir.join('cache')
+    options = build_options(tests_path=r('runner/scenario1'), with_tags=[], without_tags=[], config=None,
+                            data_cache=str(cache_dir))
+    Runner(options).run()
+    assert len(cache_dir.listdir()) == 2
+
+    # The cache belongs to the suite: data providers built elsewhere don't use it
+    YAMLDataProvider(r('data/example.yaml'))
+    assert len(cache_dir.listdir()) == 2
+
+
+def test_filtered_out_modules_not_imported():
+    def collected(with_tags, without_tags):
+        options = build_options(tests_path=r('discovery/filtered'), config=None,
+                                with_tags=with_tags, without_tags=without_tags)
+        return sorted(t.__name__ for (t, _) in Runner(options)._suite.tests())
+
+    assert collected([], ['heavy']) == ['DataTaggedCheck', 'SmokeCheck']
+    assert collected(['smoke'], []) == ['DataTaggedCheck', 'SmokeCheck']
+    # tags of its data aren't known until it starts: the test runner skips it then
+    assert collected(['none'], []) == ['DataTaggedCheck']
+
+
+def test_data_file_index():
+    index = DataFileIndex(['yaml', 'json'])
+    for path in ['tests/a.yaml', 'tests/a.data.json', 'tests/a.txt', 'tests/ab.yaml', 'tests/sub/a.json',
+                 'tests_other/a.yaml', 'b.yaml']:
+        index.add(path.replace('/', os.sep))
+    index.add_directories(['tests', os.path.join('tests', 'sub'), 'tests_other'])
+
+    expected = ['tests/a.yaml', 'tests/a.data.json', 'tests/sub/a.json']
+    assert index.find('a', 'tests') == [path.replace('/', os.sep) for path in expected]
+    assert index.find('a', os.path.join('tests', 'sub')) == [os.path.join('tests', 'sub', 'a.json')]
+    assert index.find('c', 'tests') == []
+    assert index.directories('tests') == ['tests', os.path.join('tests', 'sub')]
+
+
+def test_tag_filters_pushed_down_to_data_providers(tmpdir):
+    tmpdir.join('check_rows.py').write(
+        'from marvin import TestScript\n\n\n'
+        'class CheckRows(TestScript):\n'
+        '    def run(self, data):\n'
+        '        pass\n')
+    tmpdir.join('check_rows.csv').write('iteration_name,iteration_tags\none,smoke\ntwo,\n')
+
+    filters = []
+
+    class RecordingData(CSVDataProvider):
+        def filtered_iterations(self, test_tags, with_tags, without_tags):
+            filters.append((with_tags, without_tags))
+            return super(RecordingData, self).filtered_iterations(test_tags, with_tags, without_tags)
+
+    DataProviderRegistry.register(RecordingData)
+    try:
+        options = build_options(tests_path=str(tmpdir), config=None, with_tags=['smoke'], without_tags=['slow'])
+        assert collect_iteration_names(options) == ['one']
+    finally:
+        DataProviderRegistry.unregister(RecordingData)
+    assert filters == [({'smoke'}, {'slow'})]
+
+
+def test_data_not_queried_while_discovering(tmpdir):
+    for name in ['check_a', 'check_b']:
+        tmpdir.join(name + '.py').write(
+            'from marvin import TestScript\n\n\n'
+            'class %s(TestScript):\n'
+            '    def run(self, data):\n'
+            '        pass\n' % name.title().replace('_', ''))
+        tmpdir.join(name + '.yaml').write('iterations:\n'
+                                          '  - name: %s-smoke\n'
+                                          '    tags: [smoke]\n'
+                                          '  - name: %s-other\n' % (name, name))
+
+    queries = []
+
+    class CountingData(YAMLDataProvider):
+        def __init__(self, source_id):
+            super(CountingData, self).__init__(source_id)
+            queries.append(('load', os.path.basename(source_id)))
+
+        @property
+        def iterations(self):
+            queries.append(('iterations', os.path.basename(self.source_id)))
+            return super(CountingData, self).iterations
+
+    loaded_at_start = []
+    DataProviderRegistry.register(CountingData)
+    try:
+        options = build_options(tests_path=str(tmpdir), config=None, with_tags=['smoke'], without_tags=[])
+        runner = Runner(options)
+        runner._suite.publisher.subscribe(lambda _event: loaded_at_start.append(len(queries)),
+                                          EventType.TEST_STARTED)
+        iterations = []
+        runner._suite.publisher.subscribe(lambda e: iterations.append(e.iteration.name),
+                                          EventType.TEST_ITERATION_STARTED)
+        runner.run()
+    finally:
+        DataProviderRegistry.unregister(CountingData)
+
+    assert sorted(iterations) == ['check_a-smoke', 'check_b-smoke']
+    # each data file is loaded when its test starts, and its iterations are evaluated once
+    assert loaded_at_start == [2, 4]
+    assert sorted(queries) == [('iterations', 'check_a.yaml'), ('iterations', 'check_b.yaml'),
+                               ('load', 'check_a.yaml'), ('load', 'check_b.yaml')]
@@ -0,0 +1,54 @@
+import pytest
+
+from marvin.data import NullDataProvider
+from marvin.runner import sharding
+from marvin.runner.sharding import Shard, partition
+from tests.stubs import DummyData, DummyTest
+
+
+class FileData(DummyData):
+    def __init__(self, source_id):
+        super(FileData, self).__init__()
+        self._source_id = source_id
+
+
+def test_key(ctx):
+    assert sharding.test_key(DummyTest, None) == 'tests.stubs.dummies.DummyTest'
+    assert sharding.test_key(DummyTest, NullDataProvider()) == 'tests.stubs.dummies.DummyTest'
+    assert sharding.test_key(ctx.test(DummyTest), FileData('tests/a.yaml')) == \
+        'tests.stubs.dummies.DummyTest@tests/a.yaml'
+    assert sharding.test_key(DummyTest, FileData('./tests//a.yaml')) == 'tests.stubs.dummies.DummyTest@tests/a.yaml'
+
+
+def test_partition_is_balanced_and_independent_of_order():
+    keys = ['test%02d' % n for n in range(10)]
+    groups = partition(keys, 3)
+    assert sorted(groups.count(g) for g in range(3)) == [3, 3, 4]
+
+    reversed_groups = partition(list(reversed(keys)), 3)
+    assert dict(zip(keys, groups)) == dict(zip(reversed(keys), reversed_groups))
+
+
+def test_weighted_partition():
+    weights = {'slow': 100, 'medium1': 50, 'medium2': 50, 'fast': 10}
+    keys = ['fast', 'medium1', 'medium2', 'slow']
+    groups = dict(zip(keys, partition(keys, 2, weights)))
+    assert groups['slow'] != groups['medium1'] == groups['medium2'] != groups['fast']
+
+    # unknown tests weigh the average of the known ones
+    assert partition(['new', 'a', 'b'], 2, {'a': 30, 'b': 10}) == [1, 0, 1]
+
+
+def test_shard():
+    shard = Shard.parse('2/3')
+    assert (shard.index, shard.total) == (2, 3)
+    assert str(shard) == '2/3'
+
+    tests = [(DummyTest, FileData('data%d.yaml' % n)) for n in range(7)]
+    selected = [Shard(n, 3).select(tests) for n in (1, 2, 3)]
+    assert sorted(sum(selected, []), key=tests.index) == tests
+    assert all(sorted(s, key=tests.index) == s for s in selected)
+
+    for spec in ['0/3', '4/3', '1', 'a/b', '1/2/3']:
+        with pytest.raises(ValueError):
+            Shard.parse(spec)
@@ -0,0 +1,89 @@
+import textwrap
+
+from marvin.runner.static_inspection import inspect_test_scripts
+
+
+def inspect(tmpdir, source):
+    python_file = tmpdir.join('some_test.py')
+    python_file.write(textwrap.dedent(source))
+    return [(script.class_name, script.tags, script.complete) for script in inspect_test_scripts(str(python_file))]
+
+
+def test_class_tags(tmpdir):
+    assert inspect(tmpdir, """
+        from marvin import TestScript
+
+        class MyTest(TestScript):
+            TAGS = ['a', 'b']
+        """) == [('MyTest', {'a', 'b'}, True)]
+
+    assert inspect(tmpdir, """
+        import marvin
+
+        class MyTest(marvin.TestScript):
+            pass
+        """) == [('MyTest', set(), True)]
+
+
+def test_tags_of_ancestors_in_the_same_file(tmpdir):
+    assert inspect(tmpdir, """
+        from marvin import TestScript as Test
+
+        class Base(Test):
+            TAGS = ('base',)
+
+        class MyTest(Base):
+            TAGS = {'mine'}
+        """) == [('Base', {'base'}, True), ('MyTest', {'base', 'mine'}, True)]
+
+
+def test_incomplete_tags(tmpdir):
+    assert inspect(tmpdir, """
+        from somewhere import BaseTest
+
+        class MyTest(BaseTest):
+            TAGS = ['mine']
+        """) == [('MyTest', {'mine'}, False)]
+
+    assert inspect(tmpdir, """
+        from marvin import TestScript
+
+        COMMON_TAGS = ['common']
+
+        class MyTest(TestScript):
+            TAGS = COMMON_TAGS + ['mine']
+        """) == [('MyTest', set(), False)]
+
+
+def test_mixins_make_tags_incomplete(tmpdir):
+    assert inspect(tmpdir, """
+        from marvin import TestScript
+
+        class SmokeMixin(object):
+            TAGS = ['smoke']
+
+        class CheckMix(TestScript, SmokeMixin):
+            pass
+        """) == [('CheckMix', set(), False)]
+
+    assert inspect(tmpdir, """
+        from marvin import TestScript
+        from somewhere import SmokeMixin
+
+        class Base(TestScript):
+            TAGS = ['base']
+
+        class CheckMix(Base, SmokeMixin):
+            TAGS = ['mine']
+        """) == [('Base', {'base'}, True), ('CheckMix', {'base', 'mine'}, False)]
+
+
+def test_not_test_scripts(tmpdir):
+    assert inspect(tmpdir, """
+        class Helper(object):
+            TAGS = ['not', 'a', 'test']
+
+        def function():
+            pass
+        """) == []
+    assert inspect(tmpdir, "this is not python") == []
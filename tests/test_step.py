@@ -51,7 +51,7 @@ def test_step_events(ctx):
     assert start_event.args == [2, 4]
     assert start_event.kwargs == {'operation': multiply}
 
-    assert end_event.duration == end_event.timestamp - start_event.timestamp
+    assert end_event.duration == end_event.duration_ns / 1000000.0 > 0
     assert end_event.result.get() == 8
     assert end_event.status == 'PASS'
     assert end_event.exception == (None, None, None)
@@ -439,3 +439,22 @@ def test_step_has_access_to_config(ctx):
     with ctx.step(DummyStep).do() as (step, _result):
         answer = step.cfg.answer
     assert answer == 42
+
+
+def test_unobserved_step_events_not_built(ctx, monkeypatch):
+    from marvin.core import step_runner
+
+    def not_expected(*args):
+        raise AssertionError('unobserved event built')
+
+    monkeypatch.setattr(step_runner, 'StepStartedEvent', not_expected)
+    monkeypatch.setattr(step_runner, 'StepSkippedEvent', not_expected)
+    observer = ctx.observer(EventType.STEP_ENDED)
+
+    assert ctx.step(SampleStep).execute(2, 4) == 6
+    with pytest.raises(ContextSkippedException):
+        ctx.step(DummyStep).execute(skip='skipped')
+
+    assert [e.status for e in observer.events] == ['PASS', 'SKIP']
+    assert observer.events[0].start_time <= observer.events[0].timestamp
+    assert observer.events[0].duration >= 0
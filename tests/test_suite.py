@@ -1,8 +1,10 @@
 import pytest
 
 import marvin
+from marvin.core.executors import ProcessPoolExecutor, ThreadPoolExecutor
 from marvin.core.status import Status
 from marvin.report import EventType as E
+from marvin.util.tracebacks import format_tb
 from tests.stubs import DummyTest, DummySuite, DummyData, IterationDataBuilder
 
 
@@ -18,7 +20,8 @@ def test_suite_events():
     assert triggered_events == [E.SUITE_STARTED, E.SUITE_ENDED]
     end_event = observer.last_event
     assert end_event.status == Status.PASS
-    assert end_event.duration == end_event.timestamp - end_event.start_time
+    assert end_event.start_time <= end_event.timestamp
+    assert end_event.duration == end_event.duration_ns / 1000000.0 > 0
     assert all(e.suite == suite for e in observer.events)
 
 
@@ -88,3 +91,150 @@ def test_suite_status_fail_if_one_test_fails():
     suite.execute()
 
     assert [e.status for e in observer.events] == [Status.PASS, Status.SKIP, Status.FAIL, Status.PASS, Status.FAIL]
+
+
+def test_process_pool_executor_replays_events_per_test():
+    suite = DummySuite()
+    suite.executor = ProcessPoolExecutor(2)
+    observer = suite.observer(E.TEST_STARTED, E.TEST_ITERATION_ENDED, E.TEST_ENDED, E.SUITE_ENDED)
+
+    suite.add_test(DummyTest, DummyData().with_name('first')
+                   .with_iteration(IterationDataBuilder().with_name('1.1').build())
+                   .with_iteration(IterationDataBuilder().with_name('1.2').build()))
+    suite.add_test(DummyTest, DummyData().with_name('second')
+                   .with_iteration(IterationDataBuilder().with_name('2.1').with_data(fail='oops').build()))
+    suite.add_test(DummyTest, DummyData().with_name('third').with_setup_data(skip='skipped'))
+    suite.execute()
+
+    streams = {}
+    for event in observer.events[:-1]:
+        streams.setdefault(event.test_script.name, []).append(event)
+    assert sorted(streams) == ['first', 'second', 'third']
+    assert [e.event_type for e in streams['first']] == [E.TEST_STARTED, E.TEST_ITERATION_ENDED,
+                                                        E.TEST_ITERATION_ENDED, E.TEST_ENDED]
+    assert [e.iteration.name for e in streams['first'][1:3]] == ['1.1', '1.2']
+    assert [e.event_type for e in streams['third']] == [E.TEST_STARTED, E.TEST_ENDED]
+
+    # events for a test are notified together (i.e. not interleaved with other tests)
+    names = [e.test_script.name for e in observer.events[:-1]]
+    assert names == sorted(names, key=names.index)
+
+    failed_iteration = streams['second'][1]
+    assert failed_iteration.status == Status.FAIL
+    assert failed_iteration.exception[0] is Exception
+    assert failed_iteration.exception[1].args == ('oops',)
+    assert format_tb(failed_iteration.exception[2])
+
+    assert suite.context_summary == {Status.PASS: 1, Status.FAIL: 1, Status.SKIP: 1}
+    assert observer.last_event.status == Status.FAIL
+
+
+def test_thread_pool_executor_notifies_events_per_test():
+    suite = DummySuite()
+    suite.executor = ThreadPoolExecutor(4)
+    observer = suite.observer(E.TEST_STARTED, E.TEST_ITERATION_STARTED, E.TEST_ITERATION_ENDED, E.TEST_ENDED)
+
+    for n in range(8):
+        data = DummyData().with_name('test %d' % n)
+        for i in range(3):
+            data.with_iteration(IterationDataBuilder().with_name('%d.%d' % (n, i)).build())
+        suite.add_test(DummyTest, data)
+    suite.add_test(DummyTest, DummyData().with_name('failing')
+                   .with_iteration(IterationDataBuilder().with_data(fail='oops').build()))
+    status = suite.execute()
+
+    assert len(observer.events) == 9 * 2 + 8 * 3 * 2 + 2
+    names = [e.test_script.name for e in observer.events]
+    assert names == sorted(names, key=names.index)
+    for name in set(names):
+        stream = [e.event_type for e in observer.events if e.test_script.name == name]
+        assert stream[0] == E.TEST_STARTED and stream[-1] == E.TEST_ENDED
+
+    assert suite.context_summary == {Status.PASS: 8, Status.FAIL: 1, Status.SKIP: 0}
+    assert status == Status.FAIL
+
+
+class FixturesTest(DummyTest):
+    FIXTURES = ['session']
+
+    def setup(self, data):
+        self.ctx.sessions.append(data['session'])
+
+
+def test_fixtures_shared_by_tests_and_torn_down_at_suite_end():
+    suite = DummySuite()
+    suite.sessions = []
+    built, torn_down = [], []
+    suite.fixtures.register('session', lambda: built.append(1) or 'token', torn_down.append)
+    suite.fixtures.register('unused', lambda: built.append(2))
+    observer = suite.observer(E.SUITE_ENDED)
+    observer.hook(lambda _: torn_down.append('suite ended'), E.SUITE_ENDED)
+
+    suite.add_test(FixturesTest)
+    suite.add_test(FixturesTest, DummyData().with_setup_data(other=1))
+    suite.add_test(DummyTest, DummyData().with_fixtures('session'))
+    suite.execute()
+
+    assert observer.last_event.status == Status.PASS
+    assert suite.sessions == ['token', 'token']
+    assert built == [1]
+    assert torn_down == ['token', 'suite ended']
+
+
+def test_unknown_fixture_fails_setup():
+    suite = DummySuite()
+    observer = suite.observer(E.TEST_SETUP_ENDED)
+    suite.add_test(DummyTest, DummyData().with_fixtures('nope'))
+    suite.execute()
+
+    assert observer.last_event.status == Status.FAIL
+    assert observer.last_event.exception[0] is KeyError
+
+
+def test_fixture_tear_down_failure_fails_the_suite(capsys):
+    def fail(_):
+        raise ValueError('oops')
+
+    suite = DummySuite()
+    suite.fixtures.register('session', lambda: 'token', fail)
+    observer = suite.observer(E.SUITE_ENDED)
+    suite.add_test(DummyTest, DummyData().with_fixtures('session'))
+
+    assert suite.execute() == Status.FAIL
+    assert observer.last_event.status == Status.FAIL
+    assert suite.context_summary[Status.PASS] == 1
+    assert "ValueError('oops')" in capsys.readouterr().err
+
+
+def test_fixture_tear_down_failure_in_worker_processes_fails_the_suite(capsys):
+    def fail(_):
+        raise ValueError('oops')
+
+    suite = DummySuite()
+    suite.executor = ProcessPoolExecutor(2)
+    suite.fixtures.register('session', lambda: 'token', fail)
+    observer = suite.observer(E.SUITE_ENDED)
+    for _ in range(4):
+        suite.add_test(DummyTest, DummyData().with_fixtures('session'))
+
+    assert suite.execute() == Status.FAIL
+    assert observer.last_event.status == Status.FAIL
+    assert suite.context_summary[Status.PASS] == 4
+    assert "ValueError('oops')" in capsys.readouterr().err
+
+
+def test_fixtures_torn_down_when_tests_cannot_run():
+    class BrokenExecutor(object):
+        def execute(self, suite, tests):
+            suite.test(FixturesTest).execute()
+            raise RuntimeError('executor failure')
+
+    suite = DummySuite()
+    suite.sessions = []
+    torn_down = []
+    suite.fixtures.register('session', lambda: 'token', torn_down.append)
+    suite.executor = BrokenExecutor()
+
+    with pytest.raises(RuntimeError):
+        suite.execute()
+    assert torn_down == ['token']
@@ -0,0 +1,32 @@
+from marvin.core.status import Status
+from marvin.report.summary_store import SummaryStore
+
+
+def summary(n, status=Status.PASS):
+    return {"name": "test %d" % n, "status": status, "exceptions": ["oops %d" % n] if status == Status.FAIL else [],
+            "iterations": {Status.PASS: n, Status.FAIL: 0, Status.SKIP: 0}}
+
+
+def test_records_kept_in_order():
+    store = SummaryStore(memory_limit=3)
+    records = [summary(n, Status.FAIL if n % 4 == 0 else Status.PASS) for n in range(10)]
+    for record in records:
+        store.add(record)
+
+    assert len(store._records) == 1
+    assert len(store) == 10
+    assert list(store) == records
+    # can be iterated more than once
+    assert list(store) == records
+    assert store.counts == {Status.PASS: 7, Status.FAIL: 3, Status.SKIP: 0}
+
+    store.close()
+    assert list(store) == []
+
+
+def test_records_held_in_memory_below_limit():
+    store = SummaryStore(memory_limit=100)
+    store.add(summary(1, Status.SKIP))
+    assert store._file is None
+    assert list(store) == [summary(1, Status.SKIP)]
+    assert store.counts[Status.SKIP] == 1
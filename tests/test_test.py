@@ -1,5 +1,9 @@
+import sqlite3
+import threading
+
 import marvin
 from marvin.core.status import Status
+from marvin.data import SQLiteDataProvider
 from marvin.exceptions import ContextSkippedException
 from marvin.report import EventType as E
 from tests.stubs import DummyTest, DummyData, DummyStep, IterationDataBuilder
@@ -35,7 +39,7 @@ def test_test_events(ctx):
     assert ctx.last_reported_status == Status.PASS
     assert all(e.test_script == t for e in observer.events)
     assert all(e.data_provider == d for e in observer.events)
-    assert all(e.duration == e.timestamp - e.start_time
+    assert all(e.start_time <= e.timestamp and e.duration == e.duration_ns / 1000000.0 > 0
                for e in observer.events if e.event_type in ALL_END_EVENTS)
 
 
@@ -69,7 +73,8 @@ def test_setup_events(ctx):
     assert end.data == {'fail': 'oops'}
     assert end.test_script == script
     assert end.data_provider == data
-    assert end.duration == end.timestamp - end.start_time
+    assert end.start_time <= end.timestamp
+    assert end.duration == end.duration_ns / 1000000.0 > 0
     assert isinstance(end.exception[1], Exception)
 
 
@@ -92,7 +97,8 @@ def test_tear_down_events(ctx):
     assert end.data == {'fail': 'oops'}
     assert end.test_script == script
     assert end.data_provider == data
-    assert end.duration == end.timestamp - end.start_time
+    assert end.start_time <= end.timestamp
+    assert end.duration == end.duration_ns / 1000000.0 > 0
     assert isinstance(end.exception[1], Exception)
 
 
@@ -117,7 +123,8 @@ def test_iteration_events(ctx):
 
     assert it1_end.event_type == E.TEST_ITERATION_ENDED
     assert it1_end.status == 'PASS'
-    assert it1_end.duration == it1_end.timestamp - it1_end.start_time
+    assert it1_end.start_time <= it1_end.timestamp
+    assert it1_end.duration == it1_end.duration_ns / 1000000.0 > 0
     assert it1_end.exception == (None, None, None)
 
     assert it1_start.iteration.name == it1_end.iteration.name == 'new name'
@@ -129,6 +136,22 @@ def test_iteration_events(ctx):
     assert it2_start.iteration.tags is None and it2_end.iteration.tags is None
 
 
+def test_iterations_fetched_once(ctx):
+    observer = ctx.observer(E.TEST_ITERATION_ENDED)
+    fetched = []
+
+    class GeneratorData(DummyData):
+        @property
+        def iterations(self):
+            fetched.append(True)
+            for n in range(3):
+                yield IterationDataBuilder().with_data(n=n).build()
+
+    ctx.test(DummyTest).execute(GeneratorData())
+    assert [e.data for e in observer.events] == [{'n': 0}, {'n': 1}, {'n': 2}]
+    assert len(fetched) == 1
+
+
 def test_unimplemented_methods(ctx):
     """`setup` and `tear_down` are optional but `run` is not"""
     observer = ctx.observer(E.TEST_SETUP_ENDED, E.TEST_ITERATION_ENDED,
@@ -296,3 +319,109 @@ def test_has_access_to_config(ctx):
 
     ctx.test(SimpleTest).execute()
     assert ctx.cfg.answer == 42
+
+
+class ConcurrentTest(DummyTest):
+    """Test which iterations wait for each other"""
+    PARALLEL_ITERATIONS = 3
+
+    def setup(self, data):
+        super(ConcurrentTest, self).setup(data)
+        self.running = set()
+        self.lock = threading.Lock()
+        self.all_running = threading.Event()
+
+    def run(self, data):
+        with self.lock:
+            self.running.add(data['n'])
+            if len(self.running) == 3:
+                self.all_running.set()
+        self.step(DummyStep).execute(n=data['n'])
+        assert self.all_running.wait(5)
+        super(ConcurrentTest, self).run(data)
+
+
+def concurrent_data(n=3, **kwargs):
+    data = DummyData()
+    for i in range(n):
+        data.with_iteration(IterationDataBuilder().with_name(str(i)).with_data(n=i, **kwargs).build())
+    return data
+
+
+def test_parallel_iterations(ctx):
+    observer = ctx.observer(*(ALL_TEST_EVENTS + [E.STEP_STARTED, E.STEP_ENDED]))
+    script = ctx.test(ConcurrentTest)
+    script.execute(concurrent_data())
+
+    triggered = [e.event_type for e in observer.events]
+    assert triggered[:3] == [E.TEST_STARTED, E.TEST_SETUP_STARTED, E.TEST_SETUP_ENDED]
+    assert triggered[-3:] == [E.TEST_TEARDOWN_STARTED, E.TEST_TEARDOWN_ENDED, E.TEST_ENDED]
+    # the events of each iteration are contiguous
+    assert triggered[3:-3] == [E.TEST_ITERATION_STARTED, E.STEP_STARTED, E.STEP_ENDED, E.TEST_ITERATION_ENDED] * 3
+    for start in range(3, 15, 4):
+        it_start, step_start, step_end, it_end = observer.events[start:start + 4]
+        assert it_start.iteration is it_end.iteration
+        assert step_start.step is step_end.step
+        assert it_end.data['n'] == step_start.kwargs['n']
+    assert script.context_summary[Status.PASS] == 3
+    assert ctx.last_reported_status == Status.PASS
+
+
+def test_parallel_iterations_failures(ctx):
+    observer = ctx.observer(E.TEST_ITERATION_ENDED, E.TEST_ENDED)
+    ctx.test(ConcurrentTest).execute(concurrent_data(fail='oops'))
+    assert [e.status for e in observer.events] == [Status.FAIL] * 4
+    assert len(observer.last_event.exceptions) == 3
+
+
+def test_parallel_iterations_from_data_provider(ctx):
+    observer = ctx.observer(E.TEST_ITERATION_ENDED)
+
+    class SerialConcurrentTest(ConcurrentTest):
+        PARALLEL_ITERATIONS = None
+
+    ctx.test(SerialConcurrentTest).execute(concurrent_data().with_parallel_iterations(3))
+    assert [e.status for e in observer.events] == [Status.PASS] * 3
+
+
+def test_parallel_iterations_from_sqlite(ctx, tmpdir):
+    path = str(tmpdir.join('data.sqlite'))
+    connection = sqlite3.connect(path)
+    connection.execute('CREATE TABLE iterations (iteration_name TEXT, n INTEGER)')
+    connection.executemany('INSERT INTO iterations VALUES (?, ?)', [(str(i), i) for i in range(3)])
+    connection.commit()
+    connection.close()
+
+    observer = ctx.observer(E.TEST_ITERATION_ENDED)
+    ctx.test(ConcurrentTest).execute(SQLiteDataProvider(path))
+    assert sorted(e.iteration.name for e in observer.events) == ['0', '1', '2']
+    assert [e.status for e in observer.events] == [Status.PASS] * 3
+
+
+def test_parallel_iterations_skipped_after_setup_failure(ctx):
+    observer = ctx.observer(*ALL_TEST_EVENTS)
+    ctx.test(ConcurrentTest).execute(concurrent_data().with_setup_data(skip='not now'))
+    assert [e.event_type for e in observer.events] == [E.TEST_STARTED, E.TEST_SETUP_STARTED, E.TEST_SETUP_ENDED,
+                                                       E.TEST_ENDED]
+    assert observer.last_event.status == Status.SKIP
+
+
+def test_unobserved_test_events_not_built(ctx, monkeypatch):
+    from marvin.core import test_runner
+
+    for name in ['TestStartedEvent', 'TestSetupStartedEvent', 'TestSetupEndedEvent',
+                 'TestIterationStartedEvent', 'TestTearDownStartedEvent', 'TestTearDownEndedEvent']:
+        event_class = getattr(test_runner, name)
+        monkeypatch.setattr(test_runner, name, type(name, (event_class,), {'__init__': _not_expected}))
+    observer = ctx.observer(E.TEST_ITERATION_ENDED, E.TEST_ENDED)
+
+    ctx.test(DummyTest).execute(DummyData().with_iteration(IterationDataBuilder().build())
+                                           .with_iteration(IterationDataBuilder().build()))
+
+    assert [e.event_type for e in observer.events] == [E.TEST_ITERATION_ENDED] * 2 + [E.TEST_ENDED]
+    assert all(e.start_time <= e.timestamp for e in observer.events)
+    assert all(e.duration == e.duration_ns / 1000000.0 > 0 for e in observer.events)
+
+
+def _not_expected(*args):
+    raise AssertionError('unobserved event built')
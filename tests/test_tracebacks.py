@@ -0,0 +1,82 @@
+import gc
+import pickle
+import sys
+import weakref
+
+import pytest
+
+from marvin.report import EventType as E
+from marvin.util.tracebacks import FormattedTraceback, format_exception, format_tb, retain
+from tests.stubs import DummyData, DummyTest, IterationDataBuilder
+
+
+class Payload(object):
+    pass
+
+
+def fail_with_payload(refs):
+    payload = Payload()
+    refs.append(weakref.ref(payload))
+    raise ValueError('oops')
+
+
+def caught_exception(refs):
+    try:
+        fail_with_payload(refs)
+    except ValueError:
+        return sys.exc_info()
+
+
+def test_retain_frames():
+    exc_info = caught_exception([])
+    assert retain(exc_info, 'frames') is exc_info
+
+
+def test_retain_traceback_releases_frames():
+    refs = []
+    exc_info = caught_exception(refs)
+    rendered = format_tb(exc_info[2])
+
+    exc_type, exc_val, exc_tb = retain(exc_info, 'traceback')
+    del exc_info
+    gc.collect()
+
+    assert refs[0]() is None
+    assert (exc_type, exc_val.args) == (ValueError, ('oops',))
+    assert isinstance(exc_tb, FormattedTraceback)
+    assert format_tb(exc_tb) == rendered
+    assert 'fail_with_payload' in format_exception((exc_type, exc_val, exc_tb))
+
+
+def test_retain_message_only():
+    refs = []
+    exc_type, exc_val, exc_tb = retain(caught_exception(refs), 'message')
+    gc.collect()
+
+    assert refs[0]() is None
+    assert (exc_type, exc_val.args, exc_tb) == (ValueError, ('oops',), None)
+
+
+def test_unknown_retention_policy():
+    with pytest.raises(ValueError):
+        retain(caught_exception([]), 'everything')
+
+
+def test_traceback_rendered_lazily():
+    exc_tb = FormattedTraceback.from_traceback(caught_exception([])[2])
+    assert exc_tb._entries is None
+
+    entries = exc_tb.entries
+    assert 'raise ValueError' in entries[-1]
+    assert pickle.loads(pickle.dumps(exc_tb)).entries == entries
+
+
+def test_retention_policy_from_config(ctx):
+    ctx.cfg.set('marvin', {'exception_retention': 'message'})
+    observer = ctx.observer(E.TEST_ITERATION_ENDED, E.TEST_ENDED)
+    ctx.test(DummyTest).execute(DummyData().with_iteration(IterationDataBuilder().with_data(fail='oops').build()))
+
+    iteration_ended, test_ended = observer.events
+    assert iteration_ended.exception[0] is Exception
+    assert iteration_ended.exception[2] is None
+    assert [exc_info[2] for exc_info in test_ended.exceptions] == [None]